@@ -7,18 +7,21 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
-from supabase import create_client
+from src.database.db import DatabaseConnection
 
 # 2. Imports del Modelo (Backend)
 from src.models.concretos import Osciloscopio, Multimetro, MotorInduccion
 from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
-from src.repositories.equipo_repository import EquipoRepository
-from src.utils.mapper import EquipoMapper
 
 # 3. Imports de las Vistas (Frontend POO)
 from src.views.inspeccion import VistaInspeccion
 from src.views.dashboard import VistaDashboard
 
+try:
+    from src.services.vision_service import VisionService
+except ImportError:
+    VisionService = None
+
 st.set_page_config(page_title="FIEE Maintenance OOP", page_icon="🏭", layout="wide")
 
 # ==============================================================================
@@ -26,12 +29,17 @@ st.set_page_config(page_title="FIEE Maintenance OOP", page_icon="🏭", layout="
 # ==============================================================================
 class ServicioAutenticacion:
     def __init__(self):
-        # Conectamos a Supabase usando los secretos seguros
-        url = st.secrets["SUPABASE_URL"]
-        key = st.secrets["SUPABASE_KEY"]
-        self.supabase = create_client(url, key)
+        # Un cliente por sesión de usuario (su token no debe mezclarse con otras sesiones),
+        # creado una sola vez y montado sobre el pool HTTP compartido del proceso.
+        # Sin credenciales no hay cliente (None): se vuelve a intentar en el próximo rerun
+        if st.session_state.get("cliente_auth") is None:
+            st.session_state["cliente_auth"] = DatabaseConnection.crear_cliente_sesion()
+        self.supabase = st.session_state["cliente_auth"]
 
     def autenticar(self, correo, contrasena):
+        if self.supabase is None:
+            st.error("Servicio de autenticación no disponible. Verifique la configuración de Supabase.")
+            return False
         try:
             # 1. Intentamos entrar al sistema de seguridad oficial de Supabase
             res = self.supabase.auth.sign_in_with_password({
@@ -86,7 +94,11 @@ class ServicioAutenticacion:
             return False
 
     def cerrar_sesion(self):
-        self.supabase.auth.sign_out() # Cerramos sesión en el servidor
+        if self.supabase is not None:
+            try:
+                self.supabase.auth.sign_out() # Cerramos sesión en el servidor
+            except Exception as e:
+                print(f"Error al cerrar sesión en el servidor: {e}")
         st.session_state["autenticado"] = False
         st.session_state["usuario_actual"] = None
         st.session_state["rol_actual"] = None
@@ -159,18 +171,11 @@ class AplicacionFIEE:
 
     def _inicializar_estado(self):
         if 'db_laboratorios' not in st.session_state:
-            st.session_state.est_lineal = DesgasteLineal()
-            st.session_state.est_expo = DesgasteExponencial()
-            
-            repo = EquipoRepository()
-            datos_crudos = repo.leer_todos()
+            # Todas las sesiones comparten una sola instantánea del inventario por proceso
+            st.session_state.db_laboratorios = VistaDashboard()._cargar_y_agrupar_desde_supabase()
             
-            if datos_crudos:
-                mapper = EquipoMapper(st.session_state.est_lineal, st.session_state.est_expo)
-                st.session_state.db_laboratorios = mapper.mapear_lista(datos_crudos)
-            else:
+            if not any(st.session_state.db_laboratorios.values()):
                 st.warning("Base de datos vacía o desconectada. Iniciando vacío.")
-                st.session_state.db_laboratorios = {}
 
     def ejecutar(self):
         with st.sidebar:
@@ -217,5 +222,8 @@ class AplicacionFIEE:
 # 3. PUNTO DE ENTRADA
 # ==============================================================================
 if __name__ == "__main__":
+    # Carga y calentamiento del modelo de visión en segundo plano (una vez por proceso)
+    if VisionService is not None:
+        VisionService.precargar()
     app = AplicacionFIEE()
     app.ejecutar()
\ No newline at end of file
@@ -3,7 +3,7 @@ import os
 
 sys.path.append(os.getcwd())
 
-from src.repositories.equipo_repository import EquipoRepository
+from src.repositories.repositorio_factory import RepositorioFactory
 from src.models.concretos import MotorInduccion, Osciloscopio, Multimetro
 from src.logical.estrategias import DesgasteLineal
 
@@ -14,7 +14,7 @@ class InicializadorBaseDatos:
     """
     
     def __init__(self):
-        self.repo = EquipoRepository()
+        self.repo = RepositorioFactory.crear()
         self.estrategia_base = DesgasteLineal()
         self.lista_equipos = []
 
@@ -37,7 +37,7 @@ class InicializadorBaseDatos:
         
         m2 = MotorInduccion("MOT-P-02", "WEG W22", "2021-03-10", "10HP", "440V", 3600, self.estrategia_base)
         m2.ubicacion = "Laboratorio de Máquinas"
-        m2.historial_incidencias.append({"fecha": "2024-02-01", "detalle": "Ruido en rodamientos"})
+        m2.anexar_evento({"fecha": "2024-02-01", "detalle": "Ruido en rodamientos"})
         self.lista_equipos.extend([m1, m2])
 
     def ejecutar_carga(self):
@@ -47,8 +47,11 @@ class InicializadorBaseDatos:
         self._preparar_laboratorio_maquinas()
 
         print("🚀 Conectando a Supabase para inyectar datos...")
-        for equipo in self.lista_equipos:
-            self.repo.guardar_equipo(equipo)
+        resultado = self.repo.guardar_equipos(self.lista_equipos, chunk_size=500)
+        print(f"✅ Equipos guardados: {resultado['guardados']}")
+        for falla in resultado["fallidos"]:
+            print(f"❌ {falla['id_activo']}: {falla['error']}")
+        return resultado
 
 
 # --- Punto de Entrada Seguro ---
@@ -1,5 +1,8 @@
 import os
+import threading
+import httpx
 from supabase import create_client
+from supabase.lib.client_options import SyncClientOptions
 from dotenv import load_dotenv
 
 # Carga las variables de entorno desde el archivo .env
@@ -7,19 +10,69 @@ load_dotenv()
 
 class DatabaseConnection:
     """
-    Clase que implementa el patrón Singleton para asegurar una única 
+    Clase que implementa el patrón Singleton para asegurar una única
     instancia de conexión a la base de datos Supabase.
+    Todos los clientes del proceso reutilizan el mismo pool HTTP (keep-alive),
+    de modo que los clics repetidos no vuelven a pagar el handshake TLS.
     """
     _instance = None
+    _http = None
+    _lock = threading.RLock()
 
     def __new__(cls):
+        cliente = cls.obtener_cliente()
+        if cliente is None:
+            raise ValueError("Error: No se encontraron las credenciales de Supabase en el archivo .env")
+        return cliente
+
+    @classmethod
+    def obtener_cliente(cls):
+        """Retorna el cliente compartido del proceso, o None si no hay credenciales."""
         if cls._instance is None:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_KEY")
-            if not url: 
-                raise ValueError("Error: No se encontraron las credenciales de Supabase en el archivo .env")
-            cls._instance = create_client(url, key)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls._construir_cliente()
         return cls._instance
 
-# Instancia global de la base de datos para uso en repositorios
-db = DatabaseConnection()
\ No newline at end of file
+    @classmethod
+    def crear_cliente_sesion(cls):
+        """
+        Crea un cliente con estado de autenticación propio (un usuario por sesión),
+        pero montado sobre el mismo pool HTTP del proceso.
+        """
+        return cls._construir_cliente()
+
+    @classmethod
+    def _construir_cliente(cls):
+        url, key = cls._credenciales()
+        if not url or not key:
+            return None
+        opciones = SyncClientOptions(httpx_client=cls._cliente_http())
+        return create_client(url, key, options=opciones)
+
+    @classmethod
+    def _cliente_http(cls):
+        """Pool httpx único por proceso con conexiones persistentes."""
+        if cls._http is None:
+            with cls._lock:
+                if cls._http is None:
+                    cls._http = httpx.Client(
+                        http2=True,
+                        timeout=httpx.Timeout(30.0),
+                        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0),
+                        follow_redirects=True
+                    )
+        return cls._http
+
+    @staticmethod
+    def _credenciales():
+        """Busca las credenciales en el .env y, si no están, en los secretos de Streamlit."""
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+        if url and key:
+            return url, key
+        try:
+            import streamlit as st
+            return st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"]
+        except Exception:
+            return None, None
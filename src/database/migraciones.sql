@@ -0,0 +1,85 @@
+-- ==============================================================================
+-- Migraciones de la tabla 'equipos' en Supabase (ejecutar en el SQL Editor)
+-- ==============================================================================
+
+-- 1. Marca de agua para la sincronización incremental del inventario
+ALTER TABLE equipos ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS idx_equipos_updated_at ON equipos (updated_at, id_activo);
+
+CREATE OR REPLACE FUNCTION tocar_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_equipos_updated_at ON equipos;
+CREATE TRIGGER trg_equipos_updated_at
+    BEFORE INSERT OR UPDATE ON equipos
+    FOR EACH ROW EXECUTE FUNCTION tocar_updated_at();
+
+-- 2. Anexado atómico de incidencias: el cliente envía solo el evento nuevo
+--    (y el estado actualizado del modelo de degradación RLS del activo)
+ALTER TABLE equipos ADD COLUMN IF NOT EXISTS modelo_desgaste jsonb;
+
+DROP FUNCTION IF EXISTS agregar_incidencia(text, jsonb, text, text);
+CREATE OR REPLACE FUNCTION agregar_incidencia(
+    p_id_activo text,
+    p_evento jsonb,
+    p_estado text DEFAULT NULL,
+    p_estrategia text DEFAULT NULL,
+    p_modelo jsonb DEFAULT NULL
+) RETURNS void AS $$
+    UPDATE equipos
+       SET historial_incidencias = COALESCE(historial_incidencias, '[]'::jsonb) || jsonb_build_array(p_evento),
+           estado = COALESCE(p_estado, estado),
+           estrategia_nombre = COALESCE(p_estrategia, estrategia_nombre),
+           modelo_desgaste = COALESCE(p_modelo, modelo_desgaste)
+     WHERE id_activo = p_id_activo;
+$$ LANGUAGE sql;
+
+-- 3. Variante por lote para la cola de escritura diferida (varios eventos, una sola escritura)
+DROP FUNCTION IF EXISTS agregar_incidencias(text, jsonb, text, text);
+CREATE OR REPLACE FUNCTION agregar_incidencias(
+    p_id_activo text,
+    p_eventos jsonb,
+    p_estado text DEFAULT NULL,
+    p_estrategia text DEFAULT NULL,
+    p_modelo jsonb DEFAULT NULL
+) RETURNS void AS $$
+    UPDATE equipos
+       SET historial_incidencias = COALESCE(historial_incidencias, '[]'::jsonb) || p_eventos,
+           estado = COALESCE(p_estado, estado),
+           estrategia_nombre = COALESCE(p_estrategia, estrategia_nombre),
+           modelo_desgaste = COALESCE(p_modelo, modelo_desgaste)
+     WHERE id_activo = p_id_activo;
+$$ LANGUAGE sql;
+
+-- 3b. Lote de la cola de escritura diferida: los cambios de varios activos en una
+--     sola llamada y una sola sentencia (p_cambios: [{id_activo, eventos, estado,
+--     estrategia, modelo}], a lo sumo uno por activo)
+CREATE OR REPLACE FUNCTION agregar_incidencias_lote(p_cambios jsonb) RETURNS void AS $$
+    UPDATE equipos e
+       SET historial_incidencias = COALESCE(e.historial_incidencias, '[]'::jsonb) || COALESCE(c.eventos, '[]'::jsonb),
+           estado = COALESCE(c.estado, e.estado),
+           estrategia_nombre = COALESCE(c.estrategia, e.estrategia_nombre),
+           modelo_desgaste = COALESCE(c.modelo, e.modelo_desgaste)
+      FROM jsonb_to_recordset(p_cambios) AS c(id_activo text, eventos jsonb, estado text, estrategia text, modelo jsonb)
+     WHERE e.id_activo = c.id_activo;
+$$ LANGUAGE sql;
+
+-- 4. Lectura paginada del historial: la carga del inventario omite la columna JSONB
+--    y cada activo descarga su historial por páginas solo cuando se consulta
+CREATE OR REPLACE FUNCTION leer_historial(
+    p_id_activo text,
+    p_desde integer DEFAULT 0,
+    p_limite integer DEFAULT 50
+) RETURNS SETOF jsonb AS $$
+    SELECT h.evento
+      FROM equipos e,
+           jsonb_array_elements(COALESCE(e.historial_incidencias, '[]'::jsonb)) WITH ORDINALITY AS h(evento, n)
+     WHERE e.id_activo = p_id_activo
+     ORDER BY h.n
+    OFFSET p_desde
+     LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
@@ -1,4 +1,85 @@
+import sys
+from datetime import date
 from src.models.concretos import MotorInduccion, Osciloscopio, Multimetro
+from src.utils.enums import EstadoEquipo
+
+# Decodificadores de una fila (item, detalles, estrategia) -> Equipo listo para usar.
+# Validan y construyen en una sola pasada: la fecha de compra debe ser una fecha real
+# 'AAAA-MM-DD...' (ValueError) y cada detalle técnico, del tipo esperado (TypeError).
+# Los atributos se asignan directo a los slots (el objeto queda igual que con __init__),
+# junto con la ubicación, el estado (desconocido -> OPERATIVO) y el historial persistidos.
+# Modelo, fecha y ubicación se repiten en toda la flota: se internan para que los
+# activos compartan una sola copia de cada texto en lugar de una por fila.
+
+_ESTADOS = EstadoEquipo.__members__
+_OPERATIVO = EstadoEquipo.OPERATIVO
+_fecha_iso = date.fromisoformat
+_intern = sys.intern
+
+
+def _texto_compartido(valor):
+    return _intern(valor) if type(valor) is str else valor
+
+
+def _equipo_base(clase, item, estrategia):
+    """Instancia 'clase' con los atributos comunes de Equipo leídos de la fila."""
+    fecha = item["fecha_compra"]
+    _fecha_iso(fecha[:10])
+    equipo = clase.__new__(clase)
+    equipo.id_activo = item["id_activo"]
+    equipo.modelo = _texto_compartido(item["modelo"])
+    equipo.fecha_compra = _intern(fecha)
+    equipo.estado = _ESTADOS.get(item.get("estado"), _OPERATIVO)
+    historial = item.get("historial_incidencias")
+    equipo.historial_incidencias = [] if historial is None else historial
+    equipo.estrategia_desgaste = estrategia
+    equipo.modelo_desgaste = None
+    equipo.ubicacion = _texto_compartido(item.get("ubicacion", "Sin Asignar"))
+    return equipo
+
+
+def _detalle(det, atributo, tipos, defecto=None):
+    """Valor de 'detalles_tecnicos' (None si falta) validando su tipo."""
+    valor = det.get(atributo, defecto)
+    if valor is not None and not isinstance(valor, tipos):
+        raise TypeError(f"{atributo}: se esperaba {getattr(tipos, '__name__', 'número')}, "
+                        f"llegó {type(valor).__name__}")
+    return valor
+
+
+def _decodificar_motor(item, det, est):
+    equipo = _equipo_base(MotorInduccion, item, est)
+    equipo.hp = _detalle(det, "hp", str)
+    equipo.voltaje = _detalle(det, "voltaje", str)
+    equipo.rpm = _detalle(det, "rpm", (int, float))
+    return equipo
+
+
+def _decodificar_osciloscopio(item, det, est):
+    equipo = _equipo_base(Osciloscopio, item, est)
+    equipo.ancho_banda = _detalle(det, "ancho_banda", str)
+    return equipo
+
+
+def _decodificar_multimetro(item, det, est):
+    equipo = _equipo_base(Multimetro, item, est)
+    equipo.precision = _detalle(det, "precision", str)
+    equipo.es_digital = _detalle(det, "es_digital", bool, True)
+    return equipo
+
+
+def _completar_fila(constructor):
+    """Envuelve un constructor registrado para que también restaure ubicación, estado e historial."""
+    def construir(item, det, est):
+        equipo = constructor(item, det, est)
+        equipo.ubicacion = item.get("ubicacion", "Sin Asignar")
+        equipo.estado = _ESTADOS.get(item.get("estado"), _OPERATIVO)
+        historial = item.get("historial_incidencias")
+        if historial is not None:
+            equipo.historial_incidencias = historial
+        return equipo
+    return construir
+
 
 class EquipoFactory:
     """
@@ -7,18 +88,9 @@ class EquipoFactory:
 
     # Diccionario que mapea el nombre del equipo con su función constructora
     _constructores = {
-        "MotorInduccion": lambda item, det, est: MotorInduccion(
-            item["id_activo"], item["modelo"], item["fecha_compra"],
-            det.get("hp"), det.get("voltaje"), det.get("rpm"), est
-        ),
-        "Osciloscopio": lambda item, det, est: Osciloscopio(
-            item["id_activo"], item["modelo"], item["fecha_compra"],
-            det.get("ancho_banda"), est
-        ),
-        "Multimetro": lambda item, det, est: Multimetro(
-            item["id_activo"], item["modelo"], item["fecha_compra"],
-            det.get("precision"), det.get("es_digital", True), est
-        )
+        "MotorInduccion": _decodificar_motor,
+        "Osciloscopio": _decodificar_osciloscopio,
+        "Multimetro": _decodificar_multimetro,
     }
 
     @classmethod
@@ -26,7 +98,12 @@ class EquipoFactory:
         """
         Permite inyectar nuevos equipos dinámicamente desde fuera de la clase.
         """
-        cls._constructores[nombre] = funcion_constructora
+        cls._constructores[nombre] = _completar_fila(funcion_constructora)
+
+    @classmethod
+    def tipos(cls):
+        """Nombres de los tipos de equipo que la fábrica sabe construir."""
+        return tuple(cls._constructores)
 
     @classmethod
     def crear_equipo(cls, tipo, item, detalles, estrategia):
@@ -39,4 +116,12 @@ class EquipoFactory:
             raise ValueError(f"Tipo de equipo no soportado por la fábrica: {tipo}")
 
         # Ejecutamos la función constructora pasándole los datos
-        return constructor(item, detalles, estrategia)
\ No newline at end of file
+        return constructor(item, detalles, estrategia)
+
+    @classmethod
+    def decodificadores(cls):
+        """
+        Tabla tipo -> función (item, detalles, estrategia) para construir muchos equipos
+        seguidos (EquipoMapper) sin buscar el constructor en cada fila.
+        """
+        return cls._constructores
@@ -1,13 +1,77 @@
 from abc import ABC, abstractmethod
+import numpy as np
+from src.utils.reloj import RELOJ_SISTEMA
 
 class IEstrategiaDesgaste(ABC):
     """
     Interfaz para el Patrón Strategy.
     Define el contrato que deben seguir todas las formas de cálculo de obsolescencia.
+    La fecha actual se toma de un reloj inyectable (por defecto, el del sistema).
     """
+    reloj = RELOJ_SISTEMA
+
+    def __init__(self, reloj=None):
+        if reloj is not None:
+            self.reloj = reloj
+
+    def hoy(self):
+        return self.reloj.hoy()
+
     @abstractmethod
-    def calcular(self, fecha_compra: str) -> float:
+    def calcular(self, fecha_compra: str, hoy=None) -> float:
         """
         Calcula el porcentaje de desgaste u obsolescencia basado en la fecha.
+        Si no se indica 'hoy' se consulta el reloj de la estrategia.
+        """
+        pass
+
+    def calcular_lote(self, fechas, hoy=None) -> np.ndarray:
+        """
+        Versión vectorizada de calcular() sobre un arreglo de fechas (datetime64 o
+        cadenas ISO). Las fechas que NumPy no interpreta (por ejemplo '2020-02-30')
+        no invalidan el lote: esas filas se resuelven con calcular() y, si tampoco
+        es posible, quedan en NaN.
+        """
+        hoy = hoy or self.hoy()
+        fechas_np, validas = self._parsear_fechas(fechas)
+        valores = np.full(len(fechas_np), np.nan)
+        if validas.any():
+            valores[validas] = self._calcular_fechas(fechas_np[validas], hoy)
+        for i in np.flatnonzero(~validas):
+            try:
+                valores[i] = self.calcular(str(fechas[i]), hoy)
+            except ValueError:
+                pass
+        return valores
+
+    def _calcular_fechas(self, fechas, hoy) -> np.ndarray:
+        """
+        Fórmula del lote sobre fechas datetime64[D] ya válidas. Las estrategias
+        concretas la reemplazan por una expresión NumPy; por defecto recorre calcular().
+        """
+        return np.array([self.calcular(str(f), hoy) for f in fechas], dtype=float)
+
+    @staticmethod
+    def _parsear_fechas(fechas):
         """
-        pass
\ No newline at end of file
+        Convierte el lote a datetime64[D] con coerción: lo que no es una fecha
+        válida queda en NaT. Retorna (fechas, máscara de fechas válidas).
+        """
+        try:
+            convertidas = np.asarray(fechas, dtype="datetime64[D]")
+        except ValueError:
+            # Algún elemento inválido: se interpreta uno por uno (solo en este caso)
+            convertidas = np.array([IEstrategiaDesgaste._fecha_o_nat(f) for f in fechas], dtype="datetime64[D]")
+        return convertidas, ~np.isnat(convertidas)
+
+    @staticmethod
+    def _fecha_o_nat(fecha):
+        try:
+            return np.datetime64(fecha, "D")
+        except ValueError:
+            return np.datetime64("NaT", "D")
+
+    def _antiguedad_anios(self, fechas, hoy) -> np.ndarray:
+        """Años transcurridos desde la compra (mínimo 1), igual que la versión escalar."""
+        anios_compra = fechas.astype("datetime64[Y]").astype(np.int64) + 1970
+        return np.maximum(1, hoy.year - anios_compra)
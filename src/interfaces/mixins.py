@@ -5,6 +5,8 @@ class IdentificableQR:
     Mixin para proporcionar capacidades de identificación mediante 
     códigos QR generados dinámicamente.
     """
+    __slots__ = ()
+
     def generar_qr(self) -> str:
         # Usamos el ID del objeto para asegurar un código único en memoria
         codigo = f"QR-{id(self)}"
@@ -15,6 +17,8 @@ class AnalizadorPredictivo:
     Clase de utilidad para realizar estimaciones de fallos basadas 
     en análisis de vibración o sensores.
     """
+    __slots__ = ()
+
     def predecir_fallo(self) -> str:
         # Simulación de cálculo predictivo estocástico
         probabilidad = random.randint(15, 85)
@@ -25,6 +29,8 @@ class InspectorVisual:
     Simula la capacidad de procesamiento de imágenes para la 
     detección de defectos superficiales.
     """
+    __slots__ = ()
+
     def analizar_foto(self, ruta_imagen: str) -> dict:
         # Simulación de respuesta de análisis de visión computacional
         return {"status": "OK", "detalles": "Lente frontal limpio, sin grietas visibles."}
\ No newline at end of file
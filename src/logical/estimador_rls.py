@@ -0,0 +1,121 @@
+from datetime import date, datetime
+
+class EstimadorRLS:
+    """
+    Modelo de degradación propio de cada activo: recta desgaste = b + m·t (t en años
+    desde la compra) ajustada por mínimos cuadrados recursivos con factor de olvido.
+    Cada evidencia nueva (incidencia, dictamen de IA, resultado de triaje) cuesta O(1)
+    y el estado completo cabe en unos pocos números, que se persisten junto al activo.
+    """
+    __slots__ = ("theta", "P", "n", "olvido")
+
+    DIAS_POR_ANIO = 365.25
+    # Señal de desgaste que aporta cada tipo de evento (gana el primer patrón presente,
+    # por eso los más específicos van primero)
+    SENALES = (
+        ("BAJA DEFINITIVA", 1.0),
+        ("REPARACIÓN/ALTA", 0.35),
+        ("DESESTIMADO", 0.35),
+        ("FALLA CONFIRMADA", 0.85),
+        ("ANOMAL", 0.85),
+        ("NO CONCLUYENTE", 0.6),
+        ("REPORT", 0.6),
+        ("OK: DENTRO", 0.35),
+    )
+
+    def __init__(self, theta=(0.0, 0.0), P=(1e3, 0.0, 0.0, 1e3), n=0, olvido=0.98):
+        self.theta = [float(v) for v in theta]
+        self.P = [float(v) for v in P]
+        self.n = int(n)
+        self.olvido = float(olvido)
+
+    @classmethod
+    def con_prior(cls, dias_uso, desgaste_teorico, olvido=0.98):
+        """
+        Punto de partida equivalente a la heurística previa: los tres puntos de control
+        (0, 0), (d/2, w/2.1) y (d, w) de la curva teórica, sin contar como evidencia.
+        """
+        estimador = cls(olvido=1.0)
+        d = max(dias_uso, 1)
+        for x, y in ((0, 0.0), (d // 2, desgaste_teorico / 2.1), (d, desgaste_teorico)):
+            estimador._actualizar(x / cls.DIAS_POR_ANIO, y)
+        estimador.n = 0
+        estimador.olvido = olvido
+        return estimador
+
+    # --- ACTUALIZACIÓN EN LÍNEA ---
+    def _actualizar(self, t, y):
+        """Paso RLS para el regresor (1, t): O(1) en tiempo y memoria."""
+        p00, p01, p10, p11 = self.P
+        # P·x con x = (1, t)
+        px0, px1 = p00 + p01 * t, p10 + p11 * t
+        denominador = self.olvido + px0 + t * px1
+        k0, k1 = px0 / denominador, px1 / denominador
+        error = y - (self.theta[0] + self.theta[1] * t)
+        self.theta = [self.theta[0] + k0 * error, self.theta[1] + k1 * error]
+        # P = (P - k·xᵀ·P) / λ ; xᵀ·P = (p00 + t·p10, p01 + t·p11)
+        fila0, fila1 = p00 + t * p10, p01 + t * p11
+        self.P = [(p00 - k0 * fila0) / self.olvido, (p01 - k0 * fila1) / self.olvido,
+                  (p10 - k1 * fila0) / self.olvido, (p11 - k1 * fila1) / self.olvido]
+        self.n += 1
+
+    def observar(self, evento, fecha_compra, hoy=None):
+        """
+        Incorpora un evento del historial. Retorna True si aportó evidencia
+        (los eventos sin señal reconocible se ignoran).
+        """
+        senal = self.senal_de(evento)
+        if senal is None:
+            return False
+        dias = (self._fecha_evento(evento, hoy) - self._fecha(fecha_compra, hoy)).days
+        self._actualizar(max(dias, 0) / self.DIAS_POR_ANIO, senal)
+        return True
+
+    @classmethod
+    def senal_de(cls, evento):
+        if not isinstance(evento, dict):
+            return None
+        texto = f"{evento.get('detalle', '')} {evento.get('dictamen_ia', '')}".upper()
+        for patron, valor in cls.SENALES:
+            if patron in texto:
+                return valor
+        return None
+
+    # --- PREDICCIÓN ---
+    @property
+    def intercepto(self):
+        return self.theta[0]
+
+    @property
+    def pendiente_diaria(self):
+        return self.theta[1] / self.DIAS_POR_ANIO
+
+    def predecir(self, dias):
+        return self.intercepto + self.pendiente_diaria * dias
+
+    def dias_para_falla(self, por_defecto=3650):
+        """Días desde la compra hasta que la recta alcanza el umbral de falla (1.0)."""
+        if self.pendiente_diaria <= 0:
+            return por_defecto
+        return (1.0 - self.intercepto) / self.pendiente_diaria
+
+    # --- PERSISTENCIA ---
+    def to_dict(self):
+        return {"theta": list(self.theta), "P": list(self.P), "n": self.n, "olvido": self.olvido}
+
+    @classmethod
+    def desde_dict(cls, datos):
+        if not datos:
+            return None
+        return cls(datos["theta"], datos["P"], datos.get("n", 0), datos.get("olvido", 0.98))
+
+    @staticmethod
+    def _fecha(texto, hoy=None):
+        try:
+            return datetime.strptime(str(texto)[:10], "%Y-%m-%d").date()
+        except ValueError:
+            return hoy or date.today()
+
+    @classmethod
+    def _fecha_evento(cls, evento, hoy=None):
+        return cls._fecha(evento.get("fecha"), hoy)
@@ -1,28 +1,93 @@
 import math
 from datetime import datetime
+import numpy as np
 from src.interfaces.estrategias import IEstrategiaDesgaste 
+from src.logical.weibull import DIAS_POR_ANIO, probabilidad_falla
 
 class DesgasteLineal(IEstrategiaDesgaste):
     """
     Estrategia de cálculo basada en una depreciación constante anual.
     Ideal para mobiliario o equipos mecánicos simples.
     """
-    def calcular(self, fecha_compra: str) -> float:
+    def calcular(self, fecha_compra: str, hoy=None) -> float:
         anio_compra = int(fecha_compra.split("-")[0])
-        anio_actual = datetime.now().year
+        anio_actual = (hoy or self.hoy()).year
         t = max(1, anio_actual - anio_compra)
         
         return round(min(t * 0.05, 1.0), 2)
 
+    def _calcular_fechas(self, fechas, hoy) -> np.ndarray:
+        t = self._antiguedad_anios(fechas, hoy)
+        return np.round(np.minimum(t * 0.05, 1.0), 2)
+
 class DesgasteExponencial(IEstrategiaDesgaste):
     """
     Estrategia para equipos con obsolescencia tecnológica acelerada.
     Aplica una curva exponencial de desgaste.
     """
-    def calcular(self, fecha_compra: str) -> float:
+    def calcular(self, fecha_compra: str, hoy=None) -> float:
         anio_compra = int(fecha_compra.split("-")[0])
-        anio_actual = datetime.now().year
+        anio_actual = (hoy or self.hoy()).year
         t = max(1, anio_actual - anio_compra)
         
         indice = (math.exp(0.2 * t) - 1) / 10
         return round(min(indice, 1.0), 2)
+
+    def _calcular_fechas(self, fechas, hoy) -> np.ndarray:
+        t = self._antiguedad_anios(fechas, hoy)
+        return np.round(np.minimum((np.exp(0.2 * t) - 1) / 10, 1.0), 2)
+
+class DesgasteWeibull(IEstrategiaDesgaste):
+    """
+    Estrategia basada en la curva de supervivencia Weibull del tipo de equipo:
+    el desgaste es la probabilidad acumulada de falla F(t) = 1 - exp(-(t/λ)ᵏ).
+    Los parámetros (k, λ) se ajustan sobre la flota en segundo plano
+    (AjusteWeibullService) y se leen de una caché compartida; mientras el tipo
+    no tenga ajuste se usa la estrategia de respaldo.
+    """
+    def __init__(self, tipo, parametros, respaldo=None, reloj=None):
+        super().__init__(reloj)
+        self.tipo = tipo
+        self.parametros = parametros
+        self.respaldo = respaldo or DesgasteLineal(reloj)
+
+    @property
+    def version(self):
+        """Cambia con cada reajuste: forma parte de la clave del memo de Equipo."""
+        return self.parametros.version
+
+    def calcular(self, fecha_compra: str, hoy=None) -> float:
+        ajuste = self.parametros.obtener(self.tipo)
+        if ajuste is None:
+            return self.respaldo.calcular(fecha_compra, hoy)
+        anios = ((hoy or self.hoy()) - datetime.strptime(fecha_compra[:10], "%Y-%m-%d").date()).days / DIAS_POR_ANIO
+        return round(min(float(probabilidad_falla(anios, *ajuste)), 1.0), 2)
+
+    def calcular_lote(self, fechas, hoy=None) -> np.ndarray:
+        if self.parametros.obtener(self.tipo) is None:
+            return self.respaldo.calcular_lote(fechas, hoy)
+        return super().calcular_lote(fechas, hoy)
+
+    def _calcular_fechas(self, fechas, hoy) -> np.ndarray:
+        ajuste = self.parametros.obtener(self.tipo)
+        dias = (np.datetime64(hoy, "D") - fechas).astype(float)
+        return np.round(np.minimum(probabilidad_falla(dias / DIAS_POR_ANIO, *ajuste), 1.0), 2)
+
+
+class EstrategiasWeibull(dict):
+    """
+    Registro tipo -> DesgasteWeibull que comparte una caché de parámetros.
+    Un tipo sin entrada (por ejemplo uno registrado en la fábrica después de
+    arrancar) obtiene su estrategia al pedirla con [], nunca la de respaldo:
+    así el activo conserva "DesgasteWeibull" al volver a guardarse.
+    """
+    def __init__(self, parametros, respaldo=None, tipos=()):
+        super().__init__()
+        self.parametros = parametros
+        self.respaldo = respaldo
+        for tipo in tipos:
+            self[tipo]
+
+    def __missing__(self, tipo):
+        estrategia = self[tipo] = DesgasteWeibull(tipo, self.parametros, self.respaldo)
+        return estrategia
@@ -7,6 +7,8 @@ class Osciloscopio(Equipo, IdentificableQR):
     Representa equipos de medición de señales eléctricas.
     Hereda capacidades de identificación por QR.
     """
+    __slots__ = ("ancho_banda",)
+
     def __init__(self, id_activo, modelo, fecha, ancho_banda, estrategia):
         super().__init__(id_activo, modelo, fecha, estrategia)
         self.ancho_banda = ancho_banda
@@ -17,6 +19,8 @@ class Multimetro(Equipo, IdentificableQR):
     """
     Instrumentación portátil para medición de magnitudes eléctricas.
     """
+    __slots__ = ("precision", "es_digital")
+
     def __init__(self, id_activo, modelo, fecha, precision, es_digital: bool, estrategia):
         super().__init__(id_activo, modelo, fecha, estrategia)
         self.precision = precision
@@ -28,6 +32,8 @@ class MotorInduccion(Equipo, IdentificableQR, AnalizadorPredictivo):
     Equipos de potencia que requieren análisis predictivo de vibraciones.
     Utiliza herencia múltiple para combinar Mixins de QR y Predicción.
     """
+    __slots__ = ("hp", "voltaje", "rpm")
+
     def __init__(self, id_activo, modelo, fecha, hp, voltaje, rpm, estrategia):
         super().__init__(id_activo, modelo, fecha, estrategia)
         self.hp = hp
@@ -1,7 +1,9 @@
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import numpy as np
 from src.utils.enums import EstadoEquipo
+from src.logical.estimador_rls import EstimadorRLS
 
 # Asegurar que el sistema reconozca la ruta raíz para imports
 sys.path.append(os.getcwd())
@@ -16,7 +18,13 @@ class Equipo:
     """
     Clase base que representa un activo de laboratorio.
     Implementa el Patrón Strategy para obsolescencia y lógica de supervisión automática.
+    Declara sus atributos con __slots__ (sin __dict__ por instancia) para que los
+    inventarios grandes ocupen poca memoria. 'ubicacion' se asigna al mapear desde la
+    base de datos; mientras no se asigne, getattr(equipo, 'ubicacion', ...) usa su valor por defecto.
     """
+    __slots__ = ("id_activo", "modelo", "fecha_compra", "estado", "historial_incidencias",
+                 "estrategia_desgaste", "ubicacion", "modelo_desgaste", "_cache_obsolescencia")
+
     def __init__(self, id_activo: str, modelo: str, fecha_compra: str, estrategia):
         self.id_activo = id_activo
         self.modelo = modelo
@@ -24,16 +32,33 @@ class Equipo:
         self.estado = EstadoEquipo.OPERATIVO
         self.historial_incidencias = []
         self.estrategia_desgaste = estrategia
+        # Estimador RLS propio (EstimadorRLS); se crea con la primera evidencia
+        self.modelo_desgaste = None
 
     def calcular_obsolescencia(self) -> float:
         """
         Calcula el desgaste basándose en la estrategia matemática y reglas de negocio.
+        El resultado se memoriza con granularidad de día: se recalcula solo si cambian
+        la estrategia (o su versión, si se reajusta), la fecha de compra, el estado o la
+        fecha del reloj de la estrategia.
         """
         if not hasattr(self, 'estrategia_desgaste') or self.estrategia_desgaste is None:
             return 0.0
-            
-        valor_teorico = self.estrategia_desgaste.calcular(self.fecha_compra)
-        
+
+        estrategia = self.estrategia_desgaste
+        hoy = estrategia.hoy() if hasattr(estrategia, 'hoy') else date.today()
+        clave = (estrategia, getattr(estrategia, 'version', 0), self.fecha_compra, self.estado, hoy)
+        memo = getattr(self, '_cache_obsolescencia', None)
+        if memo is not None and memo[0] == clave:
+            return memo[1]
+
+        valor = self._obsolescencia_sin_cache(estrategia, hoy)
+        self._cache_obsolescencia = (clave, valor)
+        return valor
+
+    def _obsolescencia_sin_cache(self, estrategia, hoy) -> float:
+        valor_teorico = estrategia.calcular(self.fecha_compra, hoy)
+
         estado_actual = str(self.estado.value).upper() if hasattr(self.estado, 'value') else str(self.estado).upper()
         # Reglas críticas de negocio
         if "BAJA" in estado_actual:
@@ -43,15 +68,81 @@ class Equipo:
             return 0.98 
 
         return min(valor_teorico, 1.0)
+
+    @staticmethod
+    def calcular_obsolescencia_lote(equipos, hoy=None) -> np.ndarray:
+        """
+        Versión vectorizada de calcular_obsolescencia() para una colección de equipos.
+        Evalúa cada estrategia una sola vez sobre todas sus fechas (calcular_lote) y
+        aplica las reglas de negocio por estado mediante máscaras.
+        """
+        equipos = list(equipos)
+        valores = np.zeros(len(equipos))
+        grupos = {}
+        for i, equipo in enumerate(equipos):
+            estrategia = getattr(equipo, 'estrategia_desgaste', None)
+            if estrategia is not None:
+                grupos.setdefault(id(estrategia), (estrategia, []))[1].append(i)
+
+        con_estrategia = np.zeros(len(equipos), dtype=bool)
+        for estrategia, posiciones in grupos.values():
+            fechas = [equipos[i].fecha_compra for i in posiciones]
+            valores[posiciones] = np.minimum(estrategia.calcular_lote(fechas, hoy), 1.0)
+            con_estrategia[posiciones] = True
+
+        estados = np.array([Equipo._texto_estado(e.estado) for e in equipos], dtype=str)
+        # Sin estrategia el valor es 0.0 sin importar el estado (igual que la versión escalar)
+        return np.where(con_estrategia, Equipo.aplicar_reglas_estado(valores, estados), 0.0)
+
+    @staticmethod
+    def aplicar_reglas_estado(valores, estados) -> np.ndarray:
+        """Reglas críticas de negocio en bloque: BAJA -> 1.0 y FALLA -> 0.98."""
+        estados = np.asarray(estados, dtype=str)
+        baja = np.char.find(estados, "BAJA") >= 0
+        falla = np.char.find(estados, "FALLA") >= 0
+        return np.where(baja, 1.0, np.where(falla, 0.98, valores))
+
+    @staticmethod
+    def _texto_estado(estado):
+        return str(estado.value).upper() if hasattr(estado, 'value') else str(estado).upper()
     
     def cambiar_estrategia(self, nueva_estrategia):
         """Permite la variación del algoritmo de cálculo en tiempo de ejecución."""
         self.estrategia_desgaste = nueva_estrategia
 
-    def registrar_incidencia(self, descripcion: str):
-        """Añade un nuevo evento al historial con marca de tiempo."""
+    def registrar_incidencia(self, descripcion: str, **datos_extra):
+        """
+        Añade un nuevo evento al historial con marca de tiempo.
+        Retorna el evento para que el repositorio persista solo ese registro.
+        """
         fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.historial_incidencias.append({"fecha": fecha, "detalle": descripcion})
+        evento = {"fecha": fecha, "detalle": descripcion, **datos_extra}
+        self.anexar_evento(evento)
+        return evento
+
+    def anexar_evento(self, evento):
+        """
+        Agrega un evento ya armado al historial y lo incorpora, en O(1), al modelo de
+        degradación del activo (incidencias, dictámenes de IA y resultados de triaje).
+        """
+        self.historial_incidencias.append(evento)
+        if EstimadorRLS.senal_de(evento) is None:
+            return
+        estrategia = getattr(self, 'estrategia_desgaste', None)
+        hoy = estrategia.hoy() if hasattr(estrategia, 'hoy') else date.today()
+        try:
+            if self.modelo_desgaste is None:
+                # Punto de partida: la curva teórica de la estrategia a la fecha de hoy
+                dias_uso = (hoy - EstimadorRLS._fecha(self.fecha_compra, hoy)).days
+                teorico = estrategia.calcular(self.fecha_compra, hoy) if estrategia else 0.0
+                self.modelo_desgaste = EstimadorRLS.con_prior(dias_uso, min(teorico, 1.0))
+            else:
+                # Copia propia: el estimador original puede estar compartido con otras sesiones
+                self.modelo_desgaste = EstimadorRLS.desde_dict(self.modelo_desgaste.to_dict())
+            self.modelo_desgaste.observar(evento, self.fecha_compra, hoy)
+        except ValueError:
+            # Fecha de compra ilegible: el evento queda en el historial sin aportar al modelo
+            pass
 
     def to_dict(self):
         """Serializa el objeto para almacenamiento en base de datos."""
@@ -61,5 +152,5 @@ class Equipo:
             "fecha_compra": self.fecha_compra,
             "estado": self.estado.value,
             "indice_obsolescencia": self.calcular_obsolescencia(),
-            "incidencias": self.historial_incidencias
+            "incidencias": list(self.historial_incidencias)
         }
\ No newline at end of file
@@ -0,0 +1,140 @@
+import threading
+import uuid
+from collections.abc import MutableSequence
+
+class HistorialPerezoso(MutableSequence):
+    """
+    Historial de incidencias que se descarga del repositorio por páginas y solo
+    cuando alguien lo lee (expander de Gestión Técnica, PDF, triaje).
+    Los eventos agregados con append() no fuerzan la descarga: se guardan aparte
+    y aparecen al final, después de lo persistido. Cada evento agregado recibe un
+    'id_evento' único que viaja con él al servidor: cuando una página trae ese
+    mismo id, el evento ya se persistió y deja de figurar como nuevo.
+    """
+    __slots__ = ("id_activo", "_cargador", "_cargados", "_nuevos", "_completo", "tamano_pagina")
+
+    # Protege la incorporación de páginas cuando varias sesiones leen el mismo activo
+    _lock = threading.Lock()
+
+    def __init__(self, id_activo, cargador, tamano_pagina=50):
+        """
+        'cargador(id_activo, desde, limite)' retorna una lista de eventos, o None si
+        la consulta falló (se reintentará en la próxima lectura).
+        """
+        self.id_activo = id_activo
+        self._cargador = cargador
+        # Vacíos como tupla (sin reservar listas): la mayoría de los activos del
+        # inventario compartido nunca llegan a leer ni agregar eventos
+        self._cargados = ()
+        self._nuevos = ()
+        self._completo = False
+        self.tamano_pagina = tamano_pagina
+
+    @property
+    def cargado(self):
+        """True cuando ya se descargó todo el historial persistido."""
+        return self._completo
+
+    # --- CARGA POR PÁGINAS ---
+    def _cargar_pagina(self):
+        """Descarga la siguiente página. Retorna False si no se pudo avanzar."""
+        desde = len(self._cargados)
+        pagina = self._cargador(self.id_activo, desde, self.tamano_pagina)
+        if pagina is None:
+            return False
+        with self._lock:
+            # Otra sesión pudo haber cargado esta misma página mientras tanto
+            if not self._completo and len(self._cargados) == desde:
+                if self._cargados:
+                    self._cargados.extend(pagina)
+                elif pagina:
+                    self._cargados = list(pagina)
+                self._completo = len(pagina) < self.tamano_pagina
+                if self._nuevos:
+                    self._descartar_persistidos(pagina)
+        return True
+
+    def _descartar_persistidos(self, pagina):
+        """Quita de '_nuevos' los eventos que la escritura diferida ya llevó al servidor."""
+        persistidos = {evento.get("id_evento") for evento in pagina}
+        persistidos.discard(None)
+        if persistidos:
+            self._nuevos = [nuevo for nuevo in self._nuevos if nuevo.get("id_evento") not in persistidos]
+
+    def _cargar_todo(self):
+        while not self._completo and self._cargar_pagina():
+            pass
+
+    def _materializar(self):
+        """Para modificaciones arbitrarias: todo pasa a ser una lista local."""
+        self._cargar_todo()
+        self._cargados = [*self._cargados, *self._nuevos]
+        self._nuevos = ()
+
+    # --- INTERFAZ DE LISTA ---
+    def __iter__(self):
+        i = 0
+        while True:
+            while i < len(self._cargados):
+                yield self._cargados[i]
+                i += 1
+            if self._completo or not self._cargar_pagina():
+                break
+        yield from self._nuevos
+
+    def __len__(self):
+        self._cargar_todo()
+        return len(self._cargados) + len(self._nuevos)
+
+    def __bool__(self):
+        if self._cargados or self._nuevos:
+            return True
+        if not self._completo:
+            self._cargar_pagina()
+        return bool(self._cargados)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, int) and indice >= 0:
+            while indice >= len(self._cargados) and not self._completo and self._cargar_pagina():
+                pass
+            if indice < len(self._cargados):
+                return self._cargados[indice]
+        return list(self)[indice]
+
+    def __setitem__(self, indice, valor):
+        self._materializar()
+        self._cargados[indice] = valor
+
+    def __delitem__(self, indice):
+        self._materializar()
+        del self._cargados[indice]
+
+    def insert(self, indice, valor):
+        self._materializar()
+        self._cargados.insert(indice, valor)
+
+    def append(self, valor):
+        # Mismo dict que se encola para persistir: el id llega al servidor con el evento
+        if isinstance(valor, dict) and "id_evento" not in valor:
+            valor["id_evento"] = uuid.uuid4().hex
+        if self._nuevos:
+            self._nuevos.append(valor)
+        else:
+            self._nuevos = [valor]
+
+    def copy(self):
+        """Copia independiente que comparte el cargador y lo ya descargado."""
+        copia = HistorialPerezoso(self.id_activo, self._cargador, self.tamano_pagina)
+        copia._cargados = list(self._cargados) if self._cargados else ()
+        copia._nuevos = list(self._nuevos) if self._nuevos else ()
+        copia._completo = self._completo
+        return copia
+
+    def __eq__(self, otro):
+        if isinstance(otro, (list, HistorialPerezoso)):
+            return list(self) == list(otro)
+        return NotImplemented
+
+    def __repr__(self):
+        estado = "completo" if self._completo else f"{len(self._cargados)} cargados"
+        return f"HistorialPerezoso({self.id_activo!r}, {estado}, {len(self._nuevos)} nuevos)"
@@ -1,27 +1,106 @@
-import os
-from supabase import create_client
-from dotenv import load_dotenv
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.database.db import DatabaseConnection
+
+# Columnas mínimas para tablas, selectores y búsqueda por QR (sin historial JSONB,
+# que se descarga bajo demanda con leer_historial)
+COLUMNAS_RESUMEN = (
+    "id_activo", "modelo", "tipo_equipo", "ubicacion", "estado",
+    "fecha_compra", "estrategia_nombre", "detalles_tecnicos", "modelo_desgaste"
+)
+
+class ErrorLecturaInventario(Exception):
+    """
+    Una página de la lectura paginada falló: las filas ya entregadas no son el
+    inventario completo y el llamador no debe publicarlas como tal.
+    """
+
 
 class EquipoRepository:
     """
     Repositorio encargado de la persistencia de datos en Supabase.
     Implementa operaciones CRUD para la entidad Equipo.
     """
+    # Versión monotónica de los datos del proceso: cada escritura exitosa la incrementa
+    # para que la instantánea compartida del inventario sepa que debe refrescarse.
+    version_datos = 0
+    _lock_version = threading.Lock()
+
     def __init__(self):
-        
-        load_dotenv()
-        url = os.getenv("SUPABASE_URL")
-        key = os.getenv("SUPABASE_KEY")
-        
-        if not url or not key:
-            self.client = None
-        else:
-            self.client = create_client(url, key)
+        # Cliente compartido por todo el proceso (None si no hay credenciales)
+        self.client = DatabaseConnection.obtener_cliente()
+
+    @classmethod
+    def _marcar_escritura(cls):
+        with EquipoRepository._lock_version:
+            EquipoRepository.version_datos += 1
+
+    @property
+    def disponible(self):
+        """Indica si el backend de persistencia está accesible."""
+        return self.client is not None
 
     def guardar_equipo(self, equipo):
         """Almacena un nuevo equipo con sus detalles técnicos dinámicos."""
         if not self.client: return
 
+        datos_para_nube = self._serializar_equipo(equipo)
+        try:
+            self.client.table("equipos").insert(datos_para_nube).execute()
+            self._marcar_escritura()
+        except Exception as e:
+            print(f"Error al registrar equipo en BD: {e}")
+
+    def guardar_equipos(self, equipos, chunk_size=500, reintentos=3):
+        """
+        Inserta o actualiza (upsert por 'id_activo') una colección de equipos en lotes.
+        Cada lote es una sola petición; si falla se reintenta con espera creciente y,
+        agotados los reintentos, se envía fila por fila para aislar los registros defectuosos.
+        Retorna un resumen con la cantidad guardada y las fallas por fila.
+        """
+        resultado = {"guardados": 0, "fallidos": []}
+        if not self.client: return resultado
+
+        lote = []
+        for equipo in equipos:
+            try:
+                lote.append(self._serializar_equipo(equipo))
+            except Exception as e:
+                resultado["fallidos"].append({"id_activo": getattr(equipo, 'id_activo', 'N/A'), "error": str(e)})
+                continue
+
+            if len(lote) >= chunk_size:
+                self._enviar_lote(lote, reintentos, resultado)
+                lote = []
+
+        if lote:
+            self._enviar_lote(lote, reintentos, resultado)
+        return resultado
+
+    def _enviar_lote(self, filas, reintentos, resultado):
+        """Envía un lote con reintentos; si no se recupera, degrada a envíos individuales."""
+        for intento in range(reintentos):
+            try:
+                self.client.table("equipos").upsert(filas, on_conflict="id_activo").execute()
+                resultado["guardados"] += len(filas)
+                self._marcar_escritura()
+                return
+            except Exception as e:
+                print(f"Lote de {len(filas)} equipos falló (intento {intento + 1}/{reintentos}): {e}")
+                if intento < reintentos - 1:
+                    time.sleep(0.5 * 2 ** intento)
+
+        for fila in filas:
+            try:
+                self.client.table("equipos").upsert(fila, on_conflict="id_activo").execute()
+                resultado["guardados"] += 1
+                self._marcar_escritura()
+            except Exception as e:
+                resultado["fallidos"].append({"id_activo": fila["id_activo"], "error": str(e)})
+
+    def _serializar_equipo(self, equipo):
+        """Convierte un objeto Equipo en el registro plano que espera la tabla 'equipos'."""
         detalles = {}
         # Extracción dinámica de atributos según el tipo de equipo (Patrón Metadata)
         if hasattr(equipo, 'hp'): detalles['hp'] = equipo.hp
@@ -30,40 +109,102 @@ class EquipoRepository:
         if hasattr(equipo, 'ancho_banda'): detalles['ancho_banda'] = equipo.ancho_banda
         if hasattr(equipo, 'precision'): detalles['precision'] = equipo.precision
     
-        ubicacion_final = getattr(equipo, 'ubicacion', 'Sin Ubicación')
-        datos_para_nube = {
+        return {
             "id_activo": equipo.id_activo,
             "modelo": equipo.modelo,
             "tipo_equipo": type(equipo).__name__,
             "fecha_compra": str(equipo.fecha_compra),
     
             "ubicacion": getattr(equipo, 'ubicacion', 'Sin Ubicación'), 
-            "estrategia_nombre": "DesgasteLineal" if "Lineal" in str(type(equipo.estrategia_desgaste)) else "DesgasteExponencial",
+            "estrategia_nombre": self._nombre_estrategia(equipo),
             "detalles_tecnicos": detalles,
-            "historial_incidencias": equipo.historial_incidencias
-}
-        try:
-            self.client.table("equipos").insert(datos_para_nube).execute()
-        except Exception as e:
-            print(f"Error al registrar equipo en BD: {e}")
+            "historial_incidencias": list(equipo.historial_incidencias)
+        }
 
     def leer_todos(self):
         """Recupera la lista completa de activos desde la nube."""
-        if not self.client: return []
+        return list(self.leer_paginado())
+
+    def leer_paginado(self, columnas="*", tamano_pagina=500):
+        """
+        Generador que recorre la tabla por páginas usando un keyset sobre 'id_activo'.
+        Mientras el consumidor procesa una página, la siguiente ya se está descargando.
+        Si una página falla lanza ErrorLecturaInventario: un recorrido a medias nunca
+        termina como si la tabla se hubiera leído entera.
+        """
+        if not self.disponible: return
+
+        if columnas != "*":
+            columnas = list(columnas)
+            if "id_activo" not in columnas:
+                columnas.insert(0, "id_activo")
+            columnas = ",".join(columnas)
+
+        with ThreadPoolExecutor(max_workers=1) as descargador:
+            pendiente = descargador.submit(self._leer_pagina, columnas, None, tamano_pagina)
+            entregadas = 0
+            while pendiente is not None:
+                try:
+                    filas = pendiente.result()
+                except Exception as e:
+                    raise ErrorLecturaInventario(
+                        f"Lectura del inventario interrumpida tras {entregadas} filas: {e}") from e
+
+                # Pedimos la siguiente página antes de entregar la actual (prefetch)
+                pendiente = None
+                if len(filas) == tamano_pagina:
+                    ultimo_id = filas[-1]["id_activo"]
+                    pendiente = descargador.submit(self._leer_pagina, columnas, ultimo_id, tamano_pagina)
+
+                entregadas += len(filas)
+                yield from filas
+
+    def leer_cambios_desde(self, marca, limite=1000, columnas="*"):
+        """
+        Recupera solo las filas modificadas desde la marca 'updated_at' indicada,
+        inclusive (ver src/database/migraciones.sql). El llamador pasa una marca con
+        margen de solape y descarta lo ya aplicado. Retorna None si la consulta no es
+        posible, para que el llamador recurra a una recarga completa.
+        """
+        if not self.client or not marca: return None
+        if columnas != "*":
+            columnas = ",".join(columnas)
         try:
-            response = self.client.table("equipos").select("*").execute()
-            return response.data
+            response = (self.client.table("equipos").select(columnas)
+                        .gte("updated_at", marca)
+                        .order("updated_at").order("id_activo")
+                        .limit(limite).execute())
+            return response.data or []
         except Exception as e:
-            print(f"Error de lectura en base de datos: {e}")
-            return []
+            print(f"Error al consultar cambios incrementales: {e}")
+            return None
+
+    def leer_historial(self, id_activo, desde=0, limite=50):
+        """
+        Página del historial de un activo mediante la función 'leer_historial', que
+        recorta el arreglo JSONB en el servidor. Retorna None si la consulta falla.
+        """
+        if not self.client: return None
+        parametros = {"p_id_activo": id_activo, "p_desde": desde, "p_limite": limite}
+        try:
+            response = self.client.rpc("leer_historial", parametros).execute()
+            return response.data or []
+        except Exception as e:
+            print(f"Error al leer historial de {id_activo}: {e}")
+            return None
+
+    def _leer_pagina(self, columnas, ultimo_id, tamano_pagina):
+        """Consulta una página ordenada por 'id_activo' posterior al último id recibido."""
+        consulta = self.client.table("equipos").select(columnas)
+        if ultimo_id is not None:
+            consulta = consulta.gt("id_activo", ultimo_id)
+        response = consulta.order("id_activo").limit(tamano_pagina).execute()
+        return response.data or []
 
     def actualizar_equipo(self, equipo):
         """Actualiza un equipo existente asegurando que los datos sean compatibles con Supabase"""
         if not self.client: 
             return
-        
-        # Normalización del estado (Enum a String)
-        estado_final = equipo.estado.name if hasattr(equipo.estado, 'name') else str(equipo.estado)
 
         # Sanitización del historial para compatibilidad con JSONB
         historial_seguro = []
@@ -77,11 +218,117 @@ class EquipoRepository:
 
         datos_actualizados = {
             "historial_incidencias": historial_seguro,
-            "estrategia_nombre": "DesgasteLineal" if "Lineal" in str(type(equipo.estrategia_desgaste)) else "DesgasteExponencial",
-            "estado": estado_final
+            "estrategia_nombre": self._nombre_estrategia(equipo),
+            "estado": self._nombre_estado(equipo)
         }
         
         try:
             self.client.table("equipos").update(datos_actualizados).eq("id_activo", equipo.id_activo).execute()
+            self._marcar_escritura()
+        except Exception as e:
+            print(f"Error al actualizar equipo {equipo.id_activo}: {e}")
+
+    def actualizar_estado(self, equipo):
+        """Persiste solo el estado y la estrategia, sin reenviar el historial."""
+        if not self.client:
+            return False
+
+        datos_actualizados = {
+            "estrategia_nombre": self._nombre_estrategia(equipo),
+            "estado": self._nombre_estado(equipo)
+        }
+        try:
+            self.client.table("equipos").update(datos_actualizados).eq("id_activo", equipo.id_activo).execute()
+            self._marcar_escritura()
+            return True
+        except Exception as e:
+            print(f"Error al actualizar estado de {equipo.id_activo}: {e}")
+            return False
+
+    def agregar_incidencia(self, equipo, evento):
+        """
+        Anexa un único evento al historial mediante la función 'agregar_incidencia'
+        (append atómico de JSONB en el servidor) y, en la misma llamada, sincroniza
+        estado, estrategia y el modelo de degradación del activo. El costo de escritura no depende del largo del historial.
+        """
+        if not self.client:
+            return False
+
+        parametros = {
+            "p_id_activo": equipo.id_activo,
+            "p_evento": evento,
+            "p_estado": self._nombre_estado(equipo),
+            "p_estrategia": self._nombre_estrategia(equipo),
+            "p_modelo": self._serializar_modelo(equipo)
+        }
+        try:
+            self.client.rpc("agregar_incidencia", parametros).execute()
+            self._marcar_escritura()
+            return True
+        except Exception as e:
+            print(f"Error al registrar incidencia de {equipo.id_activo}: {e}")
+            return False
+
+    def agregar_incidencias(self, equipo, eventos):
+        """Igual que agregar_incidencia pero anexando varios eventos en una sola escritura."""
+        if not self.client:
+            return False
+
+        parametros = {
+            "p_id_activo": equipo.id_activo,
+            "p_eventos": list(eventos),
+            "p_estado": self._nombre_estado(equipo),
+            "p_estrategia": self._nombre_estrategia(equipo),
+            "p_modelo": self._serializar_modelo(equipo)
+        }
+        try:
+            self.client.rpc("agregar_incidencias", parametros).execute()
+            self._marcar_escritura()
+            return True
+        except Exception as e:
+            print(f"Error al registrar incidencias de {equipo.id_activo}: {e}")
+            return False
+
+    def agregar_incidencias_lote(self, cambios):
+        """
+        Persiste en una sola llamada los cambios de varios activos: 'cambios' es una
+        lista de (equipo, eventos) y cada activo recibe sus eventos (puede no tener
+        ninguno) junto con su estado, estrategia y modelo de degradación. La función
+        'agregar_incidencias_lote' aplica todo en una única sentencia: o se guarda el
+        lote completo o nada.
+        """
+        if not self.client:
+            return False
+
+        parametros = {"p_cambios": [{
+            "id_activo": equipo.id_activo,
+            "eventos": list(eventos),
+            "estado": self._nombre_estado(equipo),
+            "estrategia": self._nombre_estrategia(equipo),
+            "modelo": self._serializar_modelo(equipo)
+        } for equipo, eventos in cambios]}
+        try:
+            self.client.rpc("agregar_incidencias_lote", parametros).execute()
+            self._marcar_escritura()
+            return True
         except Exception as e:
-            print(f"Error al actualizar equipo {equipo.id_activo}: {e}")
\ No newline at end of file
+            print(f"Error al persistir un lote de {len(parametros['p_cambios'])} activos: {e}")
+            return False
+
+    @staticmethod
+    def _nombre_estado(equipo):
+        # Normalización del estado (Enum a String)
+        return equipo.estado.name if hasattr(equipo.estado, 'name') else str(equipo.estado)
+
+    @staticmethod
+    def _nombre_estrategia(equipo):
+        nombre = type(equipo.estrategia_desgaste).__name__
+        if nombre == "DesgasteWeibull":
+            return nombre
+        return "DesgasteLineal" if "Lineal" in nombre else "DesgasteExponencial"
+
+    @staticmethod
+    def _serializar_modelo(equipo):
+        # Estado del estimador RLS del activo (None si aún no acumula evidencia)
+        modelo = getattr(equipo, 'modelo_desgaste', None)
+        return modelo.to_dict() if modelo is not None else None
@@ -0,0 +1,25 @@
+import os
+from dotenv import load_dotenv
+from src.repositories.equipo_repository import EquipoRepository
+
+load_dotenv()
+
+class RepositorioFactory:
+    """
+    Selecciona el backend de persistencia según la configuración del entorno:
+    FIEE_BACKEND=supabase (por defecto) o FIEE_BACKEND=sqlite con FIEE_SQLITE_RUTA.
+    """
+    _sqlite = None
+
+    @classmethod
+    def crear(cls):
+        backend = os.getenv("FIEE_BACKEND", "supabase").strip().lower()
+
+        if backend == "sqlite":
+            # Se reutiliza la misma instancia: el esquema se crea una sola vez por proceso
+            if cls._sqlite is None:
+                from src.repositories.sqlite_equipo_repository import SqliteEquipoRepository
+                cls._sqlite = SqliteEquipoRepository(os.getenv("FIEE_SQLITE_RUTA", "fiee_local.db"))
+            return cls._sqlite
+
+        return EquipoRepository()
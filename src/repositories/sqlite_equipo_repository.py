@@ -0,0 +1,282 @@
+import json
+import sqlite3
+import threading
+from src.repositories.equipo_repository import EquipoRepository
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS equipos (
+    id_activo TEXT PRIMARY KEY,
+    modelo TEXT,
+    tipo_equipo TEXT,
+    fecha_compra TEXT,
+    ubicacion TEXT,
+    estado TEXT DEFAULT 'OPERATIVO',
+    estrategia_nombre TEXT,
+    modelo_desgaste TEXT,
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_equipos_updated_at ON equipos (updated_at, id_activo);
+CREATE INDEX IF NOT EXISTS idx_equipos_ubicacion ON equipos (ubicacion);
+CREATE INDEX IF NOT EXISTS idx_equipos_estado ON equipos (estado);
+
+CREATE TABLE IF NOT EXISTS detalles_tecnicos (
+    id_activo TEXT NOT NULL REFERENCES equipos (id_activo) ON DELETE CASCADE,
+    clave TEXT NOT NULL,
+    valor TEXT,
+    PRIMARY KEY (id_activo, clave)
+);
+
+CREATE TABLE IF NOT EXISTS incidencias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_activo TEXT NOT NULL REFERENCES equipos (id_activo) ON DELETE CASCADE,
+    evento TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidencias_activo ON incidencias (id_activo, id);
+"""
+
+_AHORA = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+
+class SqliteEquipoRepository(EquipoRepository):
+    """
+    Repositorio local sobre SQLite con el mismo contrato que EquipoRepository.
+    Pensado para despliegues sin acceso a Supabase y como línea base de rendimiento
+    sin red. Usa modo WAL, transacciones por lote y tablas indexadas para
+    detalles técnicos e incidencias.
+    """
+    def __init__(self, ruta="fiee_local.db"):
+        self.ruta = ruta
+        # Sin nube: no hay Storage para evidencias
+        self.client = None
+        self._local = threading.local()
+        with self._conexion() as con:
+            con.executescript(_ESQUEMA)
+            # Bases creadas antes de existir el modelo de degradación por activo
+            columnas = {fila["name"] for fila in con.execute("PRAGMA table_info(equipos)")}
+            if "modelo_desgaste" not in columnas:
+                con.execute("ALTER TABLE equipos ADD COLUMN modelo_desgaste TEXT")
+
+    @property
+    def disponible(self):
+        return True
+
+    def _conexion(self):
+        """Una conexión por hilo (Streamlit atiende cada sesión en su propio hilo)."""
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.ruta, check_same_thread=False)
+            con.row_factory = sqlite3.Row
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute("PRAGMA foreign_keys=ON")
+            self._local.con = con
+        return con
+
+    # --- ESCRITURA ---
+    def guardar_equipo(self, equipo):
+        """Almacena un nuevo equipo con sus detalles técnicos dinámicos."""
+        try:
+            with self._conexion() as con:
+                self._insertar(con, self._serializar_equipo(equipo), reemplazar=False)
+            self._marcar_escritura()
+        except Exception as e:
+            print(f"Error al registrar equipo en BD: {e}")
+
+    def guardar_equipos(self, equipos, chunk_size=500, reintentos=3):
+        """Upsert por lotes: cada lote es una sola transacción."""
+        resultado = {"guardados": 0, "fallidos": []}
+        lote = []
+        for equipo in equipos:
+            try:
+                lote.append(self._serializar_equipo(equipo))
+            except Exception as e:
+                resultado["fallidos"].append({"id_activo": getattr(equipo, 'id_activo', 'N/A'), "error": str(e)})
+                continue
+            if len(lote) >= chunk_size:
+                self._enviar_lote(lote, reintentos, resultado)
+                lote = []
+        if lote:
+            self._enviar_lote(lote, reintentos, resultado)
+        return resultado
+
+    def _enviar_lote(self, filas, reintentos, resultado):
+        con = self._conexion()
+        try:
+            with con:
+                for fila in filas:
+                    self._insertar(con, fila, reemplazar=True)
+            resultado["guardados"] += len(filas)
+            self._marcar_escritura()
+            return
+        except Exception as e:
+            print(f"Lote de {len(filas)} equipos falló: {e}")
+
+        # El lote se revirtió completo: se aíslan las filas defectuosas una a una
+        for fila in filas:
+            try:
+                with con:
+                    self._insertar(con, fila, reemplazar=True)
+                resultado["guardados"] += 1
+                self._marcar_escritura()
+            except Exception as e:
+                resultado["fallidos"].append({"id_activo": fila["id_activo"], "error": str(e)})
+
+    def _insertar(self, con, fila, reemplazar):
+        id_activo = fila["id_activo"]
+        columnas = ("id_activo", "modelo", "tipo_equipo", "fecha_compra", "ubicacion", "estrategia_nombre")
+        valores = [fila[c] for c in columnas]
+        if reemplazar:
+            con.execute(
+                f"""INSERT INTO equipos ({", ".join(columnas)}) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id_activo) DO UPDATE SET
+                        modelo = excluded.modelo, tipo_equipo = excluded.tipo_equipo,
+                        fecha_compra = excluded.fecha_compra, ubicacion = excluded.ubicacion,
+                        estrategia_nombre = excluded.estrategia_nombre, updated_at = {_AHORA}""",
+                valores
+            )
+            con.execute("DELETE FROM detalles_tecnicos WHERE id_activo = ?", (id_activo,))
+            con.execute("DELETE FROM incidencias WHERE id_activo = ?", (id_activo,))
+        else:
+            con.execute(f"INSERT INTO equipos ({', '.join(columnas)}) VALUES (?, ?, ?, ?, ?, ?)", valores)
+
+        con.executemany(
+            "INSERT INTO detalles_tecnicos (id_activo, clave, valor) VALUES (?, ?, ?)",
+            [(id_activo, clave, json.dumps(valor)) for clave, valor in fila["detalles_tecnicos"].items()]
+        )
+        con.executemany(
+            "INSERT INTO incidencias (id_activo, evento) VALUES (?, ?)",
+            [(id_activo, json.dumps(evento, default=str)) for evento in fila["historial_incidencias"]]
+        )
+
+    def actualizar_equipo(self, equipo):
+        """Reescribe estado, estrategia e historial completo del activo."""
+        try:
+            with self._conexion() as con:
+                self._actualizar_estado(con, equipo)
+                con.execute("DELETE FROM incidencias WHERE id_activo = ?", (equipo.id_activo,))
+                con.executemany(
+                    "INSERT INTO incidencias (id_activo, evento) VALUES (?, ?)",
+                    [(equipo.id_activo, json.dumps(ev if isinstance(ev, dict) else str(ev), default=str))
+                     for ev in equipo.historial_incidencias]
+                )
+            self._marcar_escritura()
+        except Exception as e:
+            print(f"Error al actualizar equipo {equipo.id_activo}: {e}")
+
+    def actualizar_estado(self, equipo):
+        """Persiste solo el estado y la estrategia, sin reenviar el historial."""
+        try:
+            with self._conexion() as con:
+                self._actualizar_estado(con, equipo)
+            self._marcar_escritura()
+            return True
+        except Exception as e:
+            print(f"Error al actualizar estado de {equipo.id_activo}: {e}")
+            return False
+
+    def agregar_incidencia(self, equipo, evento):
+        """Anexa un único evento y sincroniza estado, estrategia y modelo en la misma transacción."""
+        return self.agregar_incidencias(equipo, [evento])
+
+    def agregar_incidencias(self, equipo, eventos):
+        """Anexa varios eventos y sincroniza estado, estrategia y modelo en la misma transacción."""
+        try:
+            with self._conexion() as con:
+                con.executemany("INSERT INTO incidencias (id_activo, evento) VALUES (?, ?)",
+                                [(equipo.id_activo, json.dumps(ev, default=str)) for ev in eventos])
+                self._actualizar_estado(con, equipo)
+                self._guardar_modelo(con, equipo)
+            self._marcar_escritura()
+            return True
+        except Exception as e:
+            print(f"Error al registrar incidencias de {equipo.id_activo}: {e}")
+            return False
+
+    def agregar_incidencias_lote(self, cambios):
+        """Persiste los cambios (equipo, eventos) de varios activos en una sola transacción."""
+        cambios = list(cambios)
+        try:
+            with self._conexion() as con:
+                con.executemany("INSERT INTO incidencias (id_activo, evento) VALUES (?, ?)",
+                                [(equipo.id_activo, json.dumps(ev, default=str))
+                                 for equipo, eventos in cambios for ev in eventos])
+                for equipo, _ in cambios:
+                    self._actualizar_estado(con, equipo)
+                    self._guardar_modelo(con, equipo)
+            self._marcar_escritura()
+            return True
+        except Exception as e:
+            print(f"Error al persistir un lote de {len(cambios)} activos: {e}")
+            return False
+
+    def _actualizar_estado(self, con, equipo):
+        con.execute(
+            f"UPDATE equipos SET estado = ?, estrategia_nombre = ?, updated_at = {_AHORA} WHERE id_activo = ?",
+            (self._nombre_estado(equipo), self._nombre_estrategia(equipo), equipo.id_activo)
+        )
+
+    def _guardar_modelo(self, con, equipo):
+        modelo = self._serializar_modelo(equipo)
+        if modelo is not None:
+            con.execute("UPDATE equipos SET modelo_desgaste = ? WHERE id_activo = ?",
+                        (json.dumps(modelo), equipo.id_activo))
+
+    # --- LECTURA ---
+    def leer_cambios_desde(self, marca, limite=1000, columnas="*"):
+        """Filas modificadas desde la marca 'updated_at' (inclusive)."""
+        if not marca: return None
+        filas = self._conexion().execute(
+            "SELECT * FROM equipos WHERE updated_at >= ? ORDER BY updated_at, id_activo LIMIT ?",
+            (marca, limite)
+        ).fetchall()
+        return self._proyectar(filas, None if columnas == "*" else list(columnas))
+
+    def leer_historial(self, id_activo, desde=0, limite=50):
+        """Página del historial de un activo, en orden de registro."""
+        filas = self._conexion().execute(
+            "SELECT evento FROM incidencias WHERE id_activo = ? ORDER BY id LIMIT ? OFFSET ?",
+            (id_activo, limite, desde)
+        ).fetchall()
+        return [json.loads(evento) for (evento,) in filas]
+
+    def _leer_pagina(self, columnas, ultimo_id, tamano_pagina):
+        """Página ordenada por 'id_activo'; detalles e historial se arman desde sus tablas."""
+        filas = self._conexion().execute(
+            "SELECT * FROM equipos WHERE id_activo > ? ORDER BY id_activo LIMIT ?",
+            ("" if ultimo_id is None else ultimo_id, tamano_pagina)
+        ).fetchall()
+        return self._proyectar(filas, None if columnas == "*" else columnas.split(","))
+
+    def _proyectar(self, filas, pedidas):
+        """Arma los registros y se queda solo con las columnas pedidas (None = todas)."""
+        incluir_historial = pedidas is None or "historial_incidencias" in pedidas
+        registros = self._armar_filas(filas, incluir_historial)
+        if pedidas is None:
+            return registros
+        return [{c: r.get(c) for c in pedidas} for r in registros]
+
+    def _armar_filas(self, filas, incluir_historial):
+        """Convierte filas SQLite en registros con la misma forma que devuelve Supabase."""
+        registros = [dict(f) for f in filas]
+        if not registros:
+            return registros
+
+        ids = [r["id_activo"] for r in registros]
+        marcadores = ",".join("?" * len(ids))
+        por_id = {r["id_activo"]: r for r in registros}
+        for r in registros:
+            r["detalles_tecnicos"] = {}
+            r["historial_incidencias"] = []
+            if r.get("modelo_desgaste"):
+                r["modelo_desgaste"] = json.loads(r["modelo_desgaste"])
+
+        con = self._conexion()
+        for id_activo, clave, valor in con.execute(
+                f"SELECT id_activo, clave, valor FROM detalles_tecnicos WHERE id_activo IN ({marcadores})", ids):
+            por_id[id_activo]["detalles_tecnicos"][clave] = json.loads(valor)
+
+        if incluir_historial:
+            for id_activo, evento in con.execute(
+                    f"SELECT id_activo, evento FROM incidencias WHERE id_activo IN ({marcadores}) ORDER BY id", ids):
+                por_id[id_activo]["historial_incidencias"].append(json.loads(evento))
+        return registros
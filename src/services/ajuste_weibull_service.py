@@ -0,0 +1,124 @@
+import re
+import threading
+from datetime import date, datetime
+import numpy as np
+from src.logical.weibull import DIAS_POR_ANIO, ajustar_weibull
+
+class AjusteWeibullService:
+    """
+    Reajuste periódico, en segundo plano, de las curvas Weibull por tipo de equipo.
+    Toma la flota de 'fuente()' (por ejemplo la instantánea compartida), arma las
+    muestras de supervivencia (activos en FALLA/BAJA como fallas, el resto como
+    censurados) y publica los parámetros en la caché ParametrosWeibull.
+    Si se da 'historiales()', los historiales de las fallas se toman de ese único
+    recorrido paginado ((id_activo, eventos) por fila) en lugar de descargar el
+    historial perezoso de cada activo por separado.
+    """
+    ESTADOS_FALLA = ("FALLA", "BAJA")
+    # Palabras completas: "TRABAJA" o "FALLAS" no cuentan como evento de falla/baja
+    _EVENTO_FALLA = re.compile(r"\b(FALLA|BAJA)\b")
+
+    def __init__(self, fuente, parametros, intervalo=3600.0, reloj=None, historiales=None):
+        self._fuente = fuente
+        self._historiales = historiales
+        self.parametros = parametros
+        self.intervalo = intervalo
+        self.reloj = reloj
+        self.ultimo_error = None
+        self._lock = threading.Lock()
+        self._detenido = threading.Event()
+        self._hilo = None
+
+    # --- AJUSTE ---
+    def ajustar_ahora(self):
+        """Ajusta todos los tipos con fallas suficientes. Retorna los parámetros publicados."""
+        hoy = self.reloj.hoy() if self.reloj is not None else date.today()
+        equipos = self._fuente()
+        historiales = None
+        if self._historiales is not None:
+            ids_falla = {e.id_activo for e in equipos if self._es_falla(e)}
+            if ids_falla:
+                historiales = {id_activo: eventos for id_activo, eventos in self._historiales()
+                               if id_activo in ids_falla}
+        ajustes = {}
+        for tipo, (tiempos, fallas) in self.datos_supervivencia(equipos, hoy, historiales).items():
+            ajuste = ajustar_weibull(tiempos, fallas)
+            if ajuste is not None:
+                ajustes[tipo] = ajuste
+        if ajustes:
+            self.parametros.publicar(ajustes)
+        return ajustes
+
+    @classmethod
+    def datos_supervivencia(cls, equipos, hoy, historiales=None):
+        """
+        {tipo: (años de servicio, es_falla)} por tipo de equipo. Para las fallas el
+        tiempo llega hasta el último evento de falla/baja del historial (solo se lee
+        el historial de esos activos, de 'historiales' {id_activo: eventos} si se da);
+        los operativos quedan censurados a 'hoy'. El estado FALLA/BAJA ya es la falla:
+        sin evento de falla fechado se toma el último evento fechado o, si no hay, 'hoy'.
+        """
+        muestras = {}
+        for equipo in equipos:
+            try:
+                compra = datetime.strptime(str(equipo.fecha_compra)[:10], "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            falla = cls._es_falla(equipo)
+            fin = hoy
+            if falla:
+                eventos = equipo.historial_incidencias if historiales is None \
+                    else historiales.get(equipo.id_activo, ())
+                fin = cls._fecha_falla(eventos) or hoy
+            tiempos, fallas = muestras.setdefault(type(equipo).__name__, ([], []))
+            tiempos.append((fin - compra).days / DIAS_POR_ANIO)
+            fallas.append(falla)
+        return {tipo: (np.array(t), np.array(f, dtype=bool)) for tipo, (t, f) in muestras.items()}
+
+    @classmethod
+    def _es_falla(cls, equipo):
+        nombre = equipo.estado.name if hasattr(equipo.estado, 'name') else str(equipo.estado).upper()
+        return nombre in cls.ESTADOS_FALLA
+
+    @classmethod
+    def _fecha_falla(cls, eventos):
+        """
+        Fecha del último evento de falla/baja; si ninguno lo es, la del último evento
+        fechado. None si el historial no tiene fechas.
+        """
+        fecha_falla = fecha_ultimo = None
+        for evento in eventos:
+            try:
+                fecha = datetime.strptime(str(evento.get("fecha"))[:10], "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            fecha_ultimo = fecha
+            texto = f"{evento.get('detalle', '')} {evento.get('dictamen_ia', '')}".upper()
+            if cls._EVENTO_FALLA.search(texto):
+                fecha_falla = fecha
+        return fecha_falla or fecha_ultimo
+
+    # --- HILO DE FONDO ---
+    def iniciar(self):
+        """Arranca el reajuste periódico (idempotente)."""
+        if self._hilo is None or not self._hilo.is_alive():
+            with self._lock:
+                if self._hilo is None or not self._hilo.is_alive():
+                    self._detenido.clear()
+                    self._hilo = threading.Thread(target=self._bucle, name="ajuste-weibull-fiee", daemon=True)
+                    self._hilo.start()
+
+    def detener(self):
+        self._detenido.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+
+    def _bucle(self):
+        while not self._detenido.is_set():
+            try:
+                self.ajustar_ahora()
+                self.ultimo_error = None
+            except Exception as e:
+                # Un fallo de lectura no detiene el servicio: se reintenta en el próximo ciclo
+                self.ultimo_error = str(e)
+            self._detenido.wait(timeout=self.intervalo)
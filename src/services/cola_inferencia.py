@@ -0,0 +1,109 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class ColaInferencia:
+    """
+    Micro-batching dinámico delante del modelo de visión.
+    Las sesiones encolan imágenes y reciben un Future; un hilo de fondo junta las
+    solicitudes que llegan dentro de 'espera_ms' (o hasta 'max_lote'), ejecuta
+    una sola pasada por lotes con 'procesar_lote' y reparte cada resultado a
+    quien lo pidió. Con una sola solicitud la latencia extra es como mucho 'espera_ms'.
+    """
+    def __init__(self, procesar_lote, max_lote=8, espera_ms=10):
+        """
+        'procesar_lote(items)' retorna una lista de resultados en el mismo orden, o
+        un Future de esa lista (así varios lotes pueden estar en vuelo a la vez,
+        por ejemplo en un pool de procesos).
+        """
+        self._procesar_lote = procesar_lote
+        self.max_lote = max_lote
+        self.espera_ms = espera_ms
+        self._entrada = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._hilo = None
+        # Métricas simples para dimensionar 'max_lote' y 'espera_ms'
+        self.lotes_procesados = 0
+        self.items_procesados = 0
+
+    def enviar(self, item):
+        """Encola una solicitud y retorna un Future con su resultado."""
+        futuro = Future()
+        self._entrada.put((item, futuro))
+        self._asegurar_hilo()
+        return futuro
+
+    def procesar(self, item, timeout=None):
+        """Versión síncrona: espera el resultado (o propaga la excepción del lote)."""
+        return self.enviar(item).result(timeout=timeout)
+
+    @property
+    def tamano_medio_lote(self):
+        return self.items_procesados / self.lotes_procesados if self.lotes_procesados else 0.0
+
+    # --- HILO DE FONDO ---
+    def _asegurar_hilo(self):
+        if self._hilo is None or not self._hilo.is_alive():
+            with self._lock:
+                if self._hilo is None or not self._hilo.is_alive():
+                    self._hilo = threading.Thread(target=self._bucle, name="cola-inferencia-fiee", daemon=True)
+                    self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            lote = [self._entrada.get()]
+            limite = time.monotonic() + self.espera_ms / 1000.0
+            while len(lote) < self.max_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self._entrada.get(timeout=restante))
+                except queue.Empty:
+                    break
+            try:
+                self._despachar(lote)
+            except Exception as e:
+                # El hilo debe seguir vivo: las solicitudes del lote reciben el error
+                self._repartir_error(lote, e)
+
+    def _despachar(self, lote):
+        # Las solicitudes canceladas por quien esperaba no ocupan lugar en el forward pass
+        lote = [(item, futuro) for item, futuro in lote if futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+        try:
+            resultados = self._procesar_lote([item for item, _ in lote])
+        except Exception as e:
+            self._repartir_error(lote, e)
+            return
+        if isinstance(resultados, Future):
+            resultados.add_done_callback(lambda f: self._repartir_futuro(lote, f))
+        else:
+            self._repartir(lote, resultados)
+
+    def _repartir_futuro(self, lote, futuro_lote):
+        # Corre como callback del Future: una excepción aquí se perdería sin avisar a nadie
+        try:
+            self._repartir(lote, futuro_lote.result())
+        except Exception as e:
+            self._repartir_error(lote, e)
+
+    def _repartir(self, lote, resultados):
+        if len(resultados) != len(lote):
+            # Sin un resultado por solicitud no se puede saber a quién corresponde cada uno
+            self._repartir_error(lote, RuntimeError(
+                f"El lote de inferencia retornó {len(resultados)} resultados para {len(lote)} imágenes"))
+            return
+        with self._lock:
+            self.lotes_procesados += 1
+            self.items_procesados += len(lote)
+        for (_, futuro), resultado in zip(lote, resultados):
+            futuro.set_result(resultado)
+
+    @staticmethod
+    def _repartir_error(lote, error):
+        for _, futuro in lote:
+            if not futuro.done():
+                futuro.set_exception(error)
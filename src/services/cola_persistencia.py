@@ -0,0 +1,177 @@
+import atexit
+import threading
+from src.repositories.repositorio_factory import RepositorioFactory
+from src.utils.enums import EstadoEquipo
+
+class ColaEscrituraDiferida:
+    """
+    Cola de persistencia diferida (write-behind) para las mutaciones del Dashboard.
+    La vista encola el cambio y sigue; un hilo en segundo plano agrupa las
+    actualizaciones repetidas de un mismo 'id_activo' en una sola escritura y
+    vacía la cola por lotes, cada lote en una sola llamada al repositorio
+    (agregar_incidencias_lote). Mientras un lote está en vuelo sus activos siguen
+    figurando en ids_pendientes(). Los cambios que agotan los reintentos quedan como
+    fallidos (con su versión local) hasta que se reintentan o se vuelven a editar.
+    """
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, fabrica_repositorio=RepositorioFactory.crear, intervalo=0.5, tamano_lote=100, reintentos=3):
+        self._fabrica_repositorio = fabrica_repositorio
+        self.intervalo = intervalo
+        self.tamano_lote = tamano_lote
+        self.reintentos = reintentos
+
+        # id_activo -> {"equipo": ..., "eventos": [...], "intentos": n}
+        self._pendientes = {}
+        # Misma forma que _pendientes: el lote que se está escribiendo ahora mismo
+        # y los cambios que agotaron los reintentos
+        self._en_vuelo = {}
+        self._fallidos = {}
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._detenida = threading.Event()
+        self._hilo = None
+
+    @classmethod
+    def obtener(cls):
+        """Cola única por proceso, compartida por todas las sesiones."""
+        if cls._instancia is None:
+            with cls._lock_instancia:
+                if cls._instancia is None:
+                    cls._instancia = cls()
+                    # Al salir del proceso se persiste lo que aún esté en cola
+                    atexit.register(cls._instancia.detener)
+        return cls._instancia
+
+    # --- API PARA LAS VISTAS ---
+    def encolar(self, equipo, evento=None):
+        """
+        Registra una mutación pendiente. Si el activo ya tenía cambios en cola, se
+        fusionan: prevalece el estado más reciente y los eventos se acumulan en orden.
+        Un activo con un cambio fallido vuelve a la cola con sus eventos anteriores.
+        """
+        # Las vistas pueden asignar el nombre del estado: se guarda siempre el Enum
+        if isinstance(equipo.estado, str) and equipo.estado in EstadoEquipo.__members__:
+            equipo.estado = EstadoEquipo[equipo.estado]
+        with self._lock:
+            pendiente = self._pendientes.get(equipo.id_activo)
+            if pendiente is None:
+                pendiente = self._fallidos.pop(equipo.id_activo, None) or {"equipo": equipo, "eventos": [], "intentos": 0}
+                pendiente["intentos"] = 0
+                self._pendientes[equipo.id_activo] = pendiente
+            pendiente["equipo"] = equipo
+            if evento is not None:
+                pendiente["eventos"].append(evento)
+        self._asegurar_hilo()
+        self._despertar.set()
+
+    @property
+    def pendientes(self):
+        """Cambios que aún no llegan al servidor: en cola o en vuelo."""
+        with self._lock:
+            return len(self._pendientes) + len(self._en_vuelo)
+
+    @property
+    def fallidos(self):
+        with self._lock:
+            return len(self._fallidos)
+
+    def ids_pendientes(self):
+        """Activos cuya versión local aún no llega al servidor (en cola, en vuelo o fallidos)."""
+        with self._lock:
+            return set(self._pendientes) | set(self._en_vuelo) | set(self._fallidos)
+
+    def obtener_fallidos(self):
+        """[{"id_activo", "equipo", "eventos"}] de los cambios que agotaron los reintentos."""
+        with self._lock:
+            return [{"id_activo": id_activo, "equipo": fallido["equipo"], "eventos": list(fallido["eventos"])}
+                    for id_activo, fallido in self._fallidos.items()]
+
+    def reintentar_fallidos(self):
+        """Devuelve a la cola todos los cambios fallidos (con sus reintentos renovados)."""
+        with self._lock:
+            fallidos, self._fallidos = self._fallidos, {}
+            for id_activo, fallido in fallidos.items():
+                fallido["intentos"] = 0
+                self._fusionar_posterior(id_activo, fallido)
+                self._pendientes[id_activo] = fallido
+        if fallidos:
+            self._asegurar_hilo()
+            self._despertar.set()
+        return len(fallidos)
+
+    def vaciar(self):
+        """Persiste de inmediato todo lo pendiente (útil al apagar o en pruebas)."""
+        while self._procesar_lote():
+            pass
+
+    def detener(self):
+        self._detenida.set()
+        self._despertar.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=5)
+        self.vaciar()
+
+    # --- HILO DE FONDO ---
+    def _asegurar_hilo(self):
+        if self._hilo is None or not self._hilo.is_alive():
+            with self._lock:
+                if self._hilo is None or not self._hilo.is_alive():
+                    self._hilo = threading.Thread(target=self._bucle, name="cola-escritura-fiee", daemon=True)
+                    self._hilo.start()
+
+    def _bucle(self):
+        while not self._detenida.is_set():
+            self._despertar.wait(timeout=self.intervalo)
+            self._despertar.clear()
+            # Breve espera para que clics seguidos se fusionen en la misma escritura
+            self._detenida.wait(timeout=self.intervalo)
+            while not self._detenida.is_set() and self._procesar_lote():
+                pass
+
+    def _procesar_lote(self):
+        """
+        Toma hasta 'tamano_lote' activos y los persiste en una sola llamada.
+        Retorna True si el lote se guardó (False si no había nada o si falló).
+        """
+        with self._lock:
+            ids = list(self._pendientes)[:self.tamano_lote]
+            lote = {id_activo: self._pendientes.pop(id_activo) for id_activo in ids}
+            self._en_vuelo.update(lote)
+        if not lote:
+            return False
+
+        repo = self._fabrica_repositorio()
+        try:
+            ok = repo.agregar_incidencias_lote([(p["equipo"], p["eventos"]) for p in lote.values()])
+        except Exception as e:
+            print(f"Error al persistir la cola de escritura: {e}")
+            ok = False
+
+        with self._lock:
+            for id_activo, pendiente in lote.items():
+                del self._en_vuelo[id_activo]
+                if not ok:
+                    self._reencolar(id_activo, pendiente)
+        return ok
+
+    def _reencolar(self, id_activo, pendiente):
+        """Devuelve a la cola un cambio fallido conservando el orden de los eventos (con _lock tomado)."""
+        pendiente["intentos"] += 1
+        if self._fusionar_posterior(id_activo, pendiente):
+            # La sesión volvió a editar el activo mientras se escribía: reintentos renovados
+            pendiente["intentos"] = 0
+        if pendiente["intentos"] >= self.reintentos:
+            # Se conserva la versión local: la sesión la sigue viendo y puede reintentar
+            self._fallidos[id_activo] = pendiente
+        else:
+            self._pendientes[id_activo] = pendiente
+
+    def _fusionar_posterior(self, id_activo, pendiente):
+        """Absorbe el cambio encolado después (estado más reciente, eventos a continuación)."""
+        posterior = self._pendientes.pop(id_activo, None)
+        if posterior is not None:
+            pendiente["equipo"] = posterior["equipo"]
+            pendiente["eventos"].extend(posterior["eventos"])
+        return posterior is not None
@@ -0,0 +1,201 @@
+import copy
+import threading
+import time
+from collections.abc import Mapping
+from src.equipo_factory import EquipoFactory
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial, EstrategiasWeibull
+from src.logical.weibull import ParametrosWeibull
+from src.repositories.equipo_repository import EquipoRepository, ErrorLecturaInventario
+from src.repositories.repositorio_factory import RepositorioFactory
+from src.services.ajuste_weibull_service import AjusteWeibullService
+from src.services.sincronizacion_service import SincronizadorInventario
+from src.utils.inventario_index import InventarioIndex
+from src.utils.mapper import EquipoMapper
+
+class InventarioCompartido:
+    """
+    Instantánea del inventario compartida por todas las sesiones del proceso.
+    Es de solo lectura para las sesiones: cada refresco construye una nueva
+    instantánea (copy-on-write) y la publica con una versión mayor. Se refresca
+    cuando vence el TTL o cuando el repositorio registra escrituras nuevas.
+    Si un refresco no logra leer la base de datos se sigue publicando la
+    instantánea anterior y 'error_carga' describe la falla hasta el próximo éxito.
+    """
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, fabrica_repositorio=RepositorioFactory.crear, ttl=60.0):
+        self.ttl = ttl
+        self.est_lineal = DesgasteLineal()
+        self.est_expo = DesgasteExponencial()
+        # Curvas Weibull por tipo: comparten una caché que el ajuste de fondo actualiza
+        self.parametros_weibull = ParametrosWeibull()
+        self.est_weibull = EstrategiasWeibull(self.parametros_weibull, self.est_lineal, EquipoFactory.tipos())
+        repositorio = fabrica_repositorio()
+        self.ajuste_weibull = AjusteWeibullService(
+            self._flota, self.parametros_weibull,
+            historiales=lambda: ((fila["id_activo"], fila.get("historial_incidencias") or [])
+                                 for fila in repositorio.leer_paginado(("id_activo", "historial_incidencias")))
+        )
+        self._sincronizador = SincronizadorInventario(
+            repositorio, EquipoMapper(self.est_lineal, self.est_expo, repositorio.leer_historial, self.est_weibull)
+        )
+        self._lock = threading.Lock()
+        self._laboratorios = None
+        self._errores_mapeo = []
+        self._error_carga = None
+        self._version = 0
+        self._version_datos = -1
+        self._cargado_en = 0.0
+
+    @classmethod
+    def obtener(cls):
+        if cls._instancia is None:
+            with cls._lock_instancia:
+                if cls._instancia is None:
+                    cls._instancia = cls()
+        return cls._instancia
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def errores_mapeo(self):
+        """Registros de la instantánea vigente que no se pudieron interpretar (ver EquipoMapper.errores)."""
+        return self._errores_mapeo
+
+    @property
+    def error_carga(self):
+        """Motivo del último refresco fallido (None si la instantánea está al día)."""
+        return self._error_carga
+
+    def invalidar(self):
+        """Fuerza un refresco en el próximo acceso."""
+        self._cargado_en = 0.0
+
+    def instantanea(self):
+        """Retorna (version, laboratorios) refrescando antes si está vencida."""
+        if self._vencida():
+            with self._lock:
+                if self._vencida():
+                    self._refrescar()
+        return self._version, self._laboratorios
+
+    def _flota(self):
+        """Todos los activos de la instantánea vigente (fuente del ajuste Weibull)."""
+        _, laboratorios = self.instantanea()
+        return [equipo for lab in laboratorios for equipo in laboratorios[lab]]
+
+    def _vencida(self):
+        return (self._laboratorios is None
+                or EquipoRepository.version_datos != self._version_datos
+                or time.monotonic() - self._cargado_en > self.ttl)
+
+    def _refrescar(self):
+        # Se lee la versión antes de consultar: una escritura concurrente provocará otro refresco
+        version_datos = EquipoRepository.version_datos
+
+        try:
+            if self._laboratorios is None:
+                nuevos = self._sincronizador.carga_completa()
+            else:
+                # Copy-on-write: las sesiones que leen la instantánea anterior no ven cambios a medias
+                nuevos = self._laboratorios.copiar()
+                if not self._sincronizador.sincronizar(nuevos):
+                    nuevos = self._sincronizador.carga_completa()
+        except ErrorLecturaInventario as e:
+            if self._laboratorios is None:
+                raise
+            # Se conserva la instantánea vigente; se reintenta al vencer el TTL
+            self._error_carga = str(e)
+            self._version_datos = version_datos
+            self._cargado_en = time.monotonic()
+            return
+
+        self._laboratorios = nuevos
+        self._errores_mapeo = self._sincronizador.errores
+        self._error_carga = None
+        self._version += 1
+        self._version_datos = version_datos
+        self._cargado_en = time.monotonic()
+
+
+class VistaInventarioSesion(Mapping):
+    """
+    Vista por sesión sobre el índice compartido. Se comporta como un InventarioIndex
+    (laboratorio -> lista y consultas por id, ubicación, estado y tipo) pero solo
+    guarda como capa propia los activos que la sesión modificó: el resto se lee del
+    índice compartido, que nunca se altera desde aquí.
+    """
+    def __init__(self):
+        self.version_base = None
+        self._base = InventarioIndex()
+        self._capas = {}
+        self._listas = {}
+
+    def actualizar(self, compartido, ids_pendientes=()):
+        """Adopta la instantánea más reciente y conserva las capas aún no persistidas."""
+        version, base = compartido.instantanea()
+        if version != self.version_base:
+            self.version_base = version
+            self._base = base
+            self._capas = {i: eq for i, eq in self._capas.items() if i in ids_pendientes}
+            self._listas = {}
+        return self
+
+    def editable(self, equipo):
+        """Retorna una copia privada del activo, lista para ser modificada por la sesión."""
+        if self._capas.get(equipo.id_activo) is equipo:
+            return equipo
+
+        copia = copy.copy(equipo)
+        # copy() también sirve para HistorialPerezoso sin forzar su descarga
+        copia.historial_incidencias = equipo.historial_incidencias.copy()
+        self._capas[copia.id_activo] = copia
+        self._listas.pop(self._base.ubicacion_de(copia.id_activo), None)
+        return copia
+
+    # --- INTERFAZ DE DICCIONARIO (laboratorio -> lista) ---
+    def __getitem__(self, lab):
+        lista = self._base[lab]
+        if not self._capas:
+            return lista
+        propia = self._listas.get(lab)
+        if propia is None:
+            propia = self._listas[lab] = [self._capas.get(eq.id_activo, eq) for eq in lista]
+        return propia
+
+    def __iter__(self):
+        return iter(self._base)
+
+    def __len__(self):
+        return len(self._base)
+
+    # --- CONSULTAS INDEXADAS ---
+    def obtener(self, id_activo):
+        return self._capas.get(id_activo) or self._base.obtener(id_activo)
+
+    def ubicacion_de(self, id_activo):
+        return self._base.ubicacion_de(id_activo)
+
+    def por_ubicacion(self, lab):
+        return [self._capas.get(eq.id_activo, eq) for eq in self._base.por_ubicacion(lab)]
+
+    def por_estado(self, estado):
+        # Las capas pueden haber cambiado de estado: se resuelven aparte (son pocas)
+        compartidos = [eq for eq in self._base.por_estado(estado) if eq.id_activo not in self._capas]
+        propios = [eq for eq in self._capas.values() if InventarioIndex.clave_estado(eq) == estado]
+        return compartidos + propios
+
+    def por_tipo(self, tipo):
+        return [self._capas.get(eq.id_activo, eq) for eq in self._base.por_tipo(tipo)]
+
+    def total(self):
+        return self._base.total()
+
+    def reindexar(self, equipo):
+        """Las capas se consultan en vivo; basta con asegurar que el activo sea una capa."""
+        if self._capas.get(equipo.id_activo) is not equipo:
+            self._capas[equipo.id_activo] = equipo
+            self._listas.pop(self._base.ubicacion_de(equipo.id_activo), None)
@@ -0,0 +1,99 @@
+import heapq
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+class PlanificadorMantenimiento:
+    """
+    Plan semanal de mantenimiento con capacidad limitada de técnicos por laboratorio.
+    Parte de la proyección de fallas de PredictiveService.predecir_flota() y del
+    estado actual de cada activo. Es un greedy por semanas (earliest-deadline-first
+    con fechas de liberación) sobre un heap por laboratorio, en O(n log n):
+      - Los activos en FALLA, REPORTADO o EN_MANTENIMIENTO se atienden desde la semana 0.
+      - Los operativos entran a la cola 'ventana_semanas' antes de su falla prevista.
+      - Cada semana se toman, por urgencia y luego por falla prevista, tantos activos
+        como cupos tenga el laboratorio.
+    """
+    # Clase de urgencia por estado (menor = más urgente); BAJA no se planifica
+    URGENCIA = {"FALLA": 0, "REPORTADO_CON_FALLA": 1, "REPORTADO": 1, "EN_MANTENIMIENTO": 2, "OPERATIVO": 3}
+    PRIORIDADES = ("Crítica", "Alta", "Media", "Preventiva")
+
+    def __init__(self, capacidad=None, capacidad_defecto=5, horizonte_semanas=12, ventana_semanas=4):
+        """
+        'capacidad' es un diccionario laboratorio -> intervenciones por semana; los
+        laboratorios que no figuran usan 'capacidad_defecto'.
+        """
+        self.capacidad = dict(capacidad or {})
+        self.capacidad_defecto = capacidad_defecto
+        self.horizonte_semanas = horizonte_semanas
+        self.ventana_semanas = ventana_semanas
+        # IDs que quedaron fuera del horizonte por falta de cupo en el último plan
+        self.sin_cupo = []
+
+    def planificar(self, prediccion, estados, hoy=None):
+        """
+        'prediccion' es el DataFrame de predecir_flota() y 'estados' un mapeo
+        id_activo -> nombre del estado. Retorna el plan ordenado por semana,
+        laboratorio y prioridad.
+        """
+        hoy = hoy or date.today()
+        lunes = hoy - timedelta(days=hoy.weekday())
+        self.sin_cupo = []
+
+        df = prediccion[["ID", "Modelo", "Ubicación", "Desgaste", "Fecha falla"]].copy()
+        df["Estado"] = df["ID"].map(estados).fillna("OPERATIVO")
+        df["urgencia"] = df["Estado"].map(self.URGENCIA)
+        # Fuera del plan: bajas, estados desconocidos y operativos sin fecha de falla
+        df = df[df["urgencia"].notna() & ((df["urgencia"] < 3) | df["Fecha falla"].notna())]
+
+        urgencia = df["urgencia"].to_numpy(dtype=np.int64)
+        dias = (df["Fecha falla"].to_numpy(dtype="datetime64[D]") - np.datetime64(lunes, "D")).astype(float)
+        limite = np.where(urgencia < 3, 0, np.floor(np.nan_to_num(dias, nan=0.0) / 7)).astype(np.int64)
+        liberacion = np.where(urgencia < 3, 0, np.maximum(limite - self.ventana_semanas, 0))
+        # Operativos cuya ventana aún no se abre dentro del horizonte: no compiten por cupo
+        visibles = liberacion < self.horizonte_semanas
+        df, urgencia, limite, liberacion = df[visibles], urgencia[visibles], limite[visibles], liberacion[visibles]
+        # Dentro de la misma urgencia, primero lo que fallará antes (sin fecha: al final)
+        plazo = np.nan_to_num(dias[visibles], nan=np.inf)
+
+        semana = np.full(len(df), -1, dtype=np.int64)
+        labs = df["Ubicación"].to_numpy()
+        for lab in pd.unique(labs):
+            posiciones = np.flatnonzero(labs == lab)
+            self._asignar(posiciones, urgencia, plazo, liberacion, semana,
+                          self.capacidad.get(lab, self.capacidad_defecto))
+
+        asignados = semana >= 0
+        self.sin_cupo = df["ID"].to_numpy()[~asignados].tolist()
+        plan = df[asignados].assign(
+            Semana=[lunes + timedelta(weeks=int(s)) for s in semana[asignados]],
+            Prioridad=[self.PRIORIDADES[u] for u in urgencia[asignados]],
+            Atrasado=semana[asignados] > limite[asignados],
+            _urgencia=urgencia[asignados],
+            _plazo=plazo[asignados],
+        )
+        plan = plan.sort_values(["Semana", "Ubicación", "_urgencia", "_plazo"], kind="stable")
+        return plan[["Semana", "Ubicación", "ID", "Modelo", "Estado", "Prioridad", "Desgaste", "Fecha falla", "Atrasado"]] \
+            .reset_index(drop=True)
+
+    def planificar_flota(self, equipos, predictor, hoy=None):
+        """Atajo: proyecta la flota con 'predictor' (PredictiveService) y la planifica."""
+        equipos = list(equipos)
+        estados = {e.id_activo: (e.estado.name if hasattr(e.estado, 'name') else str(e.estado)) for e in equipos}
+        return self.planificar(predictor.predecir_flota(equipos, hoy=hoy), estados, hoy=hoy)
+
+    def _asignar(self, posiciones, urgencia, plazo, liberacion, semana, capacidad):
+        """Greedy semanal de un laboratorio: escribe en 'semana' la asignada a cada posición."""
+        if capacidad <= 0:
+            return
+        orden = posiciones[np.argsort(liberacion[posiciones], kind="stable")]
+        cola, siguiente = [], 0
+        for s in range(self.horizonte_semanas):
+            while siguiente < len(orden) and liberacion[orden[siguiente]] <= s:
+                i = orden[siguiente]
+                heapq.heappush(cola, (urgencia[i], plazo[i], i))
+                siguiente += 1
+            for _ in range(min(capacidad, len(cola))):
+                semana[heapq.heappop(cola)[2]] = s
+            if not cola and siguiente == len(orden):
+                break
@@ -0,0 +1,98 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import shared_memory
+import numpy as np
+
+# Modelo del proceso worker (lo fija el inicializador, una vez por proceso)
+_INFERIR_WORKER = None
+
+
+class PoolVision:
+    """
+    Pool de procesos que aloja el modelo de visión fuera del proceso de Streamlit.
+    Cada worker carga su copia del modelo al iniciar (con 'hilos' de intra-op
+    de PyTorch) y recibe los tensores de entrada por memoria compartida: solo
+    viajan por pickle el nombre del bloque, la forma y el tipo, nunca los píxeles.
+    Se usa el contexto 'spawn' porque PyTorch no es seguro tras un fork con hilos.
+    """
+    def __init__(self, cargador, procesos=2):
+        """
+        'cargador()' se ejecuta en cada worker y retorna una función que recibe el
+        arreglo de entrada (lote, canales, alto, ancho) y retorna [(etiqueta, confianza)].
+        Debe ser serializable (función de módulo o functools.partial).
+        """
+        self.procesos = procesos
+        self._pool = ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_inicializar_worker, initargs=(cargador,))
+
+    @classmethod
+    def para_vit(cls, ruta_modelo, procesos=2, hilos=1, backend="fp32"):
+        """Pool que aloja el ViT de Hugging Face indicado (con el backend de CPU elegido)."""
+        return cls(partial(_cargar_vit, ruta_modelo, hilos, backend), procesos)
+
+    def enviar(self, pixeles):
+        """Inferencia asíncrona: copia el lote a memoria compartida y retorna un Future."""
+        pixeles = np.ascontiguousarray(pixeles)
+        bloque = shared_memory.SharedMemory(create=True, size=max(pixeles.nbytes, 1))
+        try:
+            np.ndarray(pixeles.shape, pixeles.dtype, buffer=bloque.buf)[...] = pixeles
+            futuro = self._pool.submit(_inferir_compartido, bloque.name, pixeles.shape, pixeles.dtype.str)
+        except Exception:
+            _liberar(bloque)
+            raise
+        # El bloque vive hasta que el worker terminó de leerlo
+        futuro.add_done_callback(lambda _: _liberar(bloque))
+        return futuro
+
+    def inferir(self, pixeles, timeout=None):
+        """Versión síncrona de enviar()."""
+        return self.enviar(pixeles).result(timeout=timeout)
+
+    def cerrar(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _liberar(bloque):
+    bloque.close()
+    bloque.unlink()
+
+
+def _inicializar_worker(cargador):
+    global _INFERIR_WORKER
+    _INFERIR_WORKER = cargador()
+
+
+def _inferir_compartido(nombre, forma, tipo):
+    """Lee el lote directamente del bloque compartido (sin copiarlo) e infiere."""
+    # Los workers comparten el resource tracker del proceso principal, dueño del bloque
+    bloque = shared_memory.SharedMemory(name=nombre)
+    pixeles = None
+    try:
+        pixeles = np.ndarray(forma, np.dtype(tipo), buffer=bloque.buf)
+        return _INFERIR_WORKER(pixeles)
+    finally:
+        # La vista debe soltarse antes de cerrar el bloque
+        pixeles = None
+        try:
+            bloque.close()
+        except BufferError:
+            # Un traceback aún referencia el tensor: el mapeo se libera con él
+            pass
+
+
+def _cargar_vit(ruta_modelo, hilos, backend="fp32"):
+    """Cargador por defecto: ViT de Hugging Face en CPU con 'hilos' de intra-op."""
+    import torch
+    import torch.nn.functional as F
+    from src.vision_ai.backends import BackendInferencia
+
+    torch.set_num_threads(hilos)
+    modelo = BackendInferencia(backend, ruta_modelo)
+
+    def inferir(pixeles):
+        with torch.no_grad():
+            confianzas, clases = F.softmax(modelo.logits(torch.from_numpy(pixeles)), dim=-1).max(dim=-1)
+        return [(modelo.id2label[c], p * 100) for c, p in zip(clases.tolist(), confianzas.tolist())]
+
+    return inferir
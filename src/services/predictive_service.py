@@ -1,65 +1,186 @@
+import io
+from functools import lru_cache
 import numpy as np
-from sklearn.linear_model import LinearRegression
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Servidor sin pantalla: render headless
+from matplotlib.figure import Figure
+from datetime import date, datetime, timedelta
+from src.models.equipo import Equipo
 
 class PredictiveService:
     """
-    Servicio de Inteligencia Artificial que utiliza Regresión Lineal 
+    Servicio de Inteligencia Artificial que utiliza Regresión Lineal
     para estimar la fecha de falla técnica basada en la curva de desgaste.
+    La recta se ajusta en forma cerrada (mínimos cuadrados) sobre los mismos tres
+    puntos de control para uno o para toda la flota a la vez. Los activos que ya
+    acumulan evidencia propia (modelo_desgaste RLS) usan su recta aprendida.
     """
-    def generar_prediccion(self, equipo):
+    # Días asumidos hasta la falla cuando no se observa desgaste
+    DIAS_SIN_DESGASTE = 3650
+
+    @staticmethod
+    def _ajustar_rectas(dias_uso, desgaste):
         """
-        Calcula la proyección de vida útil y genera una visualización de tendencia.
+        Mínimos cuadrados vectorizados sobre los puntos (0, 0), (d//2, w/2.1) y (d, w)
+        de cada activo. Retorna (pendiente, intercepto, dias_para_falla).
+        """
+        dias_uso = np.asarray(dias_uso, dtype=float)
+        desgaste = np.asarray(desgaste, dtype=float)
+        x = np.stack([np.zeros_like(dias_uso), np.floor_divide(dias_uso, 2), dias_uso])
+        y = np.stack([np.zeros_like(desgaste), desgaste / 2.1, desgaste])
+
+        x_media, y_media = x.mean(axis=0), y.mean(axis=0)
+        sxy = ((x - x_media) * (y - y_media)).sum(axis=0)
+        sxx = ((x - x_media) ** 2).sum(axis=0)
+        pendiente = sxy / sxx
+        intercepto = y_media - pendiente * x_media
+
+        # Ecuación de la recta: y = mx + b  =>  x = (1 - b) / m
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dias_para_falla = np.where(pendiente > 0, (1.0 - intercepto) / pendiente, PredictiveService.DIAS_SIN_DESGASTE)
+        return pendiente, intercepto, dias_para_falla
+
+    def predecir_flota(self, equipos, hoy=None):
+        """
+        Proyección de falla de toda la flota en una sola pasada vectorizada.
+        Retorna un DataFrame ordenado por fecha estimada de falla (las fechas de
+        compra inválidas quedan al final, con NaT).
+        """
+        equipos = list(equipos)
+        dia_actual = np.datetime64(hoy or date.today(), "D")
+
+        fechas = pd.to_datetime(pd.Series([e.fecha_compra for e in equipos], dtype=object),
+                                format="%Y-%m-%d", errors="coerce").to_numpy(dtype="datetime64[D]")
+        validas = ~np.isnat(fechas)
+        dias_uso = np.maximum((dia_actual - fechas).astype("timedelta64[D]").astype(float), 1)
+
+        desgaste = np.full(len(equipos), np.nan)
+        if validas.any():
+            desgaste[validas] = Equipo.calcular_obsolescencia_lote(
+                [e for e, ok in zip(equipos, validas) if ok], hoy=hoy)
+
+        pendiente, intercepto, dias_para_falla = self._ajustar_rectas(np.where(validas, dias_uso, 1), np.nan_to_num(desgaste))
+        # Los activos con evidencia propia reemplazan la recta teórica por la aprendida
+        for i, e in enumerate(equipos):
+            modelo = self._modelo_aprendido(e)
+            if modelo is not None:
+                pendiente[i], intercepto[i] = modelo.pendiente_diaria, modelo.intercepto
+                dias_para_falla[i] = modelo.dias_para_falla(self.DIAS_SIN_DESGASTE)
+        dias_para_falla = np.where(validas, dias_para_falla, np.nan)
+        fecha_falla = fechas + np.trunc(np.nan_to_num(dias_para_falla)).astype("timedelta64[D]")
+        fecha_falla[~validas] = np.datetime64("NaT")
+
+        df = pd.DataFrame({
+            "ID": [e.id_activo for e in equipos],
+            "Modelo": [e.modelo for e in equipos],
+            "Ubicación": [getattr(e, 'ubicacion', 'Laboratorio FIEE') for e in equipos],
+            "Desgaste": desgaste,
+            "Pendiente (por día)": np.where(validas, pendiente, np.nan),
+            "Intercepto": np.where(validas, intercepto, np.nan),
+            "Días para falla": dias_para_falla,
+            "Fecha falla": fecha_falla,
+        })
+        return df.sort_values("Fecha falla", na_position="last", kind="stable").reset_index(drop=True)
+
+    def calcular_prediccion(self, equipo, hoy=None):
+        """
+        Solo los números de la proyección (sin gráfico): fecha estimada de falla,
+        días de uso, desgaste actual y la recta ajustada.
+        La fecha actual es la del reloj de la estrategia del activo (la misma con
+        la que se calcula su desgaste), salvo que se indique 'hoy'.
         """
         # 1. Preparación de cronología
+        hoy = hoy or self._hoy_de(equipo)
         try:
-            fecha_compra = datetime.strptime(equipo.fecha_compra, "%Y-%m-%d")
+            fecha_compra = datetime.strptime(str(equipo.fecha_compra)[:10], "%Y-%m-%d").date()
         except ValueError:
-            fecha_compra = datetime.now() - timedelta(days=365)
-            
-        hoy = datetime.now()
+            fecha_compra = hoy - timedelta(days=365)
+
         dias_uso = (hoy - fecha_compra).days
-        
+
         if dias_uso <= 0:
             dias_uso = 1
 
         desgaste_actual = equipo.calcular_obsolescencia()
 
-        # 2. Entrenamiento del modelo Scikit-Learn
+        # 2. Ajuste de la recta en forma cerrada
         # X: Tiempo (Días de uso), y: Desgaste (%)
-        # Entrenamos con 3 puntos clave para establecer la pendiente
-        X = np.array([[0], [dias_uso // 2], [dias_uso]])
-        y = np.array([0, desgaste_actual / 2.1, desgaste_actual])
-
-        modelo = LinearRegression()
-        modelo.fit(X, y)
-
-        # 3. Cálculo de la intersección con el umbral de falla (1.0)
-        # Ecuación de la recta: y = mx + b  =>  x = (y - b) / m
-        m = modelo.coef_[0]
-        b = modelo.intercept_
-        
-        if m <= 0:
-            dias_para_falla = 3650 # Si no hay desgaste, asumimos 10 años
+        modelo = self._modelo_aprendido(equipo)
+        if modelo is not None:
+            pendiente, intercepto = modelo.pendiente_diaria, modelo.intercepto
+            dias_para_falla = modelo.dias_para_falla(self.DIAS_SIN_DESGASTE)
         else:
-            dias_para_falla = (1.0 - b) / m
-
+            pendiente, intercepto, dias_para_falla = (float(v[0]) for v in self._ajustar_rectas([dias_uso], [desgaste_actual]))
         fecha_falla = fecha_compra + timedelta(days=int(dias_para_falla))
 
-        # 4. Generación de Gráfico con Matplotlib
-        fig, ax = plt.subplots(figsize=(6, 4))
-        
-        x_pred = np.array([[0], [dias_uso], [dias_para_falla]])
-        y_pred = modelo.predict(x_pred)
-        ax.plot(x_pred, y_pred, color='red', linestyle='--', label='Tendencia IA')
-        ax.scatter([dias_uso], [desgaste_actual], color='blue', zorder=5, label='Hoy')
-        ax.set_title(f"Predicción de Falla: {equipo.modelo}")
-        ax.set_xlabel("Días de Uso")
-        ax.set_ylabel("Nivel de Desgaste (0 a 1)")
-        ax.set_ylim(0, 1.1)
-        ax.axhline(y=1.0, color='black', linestyle=':', label='Falla Crítica')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-
-        return fecha_falla.strftime("%Y-%m-%d"), fig
\ No newline at end of file
+        return {
+            "fecha_falla": fecha_falla.strftime("%Y-%m-%d"),
+            "dias_uso": dias_uso,
+            "desgaste": desgaste_actual,
+            "pendiente": float(pendiente),
+            "intercepto": float(intercepto),
+            "dias_para_falla": float(dias_para_falla),
+            "evidencias": modelo.n if modelo is not None else 0,
+        }
+
+    @staticmethod
+    def _hoy_de(equipo):
+        """Fecha actual según el reloj de la estrategia del activo (o la del sistema)."""
+        estrategia = getattr(equipo, 'estrategia_desgaste', None)
+        return estrategia.hoy() if hasattr(estrategia, 'hoy') else date.today()
+
+    @staticmethod
+    def _modelo_aprendido(equipo):
+        """Estimador RLS del activo, solo si ya incorporó al menos una evidencia real."""
+        modelo = getattr(equipo, 'modelo_desgaste', None)
+        return modelo if modelo is not None and modelo.n > 0 else None
+
+    def generar_prediccion(self, equipo):
+        """
+        Calcula la proyección de vida útil y genera una visualización de tendencia.
+        La figura no se registra en pyplot: se libera al soltar la referencia.
+        """
+        prediccion = self.calcular_prediccion(equipo)
+        return prediccion["fecha_falla"], _construir_figura(equipo.modelo, prediccion)
+
+    def grafico_png(self, equipo, prediccion=None):
+        """
+        PNG del gráfico de tendencia, cacheado por (id_activo, desgaste, fecha) en un
+        LRU acotado: reseleccionar un activo el mismo día no vuelve a dibujar nada.
+        """
+        p = prediccion or self.calcular_prediccion(equipo)
+        return _renderizar_png(equipo.id_activo, p["desgaste"], self._hoy_de(equipo).isoformat(), equipo.modelo,
+                               p["dias_uso"], p["pendiente"], p["intercepto"], p["dias_para_falla"])
+
+
+def _construir_figura(modelo, p):
+    """Gráfico de tendencia con la API orientada a objetos (sin estado global de pyplot)."""
+    fig = Figure(figsize=(6, 4))
+    ax = fig.subplots()
+
+    x_pred = np.array([0, p["dias_uso"], p["dias_para_falla"]])
+    y_pred = p["pendiente"] * x_pred + p["intercepto"]
+    ax.plot(x_pred, y_pred, color='red', linestyle='--', label='Tendencia IA')
+    ax.scatter([p["dias_uso"]], [p["desgaste"]], color='blue', zorder=5, label='Hoy')
+    ax.set_title(f"Predicción de Falla: {modelo}")
+    ax.set_xlabel("Días de Uso")
+    ax.set_ylabel("Nivel de Desgaste (0 a 1)")
+    ax.set_ylim(0, 1.1)
+    ax.axhline(y=1.0, color='black', linestyle=':', label='Falla Crítica')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+@lru_cache(maxsize=256)
+def _renderizar_png(id_activo, desgaste, fecha, modelo, dias_uso, pendiente, intercepto, dias_para_falla):
+    prediccion = {"dias_uso": dias_uso, "desgaste": desgaste, "pendiente": pendiente,
+                  "intercepto": intercepto, "dias_para_falla": dias_para_falla}
+    fig = _construir_figura(modelo, prediccion)
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", dpi=100)
+    finally:
+        fig.clear()
+    return buffer.getvalue()
@@ -0,0 +1,179 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import numpy as np
+import pandas as pd
+from src.logical.weibull import DIAS_POR_ANIO
+
+# Datos de la flota en cada proceso del pool (se envían una sola vez, en el inicializador)
+_DATOS_WORKER = None
+
+
+class SimuladorRiesgo:
+    """
+    Simulación Monte Carlo de fallas y costo de reposición por laboratorio para
+    los próximos 'horizonte_anios' años (acumulado por año).
+
+    La vida residual de cada activo es una Weibull condicionada a su antigüedad:
+      - Si su tipo tiene curva ajustada (ParametrosWeibull) se usa esa (k, λ).
+      - Si no, una Weibull de forma 'forma_defecto' cuya mediana coincide con la
+        fecha de falla de PredictiveService.predecir_flota().
+    Los sorteos se hacen por bloques vectorizados repartidos en un pool de procesos;
+    cada tarea usa su propio hijo de SeedSequence, así el resultado depende solo de
+    la semilla (no del número de procesos). Cada bloque se reduce de inmediato a
+    histogramas de tamaño fijo, de modo que la memoria no crece con los sorteos.
+    """
+    COSTOS_REPOSICION = {"MotorInduccion": 4500.0, "Osciloscopio": 3200.0, "Multimetro": 450.0}
+    COSTO_DEFECTO = 1000.0
+
+    def __init__(self, predictor, parametros_weibull=None, costos=None, horizonte_anios=5,
+                 forma_defecto=2.0, procesos=None, tareas=16, elementos_por_bloque=2_000_000, bins_costo=1000):
+        self.predictor = predictor
+        self.parametros_weibull = parametros_weibull
+        self.costos = {**self.COSTOS_REPOSICION, **(costos or {})}
+        self.horizonte_anios = horizonte_anios
+        self.forma_defecto = forma_defecto
+        # procesos=0 simula en el proceso actual (pruebas, entornos sin fork)
+        self.procesos = procesos
+        self.tareas = tareas
+        self.elementos_por_bloque = elementos_por_bloque
+        self.bins_costo = bins_costo
+
+    def simular(self, equipos, simulaciones=10_000, semilla=0, percentiles=(5, 50, 95), hoy=None):
+        """Retorna un DataFrame por laboratorio y año con las bandas de fallas y costo."""
+        datos = self.preparar(equipos, hoy)
+        labs = datos.pop("labs")
+        if not labs:
+            return pd.DataFrame()
+
+        # Reparto fijo de simulaciones por tarea: reproducible con cualquier 'procesos'
+        tareas = max(1, min(self.tareas, simulaciones))
+        cuotas = np.full(tareas, simulaciones // tareas)
+        cuotas[: simulaciones % tareas] += 1
+        semillas = np.random.SeedSequence(semilla).spawn(tareas)
+        bloque = max(1, self.elementos_por_bloque // max(len(datos["edad"]), 1))
+
+        if self.procesos == 0:
+            parciales = [_simular_tarea(s, int(n), bloque, datos) for s, n in zip(semillas, cuotas)]
+        else:
+            with ProcessPoolExecutor(self.procesos, initializer=_inicializar_worker, initargs=(datos,)) as pool:
+                parciales = list(pool.map(_simular_tarea, semillas, [int(n) for n in cuotas], [bloque] * tareas))
+
+        hist_fallas, hist_costo, suma_fallas, suma_costo = (sum(p[i] for p in parciales) for i in range(4))
+        return self._resumir(labs, datos, hist_fallas, hist_costo, suma_fallas / simulaciones,
+                             suma_costo / simulaciones, percentiles)
+
+    def preparar(self, equipos, hoy=None):
+        """Arreglos por activo (antigüedad, forma, escala, laboratorio, costo) listos para sortear."""
+        hoy = hoy or date.today()
+        equipos = [e for e in equipos if self._estado(e) != "BAJA"]
+        prediccion = self.predictor.predecir_flota(equipos, hoy=hoy).set_index("ID")
+        prediccion = prediccion[prediccion["Fecha falla"].notna()]
+        equipos = [e for e in equipos if e.id_activo in prediccion.index]
+
+        n = len(equipos)
+        edad, forma, escala = np.zeros(n), np.full(n, float(self.forma_defecto)), np.zeros(n)
+        dia_hoy = np.datetime64(hoy, "D")
+        falla = prediccion.loc[[e.id_activo for e in equipos], "Fecha falla"].to_numpy(dtype="datetime64[D]")
+        # Mediana de vida residual en años según la proyección de PredictiveService
+        residual = np.maximum((falla - dia_hoy).astype(float) / DIAS_POR_ANIO, 1e-6)
+
+        for i, e in enumerate(equipos):
+            ajuste = self.parametros_weibull.obtener(type(e).__name__) if self.parametros_weibull else None
+            if self._estado(e) == "FALLA":
+                residual[i] = 1e-6
+            elif ajuste is not None:
+                forma[i], escala[i] = ajuste
+                edad[i] = (dia_hoy - np.datetime64(e.fecha_compra[:10], "D")).astype(float) / DIAS_POR_ANIO
+        sin_ajuste = escala == 0
+        escala[sin_ajuste] = residual[sin_ajuste] / np.log(2) ** (1.0 / forma[sin_ajuste])
+
+        labs, codigos = np.unique(np.array([getattr(e, 'ubicacion', 'Laboratorio FIEE') for e in equipos], dtype=str),
+                                  return_inverse=True)
+        costo = np.array([self.costos.get(type(e).__name__, self.COSTO_DEFECTO) for e in equipos])
+        return {
+            "labs": labs.tolist(),
+            "edad": edad, "forma": forma, "escala": escala,
+            "lab": codigos.astype(np.int64), "costo": costo,
+            "horizonte": self.horizonte_anios,
+            # Topes de los histogramas: activos y costo total de cada laboratorio
+            "max_fallas": np.bincount(codigos, minlength=len(labs)),
+            "max_costo": np.bincount(codigos, weights=costo, minlength=len(labs)),
+            "bins_costo": self.bins_costo,
+        }
+
+    @staticmethod
+    def _estado(equipo):
+        return equipo.estado.name if hasattr(equipo.estado, 'name') else str(equipo.estado)
+
+    def _resumir(self, labs, datos, hist_fallas, hist_costo, media_fallas, media_costo, percentiles):
+        filas = []
+        ancho = datos["max_costo"] / datos["bins_costo"]
+        for l, lab in enumerate(labs):
+            for a in range(datos["horizonte"]):
+                fila = {"Laboratorio": lab, "Años": a + 1}
+                p_fallas = _percentiles_histograma(hist_fallas[l, a], percentiles)
+                p_costo = _percentiles_histograma(hist_costo[l, a], percentiles)
+                for q, f in zip(percentiles, p_fallas):
+                    fila[f"Fallas P{q}"] = int(f)
+                fila["Fallas (media)"] = float(media_fallas[l, a])
+                for q, c in zip(percentiles, p_costo):
+                    # Borde inferior del bin (resolución: 1/bins_costo del valor del laboratorio)
+                    fila[f"Costo P{q}"] = float(c * ancho[l])
+                fila["Costo (media)"] = float(media_costo[l, a])
+                filas.append(fila)
+        return pd.DataFrame(filas)
+
+
+def _percentiles_histograma(histograma, percentiles):
+    """Índice del primer bin cuya frecuencia acumulada alcanza cada percentil."""
+    acumulado = np.cumsum(histograma)
+    return np.searchsorted(acumulado, np.asarray(percentiles) / 100.0 * acumulado[-1], side="left")
+
+
+def _inicializar_worker(datos):
+    global _DATOS_WORKER
+    _DATOS_WORKER = datos
+
+
+def _simular_tarea(semilla, simulaciones, bloque, datos=None):
+    """
+    Ejecuta 'simulaciones' sorteos en bloques de 'bloque' y retorna
+    (hist_fallas, hist_costo, suma_fallas, suma_costo), todos de tamaño fijo.
+    """
+    datos = datos if datos is not None else _DATOS_WORKER
+    rng = np.random.default_rng(semilla)
+    edad, forma, escala, lab, costo = (datos[k] for k in ("edad", "forma", "escala", "lab", "costo"))
+    n_labs, horizonte = len(datos["max_fallas"]), datos["horizonte"]
+    tope_fallas = int(datos["max_fallas"].max())
+    bins_costo = datos["bins_costo"]
+    max_costo = np.where(datos["max_costo"] > 0, datos["max_costo"], 1.0)
+
+    hist_fallas = np.zeros((n_labs, horizonte, tope_fallas + 1), dtype=np.int64)
+    hist_costo = np.zeros((n_labs, horizonte, bins_costo), dtype=np.int64)
+    suma_fallas = np.zeros((n_labs, horizonte))
+    suma_costo = np.zeros((n_labs, horizonte))
+    base = (edad / escala) ** forma
+
+    hechas = 0
+    while hechas < simulaciones:
+        b = min(bloque, simulaciones - hechas)
+        # Vida residual condicionada a la antigüedad: T = λ·((a/λ)ᵏ - ln U)^(1/k) - a
+        residual = escala * (base - np.log(rng.random((b, len(edad))))) ** (1.0 / forma) - edad
+        anio = np.floor(residual).astype(np.int64)
+        sim, activo = np.nonzero(anio < horizonte)
+        celda = (sim * n_labs + lab[activo]) * horizonte + np.maximum(anio[sim, activo], 0)
+        tamano = b * n_labs * horizonte
+        # Fallas y costo por (simulación, laboratorio, año), acumulados a lo largo de los años
+        fallas = np.bincount(celda, minlength=tamano).reshape(b, n_labs, horizonte).cumsum(axis=2)
+        gasto = np.bincount(celda, weights=costo[activo], minlength=tamano).reshape(b, n_labs, horizonte).cumsum(axis=2)
+
+        suma_fallas += fallas.sum(axis=0)
+        suma_costo += gasto.sum(axis=0)
+        celdas = np.arange(n_labs * horizonte).reshape(n_labs, horizonte)
+        hist_fallas += np.bincount((celdas * (tope_fallas + 1) + fallas).ravel(),
+                                   minlength=n_labs * horizonte * (tope_fallas + 1)).reshape(hist_fallas.shape)
+        bin_costo = np.minimum((gasto / max_costo[None, :, None] * bins_costo).astype(np.int64), bins_costo - 1)
+        hist_costo += np.bincount((celdas * bins_costo + bin_costo).ravel(),
+                                  minlength=n_labs * horizonte * bins_costo).reshape(hist_costo.shape)
+        hechas += b
+    return hist_fallas, hist_costo, suma_fallas, suma_costo
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from src.repositories.equipo_repository import COLUMNAS_RESUMEN
+from src.utils.inventario_index import InventarioIndex
+
+class SincronizadorInventario:
+    """
+    Mantiene el inventario indexado (InventarioIndex) sincronizado con Supabase.
+    Tras la carga completa inicial guarda la marca de agua 'updated_at' más reciente
+    y, en adelante, solo descarga las filas modificadas para parcharlas en sitio.
+    'errores' reúne los registros no interpretables del inventario sincronizado: la
+    carga completa lo reinicia y cada delta solo agrega o resuelve sus propias filas.
+    Cada delta vuelve a pedir una ventana de solape antes de la marca: 'updated_at'
+    se fija al escribir la fila y no al confirmar la transacción (clock_timestamp en
+    Postgres) y SQLite lo guarda con milisegundos, así que una fila puede hacerse
+    visible con una marca menor a la ya vista. Las filas de la ventana que ya se
+    aplicaron (mismo id_activo y mismo 'updated_at') se descartan sin re-mapearlas.
+    """
+    LABORATORIOS_BASE = [
+        "Laboratorio de Control", "Laboratorio de Circuitos",
+        "Laboratorio de Máquinas", "Laboratorio FIEE"
+    ]
+    # Si el delta supera este tamaño conviene más recargar todo
+    LIMITE_DELTA = 1000
+    # Sin historial: el mapper lo deja como HistorialPerezoso (ver leer_historial)
+    COLUMNAS = COLUMNAS_RESUMEN + ("updated_at",)
+    # Ventana que se relee antes de la marca en cada delta
+    SOLAPE = timedelta(seconds=30)
+
+    def __init__(self, repositorio, mapper):
+        self.repo = repositorio
+        self.mapper = mapper
+        self.marca = None
+        # id_activo -> error del mapeo (ver EquipoMapper.errores)
+        self._errores = {}
+        # id_activo -> 'updated_at' de las filas aplicadas dentro de la ventana de solape
+        self._aplicados = {}
+
+    @property
+    def errores(self):
+        return list(self._errores.values())
+
+    def carga_completa(self):
+        """
+        Descarga toda la tabla, la indexa y fija la marca de agua.
+        Si la lectura se interrumpe (ErrorLecturaInventario) la marca anterior se
+        conserva, para que el inventario que el llamador ya tiene siga sincronizable.
+        """
+        marca_anterior, self.marca = self.marca, None
+        try:
+            inventario = InventarioIndex(
+                self.mapper.mapear_flujo(self._observar_marca(self.repo.leer_paginado(columnas=self.COLUMNAS))),
+                laboratorios_base=self.LABORATORIOS_BASE
+            )
+        except Exception:
+            self.marca = marca_anterior
+            raise
+        self._errores = {}
+        self._aplicados = {}
+        self._acumular_errores()
+        return inventario
+
+    def sincronizar(self, inventario, ids_pendientes=()):
+        """
+        Aplica en sitio los cambios posteriores a la marca de agua.
+        Los activos en 'ids_pendientes' (escrituras aún en cola) no se sobrescriben.
+        Retorna False si no fue posible y se requiere una carga completa.
+        """
+        cambios = self.repo.leer_cambios_desde(self._inicio_ventana(self.marca), limite=self.LIMITE_DELTA,
+                                               columnas=self.COLUMNAS)
+        if cambios is None or len(cambios) >= self.LIMITE_DELTA:
+            return False
+
+        aplicados = self._aplicados
+        cambios = [fila for fila in cambios if aplicados.get(fila.get("id_activo")) != fila.get("updated_at")]
+        for equipo in self.mapper.mapear_flujo(self._observar_marca(cambios)):
+            # La fila ya se interpreta bien: deja de figurar en el reporte
+            self._errores.pop(equipo.id_activo, None)
+            if equipo.id_activo not in ids_pendientes:
+                inventario.reemplazar(equipo)
+        self._acumular_errores()
+        self._recordar_aplicados(cambios)
+        return True
+
+    def _inicio_ventana(self, marca):
+        """Marca menos la ventana de solape, en el mismo formato ISO que la marca."""
+        instante = self._instante(marca)
+        return marca if instante is None else (instante - self.SOLAPE).isoformat(timespec="microseconds")
+
+    def _recordar_aplicados(self, filas):
+        """Registra las filas aplicadas y olvida las que ya quedaron fuera de la ventana."""
+        for fila in filas:
+            if fila.get("updated_at"):
+                self._aplicados[fila.get("id_activo")] = fila["updated_at"]
+        instante = self._instante(self.marca)
+        if instante is None:
+            return
+        inicio = instante - self.SOLAPE
+        self._aplicados = {id_activo: marca for id_activo, marca in self._aplicados.items()
+                           if (self._instante(marca) or inicio) >= inicio}
+
+    @staticmethod
+    def _instante(marca):
+        try:
+            return datetime.fromisoformat(marca)
+        except (TypeError, ValueError):
+            return None
+
+    def _acumular_errores(self):
+        for error in self.mapper.errores:
+            clave = error["id_activo"] if error["id_activo"] != "N/A" else ("N/A", len(self._errores))
+            self._errores[clave] = error
+
+    def _observar_marca(self, filas):
+        """Deja pasar las filas registrando el 'updated_at' más reciente visto."""
+        for fila in filas:
+            marca_fila = fila.get("updated_at")
+            if marca_fila and (self.marca is None or marca_fila > self.marca):
+                self.marca = marca_fila
+            yield fila
@@ -1,68 +1,239 @@
 import os
-import io
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
 import torch
 import torch.nn.functional as F
 from PIL import Image
-from transformers import AutoImageProcessor, AutoModelForImageClassification
+from transformers import AutoImageProcessor
+from src.services.cola_inferencia import ColaInferencia
+from src.services.pool_vision import PoolVision
+from src.vision_ai.backends import BackendInferencia, preparar_torchscript
+from src.utils.imagen import decodificar_evidencia
 
 class VisionService:
     """
     Servicio de Visión Computacional conectado a Hugging Face en la nube.
+    Las vistas usan la instancia única del proceso (VisionService.obtener()): el
+    modelo se descarga y se calienta una sola vez y todas las sesiones comparten
+    los mismos pesos. Las solicitudes concurrentes pasan por una cola de
+    micro-batching (ColaInferencia) y comparten un único forward pass por lote.
+    Con FIEE_VISION_PROCESOS > 0 el modelo vive en un pool de procesos aparte
+    (PoolVision) y este proceso solo decodifica y normaliza las imágenes.
+    FIEE_VISION_BACKEND elige la variante de CPU: fp32, int8 o torchscript
+    (ver src/vision_ai/validar_backends.py para compararlas).
     """
-    def __init__(self):
-        """Constructor: Inicializa el cerebro de visión artificial."""
+    _instancia = None
+    _lock_instancia = threading.Lock()
+    _hilo_precarga = None
+    # Serializa la descarga del modelo sin tomar el lock de la clase
+    _lock_carga = threading.Lock()
+    # Última instancia fallida: se reutiliza durante REINTENTO_S antes de volver a descargar
+    _fallida = None
+    _fallida_en = 0.0
+    REINTENTO_S = 60.0
+
+    def __init__(self, max_lote=8, espera_ms=10, procesos=None, hilos=None, backend=None, timeout=30.0):
+        """
+        Constructor: Inicializa el cerebro de visión artificial.
+        'procesos' (0 = en este proceso), 'hilos' (intra-op por worker) y 'backend'
+        se toman por defecto de FIEE_VISION_PROCESOS, FIEE_VISION_HILOS y FIEE_VISION_BACKEND.
+        'timeout' es la espera máxima (segundos) de un análisis síncrono.
+        """
         # Repositorio de Hugging Face
         self.__model_path = "NahilSisai/vit-mantenimiento-fiee" 
         
         self.processor = None
         self.model = None
         self.modelo_cargado = False
+        self.procesos = int(os.getenv("FIEE_VISION_PROCESOS", "0")) if procesos is None else procesos
+        self.hilos = int(os.getenv("FIEE_VISION_HILOS", "1")) if hilos is None else hilos
+        self.backend = backend or os.getenv("FIEE_VISION_BACKEND", "fp32").strip().lower()
+        self._backend = None
+        self._pool = None
+        self.timeout = timeout
+        # True recién cuando el modelo está cargado y ya respondió la inferencia de calentamiento
+        self.listo = False
+        self._lock_inferencia = threading.Lock()
+        self._cola = ColaInferencia(self.__despachar_lote, max_lote=max_lote, espera_ms=espera_ms)
         
         print("\n" + "="*50)
         print(f"🚀 [VISION SERVICE] Conectando con IA en la nube...")
         self.__cargar_modelo()
+        if self.modelo_cargado:
+            self.__calentar()
         print("="*50 + "\n")
 
+    # --- REGISTRO DEL PROCESO ---
+    @classmethod
+    def obtener(cls):
+        """
+        Instancia compartida por todas las sesiones. Solo se registra si quedó lista:
+        si la descarga o el calentamiento fallan, esa instancia ("IA no disponible")
+        se entrega durante REINTENTO_S y recién entonces una llamada reintenta.
+        Mientras se reintenta, las demás sesiones reciben la fallida sin esperar.
+        """
+        instancia = cls._instancia
+        if instancia is not None:
+            return instancia
+        if cls._fallida is not None:
+            if cls.__en_espera() or not cls._lock_carga.acquire(blocking=False):
+                return cls._fallida
+        else:
+            cls._lock_carga.acquire()
+        try:
+            # Otra sesión pudo terminar la carga mientras esperábamos
+            if cls._instancia is not None:
+                return cls._instancia
+            if cls._fallida is not None and cls.__en_espera():
+                return cls._fallida
+            # La descarga corre fuera de '_lock_instancia': precargar() y esta_listo() no se bloquean
+            instancia = cls()
+            with cls._lock_instancia:
+                if instancia.listo:
+                    cls._instancia = instancia
+                    cls._fallida = None
+                else:
+                    instancia.cerrar()
+                    cls._fallida, cls._fallida_en = instancia, time.monotonic()
+                    cls._hilo_precarga = None
+            return instancia
+        finally:
+            cls._lock_carga.release()
+
+    @classmethod
+    def __en_espera(cls):
+        return time.monotonic() - cls._fallida_en < cls.REINTENTO_S
+
+    @classmethod
+    def precargar(cls):
+        """
+        Carga y calienta el modelo en segundo plano al arrancar el servidor, para
+        que la primera inspección no pague la descarga. Es idempotente.
+        """
+        if cls._instancia is None and cls._hilo_precarga is None:
+            with cls._lock_instancia:
+                if cls._hilo_precarga is None:
+                    cls._hilo_precarga = threading.Thread(target=cls.obtener, name="precarga-vision-fiee", daemon=True)
+                    cls._hilo_precarga.start()
+
+    @classmethod
+    def esta_listo(cls):
+        """Bandera de disponibilidad: modelo cargado y calentado, sin bloquear."""
+        instancia = cls._instancia
+        return instancia is not None and instancia.listo
+
     def __cargar_modelo(self):
         """Descarga/Carga los pesos y el procesador desde Hugging Face."""
         print(f"🔍 Repositorio objetivo: {self.__model_path}")
         
         try:
             self.processor = AutoImageProcessor.from_pretrained(self.__model_path)
-            self.model = AutoModelForImageClassification.from_pretrained(self.__model_path)
+            if self.procesos > 0:
+                # Los pesos se cargan solo en los workers; el grafo TorchScript se exporta
+                # una vez aquí para que los workers no lo tracen a la vez
+                if self.backend == "torchscript":
+                    preparar_torchscript(self.__model_path)
+                self._pool = PoolVision.para_vit(self.__model_path, self.procesos, self.hilos, self.backend)
+            else:
+                self._backend = BackendInferencia(self.backend, self.__model_path)
+                self.model = self._backend.modelo
             self.modelo_cargado = True
-            print("Modelo cargado exitosamente desde la nube.")
+            print(f"Modelo cargado exitosamente desde la nube (backend {self.backend}).")
         except Exception as e:
             print(f"Error al conectar con Hugging Face: {e}")
 
-    def analizar_estado(self, datos_imagen):
-        """Realiza la inferencia sobre una imagen."""
+    def cerrar(self):
+        """Libera el pool de procesos (si lo hay)."""
+        if self._pool is not None:
+            self._pool.cerrar()
+            self._pool = None
+
+    def analizar_estado(self, datos_imagen, asincrono=False, timeout=None):
+        """
+        Realiza la inferencia sobre una imagen. Con asincrono=True retorna de
+        inmediato un Future que se resuelve con el mismo diccionario de diagnóstico.
+        La espera síncrona está acotada por 'timeout' (por defecto self.timeout).
+        """
         if not self.modelo_cargado:
-            return self.__respuesta_error("IA no disponible. Verifique conexión a internet.")
+            futuro = Future()
+            futuro.set_result(self.__respuesta_error("IA no disponible. Verifique conexión a internet."))
+        else:
+            try:
+                imagen = self.__preprocesar(datos_imagen)
+                # Se espera el lote que comparte con las demás sesiones
+                futuro = self._cola.enviar(imagen)
+            except Exception as e:
+                futuro = Future()
+                futuro.set_exception(e)
+
+        if not asincrono:
+            return self.__diagnostico_de(futuro, self.timeout if timeout is None else timeout)
+        diagnostico = Future()
+        futuro.add_done_callback(lambda f: diagnostico.set_result(self.__diagnostico_de(f)))
+        return diagnostico
+
+    def __diagnostico_de(self, futuro, timeout=None):
         try:
-            imagen = self.__preprocesar(datos_imagen)
-            inputs = self.processor(images=imagen, return_tensors="pt")
-            
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                probabilidades = F.softmax(outputs.logits, dim=-1)[0]
-                clase_idx = outputs.logits.argmax(-1).item()
-            
-            confianza = probabilidades[clase_idx].item() * 100
-            etiqueta_raw = self.model.config.id2label[clase_idx]
-            
-            return self.__procesar_diagnostico(etiqueta_raw, confianza)
+            resultado = futuro.result(timeout=timeout)
+        except FuturesTimeoutError:
+            # Si aún no entró a un lote, deja de ocupar lugar en la cola
+            futuro.cancel()
+            return self.__respuesta_error(f"La IA no respondió en {timeout:.0f} s. Intente nuevamente.")
         except Exception as e:
             return self.__respuesta_error(str(e))
+        if isinstance(resultado, dict):
+            return resultado
+        return self.__procesar_diagnostico(*resultado)
+
+    def __despachar_lote(self, imagenes):
+        """Destino de la cola: el pool (asíncrono, varios lotes en vuelo) o el modelo local."""
+        if self._pool is not None:
+            return self._pool.enviar(self.__pixeles(imagenes))
+        return self.inferir_lote(imagenes)
+
+    def __pixeles(self, imagenes):
+        # Normalización en este proceso; a los workers solo llega el tensor float32
+        return self.processor(images=list(imagenes), return_tensors="np")["pixel_values"].astype("float32")
+
+    def inferir_lote(self, imagenes):
+        """
+        Un solo forward pass para varias imágenes ya decodificadas.
+        Retorna [(etiqueta, confianza %)] en el mismo orden.
+        """
+        if self._pool is not None:
+            return self._pool.inferir(self.__pixeles(imagenes))
+        inputs = self.processor(images=list(imagenes), return_tensors="pt")
+
+        with self._lock_inferencia, torch.no_grad():
+            logits = self._backend.logits(inputs["pixel_values"])
+            confianzas, clases = F.softmax(logits, dim=-1).max(dim=-1)
+
+        id2label = self._backend.id2label
+        return [(id2label[c], p * 100) for c, p in zip(clases.tolist(), confianzas.tolist())]
+
+    def __calentar(self):
+        """Inferencia de calentamiento: la primera pasada real ya no paga la inicialización."""
+        try:
+            blanco = Image.new("RGB", (224, 224))
+            if self._pool is not None:
+                # Una tarea simultánea por worker: todos arrancan y cargan el modelo ahora
+                pixeles = self.__pixeles([blanco])
+                for futuro in [self._pool.enviar(pixeles) for _ in range(self.procesos)]:
+                    futuro.result()
+            else:
+                self.inferir_lote([blanco])
+            self.listo = True
+            print("Modelo calentado y listo para inspecciones.")
+        except Exception as e:
+            print(f"Error en la inferencia de calentamiento: {e}")
 
     def analizar_quemadura(self, datos_imagen):
         return self.analizar_estado(datos_imagen)
 
     def __preprocesar(self, data):
-        if hasattr(data, 'read'):
-            data.seek(0)
-            return Image.open(io.BytesIO(data.read())).convert("RGB")
-        return Image.open(data).convert("RGB")
+        # Una imagen ya decodificada (decodificar_evidencia) se usa sin volver a leerla
+        return decodificar_evidencia(data)
 
     def __procesar_diagnostico(self, etiqueta: str, confianza: float):
         etiqueta_clean = etiqueta.lower()
@@ -0,0 +1,34 @@
+import io
+from PIL import Image
+
+# Lado de entrada del ViT de diagnóstico
+LADO_MODELO = 224
+
+
+def decodificar_evidencia(datos, lado=LADO_MODELO):
+    """
+    Decodifica una foto de evidencia una sola vez y en memoria, ya reducida a
+    ~'lado' px en su lado menor (nunca por debajo de 'lado').
+    Acepta un UploadedFile de Streamlit, bytes, un archivo/ruta o una imagen PIL
+    ya decodificada (que se retorna tal cual). El resultado sirve igual para la
+    inferencia, la miniatura en pantalla y el PDF.
+    - JPEG: draft() hace que el decodificador escale por DCT (1/2, 1/4, 1/8), de
+      modo que las fotos grandes de cámara nunca se expanden a resolución completa.
+    - Otros formatos: reduce() por un factor entero tras decodificar.
+    """
+    if isinstance(datos, Image.Image):
+        return datos if datos.mode == "RGB" else datos.convert("RGB")
+    if hasattr(datos, "getvalue"):
+        datos = datos.getvalue()
+    if isinstance(datos, (bytes, bytearray, memoryview)):
+        datos = io.BytesIO(datos)
+    elif hasattr(datos, "seek"):
+        datos.seek(0)
+
+    imagen = Image.open(datos)
+    if imagen.format == "JPEG":
+        imagen.draft("RGB", (lado, lado))
+    factor = min(imagen.size) // lado
+    if factor > 1:
+        imagen = imagen.reduce(factor)
+    return imagen if imagen.mode == "RGB" else imagen.convert("RGB")
@@ -0,0 +1,111 @@
+from collections.abc import Mapping
+
+class InventarioIndex(Mapping):
+    """
+    Contenedor indexado del inventario.
+    Se comporta como el antiguo diccionario laboratorio -> lista de equipos (para
+    las vistas y DataFrames), pero además ofrece búsqueda O(1) por 'id_activo' e
+    índices secundarios por ubicación, estado y tipo que se mantienen de forma
+    incremental cuando un activo cambia.
+    """
+    def __init__(self, equipos=(), laboratorios_base=()):
+        self._por_id = {}
+        self._claves = {}
+        self._por_ubicacion = {lab: {} for lab in laboratorios_base}
+        self._por_estado = {}
+        self._por_tipo = {}
+        # Listas materializadas por laboratorio (se invalidan al cambiar ese laboratorio)
+        self._listas = {}
+        for equipo in equipos:
+            self.reemplazar(equipo)
+
+    @staticmethod
+    def clave_estado(equipo):
+        return equipo.estado.name if hasattr(equipo.estado, 'name') else str(equipo.estado)
+
+    @staticmethod
+    def _claves_de(equipo):
+        return (getattr(equipo, 'ubicacion', 'Laboratorio FIEE'),
+                InventarioIndex.clave_estado(equipo),
+                type(equipo).__name__)
+
+    # --- INTERFAZ DE DICCIONARIO (laboratorio -> lista) ---
+    def __getitem__(self, lab):
+        lista = self._listas.get(lab)
+        if lista is None:
+            lista = self._listas[lab] = list(self._por_ubicacion[lab].values())
+        return lista
+
+    def __iter__(self):
+        return iter(self._por_ubicacion)
+
+    def __len__(self):
+        return len(self._por_ubicacion)
+
+    # --- CONSULTAS INDEXADAS ---
+    def obtener(self, id_activo):
+        return self._por_id.get(id_activo)
+
+    def ubicacion_de(self, id_activo):
+        claves = self._claves.get(id_activo)
+        return claves[0] if claves else None
+
+    def por_ubicacion(self, lab):
+        return list(self._por_ubicacion.get(lab, {}).values())
+
+    def por_estado(self, estado):
+        return list(self._por_estado.get(estado, {}).values())
+
+    def por_tipo(self, tipo):
+        return list(self._por_tipo.get(tipo, {}).values())
+
+    def total(self):
+        return len(self._por_id)
+
+    # --- MANTENIMIENTO INCREMENTAL ---
+    def reemplazar(self, equipo):
+        """Agrega el activo o sustituye su versión anterior (conservando su posición)."""
+        id_activo = equipo.id_activo
+        nuevas = self._claves_de(equipo)
+        anteriores = self._claves.get(id_activo)
+
+        if anteriores is not None:
+            self._desindexar(id_activo, anteriores, conservar_ubicacion=(anteriores[0] == nuevas[0]))
+
+        self._por_id[id_activo] = equipo
+        self._claves[id_activo] = nuevas
+        ubicacion, estado, tipo = nuevas
+        self._por_ubicacion.setdefault(ubicacion, {})[id_activo] = equipo
+        self._por_estado.setdefault(estado, {})[id_activo] = equipo
+        self._por_tipo.setdefault(tipo, {})[id_activo] = equipo
+        self._listas.pop(ubicacion, None)
+
+    def reindexar(self, equipo):
+        """Actualiza los índices tras modificar el estado (o la ubicación) de un activo."""
+        self.reemplazar(equipo)
+
+    def quitar(self, id_activo):
+        anteriores = self._claves.pop(id_activo, None)
+        if anteriores is None:
+            return
+        self._desindexar(id_activo, anteriores, conservar_ubicacion=False)
+        del self._por_id[id_activo]
+
+    def _desindexar(self, id_activo, claves, conservar_ubicacion):
+        ubicacion, estado, tipo = claves
+        if not conservar_ubicacion:
+            self._por_ubicacion[ubicacion].pop(id_activo, None)
+        self._por_estado[estado].pop(id_activo, None)
+        self._por_tipo[tipo].pop(id_activo, None)
+        self._listas.pop(ubicacion, None)
+
+    def copiar(self):
+        """Copia superficial de los índices (los objetos Equipo se comparten)."""
+        nuevo = InventarioIndex.__new__(InventarioIndex)
+        nuevo._por_id = dict(self._por_id)
+        nuevo._claves = dict(self._claves)
+        nuevo._por_ubicacion = {k: dict(v) for k, v in self._por_ubicacion.items()}
+        nuevo._por_estado = {k: dict(v) for k, v in self._por_estado.items()}
+        nuevo._por_tipo = {k: dict(v) for k, v in self._por_tipo.items()}
+        nuevo._listas = {}
+        return nuevo
@@ -1,59 +1,87 @@
 from src.equipo_factory import EquipoFactory
-from src.utils.enums import EstadoEquipo
+from src.logical.estimador_rls import EstimadorRLS
+from src.logical.estrategias import EstrategiasWeibull
+from src.logical.weibull import ParametrosWeibull
+from src.models.historial import HistorialPerezoso
 
 class EquipoMapper:
     """
     Implementación del patrón Data Mapper.
     Transforma estructuras JSON de la base de datos en instancias de clases del dominio.
+    Los registros inválidos no interrumpen la carga: se reúnen en 'errores'.
     """
-    def __init__(self, estrategia_lineal, estrategia_exponencial):
-        """Inyecta las estrategias disponibles para el cálculo de obsolescencia."""
+    def __init__(self, estrategia_lineal, estrategia_exponencial, cargador_historial=None, estrategias_weibull=None):
+        """
+        Inyecta las estrategias disponibles para el cálculo de obsolescencia y,
+        opcionalmente, el cargador de historiales (por ejemplo repo.leer_historial)
+        para los registros leídos sin la columna 'historial_incidencias' y las
+        estrategias Weibull por tipo de equipo (EstrategiasWeibull).
+        """
         self.estr_lineal = estrategia_lineal
         self.estr_expo = estrategia_exponencial
+        self.cargador_historial = cargador_historial
+        self.estr_weibull = (estrategias_weibull if estrategias_weibull is not None
+                             else EstrategiasWeibull(ParametrosWeibull(), estrategia_lineal))
+        # Reporte estructurado del último mapeo: [{"id_activo", "tipo_equipo", "error"}]
+        self.errores = []
+        self._estrategias = {}
 
     def mapear_lista(self, data_list):
         """Convierte una colección de registros en una lista de objetos Equipo."""
-        objetos_convertidos = []
-        
-        for item in data_list:
-            nuevo_obj = self._mapear_item(item)
-            if nuevo_obj:
-                objetos_convertidos.append(nuevo_obj)
-                
-        return objetos_convertidos
+        return list(self.mapear_flujo(data_list))
 
-    def _mapear_item(self, item):
-        """Lógica interna de transformación de un registro individual."""
-        tipo = item.get("tipo_equipo")
-        detalles = item.get("detalles_tecnicos", {})
+    def mapear_flujo(self, data_iterable):
+        """
+        Versión perezosa de mapear_lista: acepta cualquier iterable (por ejemplo el
+        generador paginado del repositorio) y entrega cada objeto apenas se construye.
+        Valida y construye cada registro en una sola pasada con los decodificadores
+        de EquipoFactory: una fecha o un detalle técnico con tipo inválido deja el
+        registro en 'errores' en lugar de producir un objeto a medias.
+        """
+        self.errores = []
+        constructores = EquipoFactory.decodificadores()
+        estrategia_de = self._estrategia
+        memo_estrategias = self._estrategias
+        cargador = self.cargador_historial
+        desde_dict = EstimadorRLS.desde_dict
 
-        # Determinación de la estrategia inyectada
-        nombre_est = item.get("estrategia_nombre", "Lineal")
-        est_obj = self.estr_lineal if "Lineal" in nombre_est else self.estr_expo
+        for item in data_iterable:
+            tipo = item.get("tipo_equipo")
+            constructor = constructores.get(tipo)
+            if constructor is None:
+                self._registrar_error(item, f"Tipo de equipo no soportado por la fábrica: {tipo}")
+                continue
+            try:
+                nombre_est = item.get("estrategia_nombre")
+                nuevo_obj = constructor(item, item.get("detalles_tecnicos") or {},
+                                        memo_estrategias.get(nombre_est) or estrategia_de(nombre_est, tipo))
+            except (KeyError, TypeError, ValueError) as e:
+                self._registrar_error(item, f"{type(e).__name__}: {e}")
+                continue
 
-        try:
-            # Creación mediante Factory Pattern
-            nuevo_obj = EquipoFactory.crear_equipo(
-                tipo,
-                item,
-                detalles,
-                est_obj
-            )
+            # El decodificador ya restauró ubicación, estado e historial
+            modelo_desgaste = item.get("modelo_desgaste")
+            if modelo_desgaste:
+                nuevo_obj.modelo_desgaste = desde_dict(modelo_desgaste)
+            if cargador is not None and "historial_incidencias" not in item:
+                # Registro resumido: el historial se descargará solo si alguien lo lee
+                nuevo_obj.historial_incidencias = HistorialPerezoso(nuevo_obj.id_activo, cargador)
+            yield nuevo_obj
 
-            # Reconstrucción de atributos persistidos
-            nuevo_obj.ubicacion = item.get("ubicacion", "Sin Asignar")
-            # Asignación segura del estado desde el Enum
-            estado_str = item.get("estado", "OPERATIVO")
-            if hasattr(EstadoEquipo, estado_str):
-                nuevo_obj.estado = getattr(EstadoEquipo, estado_str)
-            else:
-                # Fallback por seguridad si el texto no coincide exactamente
-                nuevo_obj.estado = EstadoEquipo.OPERATIVO
-            nuevo_obj.historial_incidencias = item.get("historial_incidencias", [])
+    def _estrategia(self, nombre, tipo=None):
+        """Determinación de la estrategia inyectada (memorizada por nombre)."""
+        if nombre == "DesgasteWeibull":
+            # La curva Weibull es propia de cada tipo (se crea si el tipo aún no tiene una)
+            return self.estr_weibull[tipo]
+        estrategia = self._estrategias.get(nombre)
+        if estrategia is None:
+            estrategia = self.estr_lineal if "Lineal" in (nombre or "Lineal") else self.estr_expo
+            self._estrategias[nombre] = estrategia
+        return estrategia
 
-            return nuevo_obj
-
-        except Exception as e:
-            # Log de error silencioso para producción
-            print(f"Log: Error en mapeo de activo {item.get('id_activo', 'N/A')}: {e}")
-            return None
\ No newline at end of file
+    def _registrar_error(self, item, error):
+        self.errores.append({
+            "id_activo": item.get("id_activo", "N/A"),
+            "tipo_equipo": item.get("tipo_equipo"),
+            "error": error
+        })
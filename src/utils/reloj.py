@@ -0,0 +1,24 @@
+from datetime import date, timedelta
+
+class RelojSistema:
+    """Reloj por defecto: la fecha real del sistema."""
+    def hoy(self) -> date:
+        return date.today()
+
+
+class RelojFijo:
+    """
+    Reloj inyectable para pruebas y simulaciones: siempre retorna la misma fecha
+    hasta que se avanza explícitamente.
+    """
+    def __init__(self, fecha: date):
+        self.fecha = fecha
+
+    def hoy(self) -> date:
+        return self.fecha
+
+    def avanzar(self, dias=1):
+        self.fecha += timedelta(days=dias)
+
+
+RELOJ_SISTEMA = RelojSistema()
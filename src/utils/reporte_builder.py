@@ -1,6 +1,4 @@
 import io
-import os
-import tempfile
 from PIL import Image
 from fpdf import FPDF
 
@@ -57,21 +55,20 @@ class ReporteBuilder:
         return self
 
     def agregar_evidencia(self, imagen_bytes):
-        """Adjunta la captura de pantalla o foto de la inspección."""
+        """Adjunta la captura de pantalla o foto de la inspección (bytes o imagen PIL ya decodificada)."""
         if imagen_bytes:
             self.pdf.set_font("helvetica", "B", 12)
             self.pdf.cell(0, 10, "2. Evidencia de la Inspección con IA:", new_x="LMARGIN", new_y="NEXT")
             
             try:
-                bytes_reales = imagen_bytes.getvalue() if hasattr(imagen_bytes, 'getvalue') else imagen_bytes
+                if isinstance(imagen_bytes, Image.Image):
+                    # FPDF incrusta la imagen PIL directamente, sin archivo temporal
+                    fuente = imagen_bytes
+                else:
+                    bytes_reales = imagen_bytes.getvalue() if hasattr(imagen_bytes, 'getvalue') else imagen_bytes
+                    fuente = io.BytesIO(bytes_reales)
                 
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-                    tmp.write(bytes_reales)
-                    ruta_tmp = tmp.name
-                
-                self.pdf.image(ruta_tmp, w=90, x=60) 
-                
-                os.remove(ruta_tmp)
+                self.pdf.image(fuente, w=90, x=60) 
                 
             except Exception as e:
                 self.pdf.set_font("helvetica", "I", 10)
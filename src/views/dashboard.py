@@ -5,24 +5,33 @@ import time
 import requests
 import os
 import tempfile
-from datetime import datetime, timedelta
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
 # --- IMPORTS PROPIOS ---
 from src.views.base_view import Vista 
 from src.models.equipo import Equipo 
 from src.models.concretos import MotorInduccion, Osciloscopio, Multimetro
 from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
-from src.repositories.equipo_repository import EquipoRepository 
+from src.repositories.repositorio_factory import RepositorioFactory 
 from src.utils.enums import EstadoEquipo
 from src.services.vision_service import VisionService
 from src.services.predictive_service import PredictiveService
+from src.services.planificador_mantenimiento import PlanificadorMantenimiento
+from src.services.simulacion_riesgo import SimuladorRiesgo
 from src.utils.mapper import EquipoMapper
+from src.services.inventario_compartido import InventarioCompartido, VistaInventarioSesion
+from src.repositories.equipo_repository import ErrorLecturaInventario
+from src.services.cola_persistencia import ColaEscrituraDiferida
 from src.equipo_factory import EquipoFactory
 from src.utils.reporte_builder import ReporteBuilder
+from src.utils.imagen import decodificar_evidencia
 
 # ==============================================================================
 # 0. CLASE PARA EQUIPOS GENÉRICOS
 # ==============================================================================
 class EquipoGenerico(Equipo):
+    __slots__ = ("descripcion", "detalles_tecnicos")
+
     def __init__(self, id_activo, modelo, fecha_compra, descripcion, estrategia_desgaste):
         super().__init__(id_activo, modelo, fecha_compra, estrategia_desgaste)
         self.descripcion = descripcion
@@ -60,29 +69,32 @@ class DashboardUtils:
     @staticmethod
     def convertir_objetos_a_df(_lista_equipos_dict, _trigger): 
         data = []
-        if not _lista_equipos_dict or not isinstance(_lista_equipos_dict, dict): 
+        if not _lista_equipos_dict or not isinstance(_lista_equipos_dict, Mapping): 
             return pd.DataFrame()
 
-        for lab_nombre, lista_equipos in _lista_equipos_dict.items():
-            if not isinstance(lista_equipos, list): continue 
-            for eq in lista_equipos:
-                obs_num = eq.calcular_obsolescencia()
-                estado_actual = eq.estado.name if hasattr(eq.estado, 'name') else str(eq.estado)
-                data.append({
-                    "ID": eq.id_activo,
-                    "Modelo": eq.modelo,
-                    "Tipo": type(eq).__name__, 
-                    "Ubicación": lab_nombre,
-                    "Estado": estado_actual,
-                    "Desgaste (%)": f"{obs_num * 100:.2f}%", 
-                    "Diagnóstico": DashboardUtils.obtener_comentario_estado(obs_num, estado_actual), # FÍJATE AQUÍ: Llamamos a la función con el nombre de la clase
-                    "OBJ_REF": eq 
-                })
+        filas = [(lab_nombre, eq) for lab_nombre, lista_equipos in _lista_equipos_dict.items()
+                 if isinstance(lista_equipos, list) for eq in lista_equipos]
+        # Un solo cálculo vectorizado para toda la flota en lugar de uno por activo
+        obsolescencias = Equipo.calcular_obsolescencia_lote(eq for _, eq in filas)
+
+        for (lab_nombre, eq), obs_num in zip(filas, obsolescencias.tolist()):
+            estado_actual = eq.estado.name if hasattr(eq.estado, 'name') else str(eq.estado)
+            data.append({
+                "ID": eq.id_activo,
+                "Modelo": eq.modelo,
+                "Tipo": type(eq).__name__, 
+                "Ubicación": lab_nombre,
+                "Estado": estado_actual,
+                "Desgaste (%)": f"{obs_num * 100:.2f}%", 
+                "Diagnóstico": DashboardUtils.obtener_comentario_estado(obs_num, estado_actual), # FÍJATE AQUÍ: Llamamos a la función con el nombre de la clase
+                "OBJ_REF": eq 
+            })
         return pd.DataFrame(data)
 
     # --- Función PDF Profesional (PATRÓN BUILDER) ---
     @staticmethod
     def generar_pdf(equipo, lab, imagen_bytes=None): 
+        """'imagen_bytes': bytes de la foto o la imagen PIL ya decodificada de la inspección."""
         builder = ReporteBuilder()
         builder.agregar_titulo("ORDEN DE TRABAJO Y FICHA TÉCNICA")
        
@@ -100,6 +112,7 @@ class DashboardUtils:
         builder.agregar_cuerpo(datos)
         
         # 1. FOTO PRINCIPAL
+        builder.agregar_evidencia(imagen_bytes)
 
         # 2. SECCIÓN DE HISTORIAL
         builder.pdf.ln(5)
@@ -171,31 +184,41 @@ class DashboardUtils:
 
 class VistaDashboard(Vista):
     
-    def _cargar_y_agrupar_desde_supabase(self):
-        repo = EquipoRepository()
-        datos_raw = repo.leer_todos()
-        
-        laboratorios_dict = {
-            "Laboratorio de Control": [], "Laboratorio de Circuitos": [],
-            "Laboratorio de Máquinas": [],
-            "Laboratorio FIEE": [] 
-        } 
-        
-        est_lineal = st.session_state.get('est_lineal', DesgasteLineal())
-        est_expo = st.session_state.get('est_expo', DesgasteExponencial())
+    def _inventario_sesion(self):
+        if st.session_state.get('inventario_sesion') is None:
+            st.session_state.inventario_sesion = VistaInventarioSesion()
+        return st.session_state.inventario_sesion
 
-        if not datos_raw: return laboratorios_dict
+    def _cargar_y_agrupar_desde_supabase(self):
+        """
+        Retorna la vista de esta sesión sobre la instantánea compartida del proceso.
+        Solo consulta la base de datos si la instantánea venció o hubo escrituras;
+        los activos con escrituras aún en cola conservan su versión local.
+        """
+        compartido = InventarioCompartido.obtener()
+        st.session_state.est_lineal = compartido.est_lineal
+        st.session_state.est_expo = compartido.est_expo
+        st.session_state.est_weibull = compartido.est_weibull
+        compartido.ajuste_weibull.iniciar()
+        ids_pendientes = ColaEscrituraDiferida.obtener().ids_pendientes()
+        return self._inventario_sesion().actualizar(compartido, ids_pendientes)
 
-        mapper = EquipoMapper(est_lineal, est_expo)
-        equipos_lista = mapper.mapear_lista(datos_raw)
+    def _editable(self, equipo):
+        """Copia privada (copy-on-write) del activo antes de que la sesión lo modifique."""
+        return self._inventario_sesion().editable(equipo)
 
-        for equipo in equipos_lista:
-            ubicacion = getattr(equipo, 'ubicacion', 'Laboratorio FIEE')
-            if ubicacion not in laboratorios_dict: 
-                laboratorios_dict[ubicacion] = []
-            laboratorios_dict[ubicacion].append(equipo)
-            
-        return laboratorios_dict
+    @staticmethod
+    def _evidencia_decodificada(archivo):
+        """Decodifica la foto subida una sola vez por archivo (se reutiliza entre reruns)."""
+        if archivo is None:
+            return None
+        clave = getattr(archivo, 'file_id', None) or id(archivo)
+        guardada = st.session_state.get('evidencia_ia')
+        if guardada and guardada[0] == clave:
+            return guardada[1]
+        imagen = decodificar_evidencia(archivo)
+        st.session_state.evidencia_ia = (clave, imagen)
+        return imagen
 
     def render(self):
         st.title("📊 Dashboard de Activos FIEE")
@@ -205,11 +228,34 @@ class VistaDashboard(Vista):
         if 'est_lineal' not in st.session_state: st.session_state.est_lineal = DesgasteLineal()
         if 'est_expo' not in st.session_state: st.session_state.est_expo = DesgasteExponencial()
 
-        es_lista_erronea = ('db_laboratorios' in st.session_state and not isinstance(st.session_state.db_laboratorios, dict))
-        
-        if 'db_laboratorios' not in st.session_state or st.session_state.trigger > 0 or es_lista_erronea:
+        # Vista barata sobre la instantánea compartida: solo se rearma si esta cambió
+        try:
             st.session_state.db_laboratorios = self._cargar_y_agrupar_desde_supabase()
-            st.session_state.trigger = 0 
+        except ErrorLecturaInventario as e:
+            # Aún no hay ninguna instantánea que mostrar: mejor nada que un inventario a medias
+            st.error(f"❌ No se pudo leer el inventario desde la base de datos. {e}")
+            return
+        st.session_state.trigger = 0
+
+        error_carga = InventarioCompartido.obtener().error_carga
+        if error_carga:
+            st.warning(f"⚠️ Mostrando la última copia del inventario: el refresco falló. {error_carga}")
+
+        cola = ColaEscrituraDiferida.obtener()
+        if cola.pendientes or cola.fallidos:
+            st.caption(f"💾 Guardando en segundo plano: {cola.pendientes} pendientes · {cola.fallidos} fallidos")
+        if cola.fallidos:
+            # Los cambios que no llegaron a la nube siguen visibles hasta reintentarlos
+            ids_fallidos = ", ".join(f["id_activo"] for f in cola.obtener_fallidos())
+            st.error(f"❌ No se pudieron guardar los cambios de: {ids_fallidos}")
+            if st.button("🔁 Reintentar guardado", key="reintentar_fallidos"):
+                cola.reintentar_fallidos()
+                st.rerun()
+
+        errores_mapeo = InventarioCompartido.obtener().errores_mapeo
+        if errores_mapeo:
+            with st.expander(f"⚠️ {len(errores_mapeo)} registros no se pudieron interpretar"):
+                st.dataframe(pd.DataFrame(errores_mapeo), width="stretch", hide_index=True)
 
         tab_tabla, tab_detalle, tab_recup, tab_alta, tab_bajas = st.tabs(["📋 Inventario", "⚙️ Gestión Técnica", "🚑 Recuperación", "➕ Actualizar Inventario", "🪦 Histórico de Bajas"])
 
@@ -221,18 +267,39 @@ class VistaDashboard(Vista):
                 opciones = ["🔍 VER TODOS"] + labs_con_datos
                 filtro_lab = st.selectbox("Filtrar por Ubicación:", opciones)
                 
-                df = DashboardUtils.convertir_objetos_a_df(st.session_state.db_laboratorios, st.session_state.trigger)
+                # 1. Filas elegidas con los índices (ubicación y estado): el DataFrame
+                # se arma solo con los activos vivos del filtro
+                inventario = st.session_state.db_laboratorios
+                bajas = {eq.id_activo for eq in inventario.por_estado(EstadoEquipo.BAJA.name)}
+                labs_filtro = labs_con_datos if filtro_lab == "🔍 VER TODOS" else [filtro_lab]
+                seleccion = {lab: [eq for eq in inventario.por_ubicacion(lab) if eq.id_activo not in bajas]
+                             for lab in labs_filtro}
+                df = DashboardUtils.convertir_objetos_a_df(seleccion, st.session_state.trigger)
                 
                 if not df.empty:
-                    # 1. Quitamos la columna de objetos y filtramos los vivos
                     df_show = df.drop(columns=["OBJ_REF"])
-                    df_show = df_show[df_show["Estado"] != "BAJA"]
-                    
-                    if filtro_lab != "🔍 VER TODOS":
-                        df_show = df_show[df_show["Ubicación"] == filtro_lab]
                     
                     st.dataframe(df_show, width="stretch", hide_index=True)
                     st.caption(f"Mostrando {len(df_show)} registros activos.")
+
+                    # 2. Ranking de fallas previstas para toda la flota visible (cálculo vectorizado)
+                    with st.expander("🔮 Próximas fallas previstas"):
+                        activos = df["OBJ_REF"]
+                        ranking = PredictiveService().predecir_flota(activos)
+                        st.dataframe(ranking[["ID", "Modelo", "Ubicación", "Desgaste", "Fecha falla"]],
+                                     width="stretch", hide_index=True)
+
+                    # 3. Distribución de fallas y costo de reposición por laboratorio (a pedido: es costosa)
+                    with st.expander("💰 Riesgo y presupuesto de renovación (Monte Carlo)"):
+                        simulaciones = st.select_slider("Simulaciones:", options=[1_000, 10_000, 100_000], value=10_000)
+                        if st.button("▶️ Simular", key="btn_simular_riesgo"):
+                            simulador = SimuladorRiesgo(PredictiveService(), InventarioCompartido.obtener().parametros_weibull)
+                            with st.spinner("Simulando escenarios de falla..."):
+                                st.session_state.riesgo_flota = simulador.simular(df["OBJ_REF"],
+                                                                                   simulaciones=simulaciones)
+                        if st.session_state.get("riesgo_flota") is not None:
+                            st.dataframe(st.session_state.riesgo_flota, width="stretch", hide_index=True)
+                            st.caption("Acumulado a 1–5 años. Bandas P5–P95 de fallas y costo de reposición por laboratorio.")
                 else:
                     st.info("No hay equipos registrados.")
             else:
@@ -258,9 +325,10 @@ class VistaDashboard(Vista):
                     st.markdown("#### 🤖 Inspección Visual")
                     img = st.file_uploader("Subir foto daño:", type=['jpg','png'], key=f"ia_{eq_sel.id_activo}")
                     if img and st.button("Analizar", key=f"btn_ia_{eq_sel.id_activo}"):
+                        eq_sel = self._editable(eq_sel)
                         with st.spinner("Analizando imagen con IA... 🔍"):
-                            vision = VisionService()
-                            res = vision.analizar_quemadura(img)
+                            vision = VisionService.obtener()
+                            res = vision.analizar_quemadura(self._evidencia_decodificada(img))
                             
                             # 1. Extraemos los datos previniendo que la IA cambie los nombres
                             diag = res.get('diagnostico', res.get('dictamen', 'Sin diagnóstico'))
@@ -270,7 +338,7 @@ class VistaDashboard(Vista):
                             # 2. Guardamos en el historial
                             url_foto_publica = ""
                             try:
-                                repo = EquipoRepository() 
+                                repo = RepositorioFactory.crear() 
                                 if repo.client:
                                     nombre_archivo = f"dash_{eq_sel.id_activo}_{int(time.time())}.png"
                                     
@@ -282,32 +350,28 @@ class VistaDashboard(Vista):
                                     url_foto_publica = repo.client.storage.from_("evidencias").get_public_url(nombre_archivo)
                             except Exception as e:
                                 pass 
-                            eq_sel.historial_incidencias.append({
-                                "fecha": datetime.now().strftime("%Y-%m-%d"),
-                                "detalle": "Inspección Visual IA por docente", 
-                                "dictamen_ia": diag,
-                                "url_foto": url_foto_publica
-                            })
-                            
                             # 3. Lógica de decisión Inteligente (Human-in-the-Loop)
                             if alerta:
                                 # CAMINO 1: IA detecta falla evidente en la foto
-                                eq_sel.estado = EstadoEquipo.EN_MANTENIMIENTO.name
+                                eq_sel.estado = EstadoEquipo.EN_MANTENIMIENTO
                                 inc_detalle = "IA confirmó anomalía visual. Automático a mantenimiento."
                             else:
                                 # CAMINO 3: IA no detecta falla, pero hay reporte. Pasa a duda/Triaje
-                                eq_sel.estado = "REPORTADO"
+                                eq_sel.estado = EstadoEquipo.REPORTADO
                                 inc_detalle = "Inspección IA no concluyente. Requiere Triaje manual."
                                 
-                            # Actualizamos el último registro del historial con la conclusión
-                            eq_sel.historial_incidencias[-1]["detalle"] = inc_detalle
-                            
-                            EquipoRepository().actualizar_equipo(eq_sel)
+                            # 4. Registramos la conclusión y enviamos solo el evento nuevo
+                            evento = {
+                                "fecha": datetime.now().strftime("%Y-%m-%d"),
+                                "detalle": inc_detalle, 
+                                "dictamen_ia": diag,
+                                "url_foto": url_foto_publica
+                            }
+                            eq_sel.anexar_evento(evento)
+                            ColaEscrituraDiferida.obtener().encolar(eq_sel, evento)
                             
                             # 5. Limpieza TOTAL de la memoria
                             st.cache_data.clear() 
-                            if 'db_laboratorios' in st.session_state:
-                                del st.session_state['db_laboratorios'] 
                             st.session_state.trigger = 1
                             
                             # 6. Mensaje de éxito y pausa estratégica para Supabase
@@ -320,14 +384,22 @@ class VistaDashboard(Vista):
                     st.markdown("#### 🧠 Algoritmo de Desgaste")
                     est_actual_nombre = type(eq_sel.estrategia_desgaste).__name__
                     
-                    modo_sel = st.radio("Modelo Matemático:", ["Lineal", "Exponencial"],
-                                        index=0 if "Lineal" in est_actual_nombre else 1,
+                    modos = ["Lineal", "Exponencial", "Weibull (flota)"]
+                    modo_sel = st.radio("Modelo Matemático:", modos,
+                                        index=2 if "Weibull" in est_actual_nombre else (0 if "Lineal" in est_actual_nombre else 1),
                                         horizontal=True, key=f"rad_{eq_sel.id_activo}")
                     
                     if st.button("🔄 Actualizar Cálculo", key=f"btn_calc_{eq_sel.id_activo}"):
-                        nueva_est = st.session_state.est_lineal if modo_sel == "Lineal" else st.session_state.est_expo
+                        eq_sel = self._editable(eq_sel)
+                        if modo_sel == "Lineal":
+                            nueva_est = st.session_state.est_lineal
+                        elif modo_sel == "Exponencial":
+                            nueva_est = st.session_state.est_expo
+                        else:
+                            # Curva ajustada sobre la flota del mismo tipo (lineal mientras no haya ajuste)
+                            nueva_est = st.session_state.est_weibull[type(eq_sel).__name__]
                         eq_sel.cambiar_estrategia(nueva_est)
-                        EquipoRepository().actualizar_equipo(eq_sel)
+                        ColaEscrituraDiferida.obtener().encolar(eq_sel)
                         st.session_state.trigger = 1
                         st.success(f"Cambiado a modelo {modo_sel}")
                         time.sleep(1)
@@ -340,17 +412,17 @@ class VistaDashboard(Vista):
                         motivo = st.text_input("¿Por qué reportas este equipo? (Opcional):", placeholder="Ej: Falla interna, muy viejo...")
     
                         if st.button("🚩 Levantar Reporte (Enviar a Triaje)", key=f"mant_man_{eq_sel.id_activo}"):
+                            eq_sel = self._editable(eq_sel)
                             usuario_actual = st.session_state.get("usuario", "docente")
-                            eq_sel.estado = "REPORTADO"
-                            eq_sel.historial_incidencias.append({
+                            eq_sel.estado = EstadoEquipo.REPORTADO
+                            evento = {
                                 "fecha": datetime.now().strftime("%Y-%m-%d"),
                                 "detalle": f"REPORTE MANUAL por {usuario_actual}. Motivo: {motivo}. Pendiente de Triaje."
-                            })
+                            }
+                            eq_sel.anexar_evento(evento)
         
-                            EquipoRepository().actualizar_equipo(eq_sel)
+                            ColaEscrituraDiferida.obtener().encolar(eq_sel, evento)
                             st.cache_data.clear()
-                            if 'db_laboratorios' in st.session_state:
-                                del st.session_state['db_laboratorios']
                             st.session_state.trigger = 1
                             st.rerun()
 
@@ -360,29 +432,29 @@ class VistaDashboard(Vista):
                         col_t1, col_t2 = st.columns(2)
                         with col_t1:
                             if st.button("✅ Falsa Alarma", key=f"btn_ok_{eq_sel.id_activo}", type="secondary", use_container_width=True):
-                                eq_sel.estado = EstadoEquipo.OPERATIVO.name
-                                eq_sel.historial_incidencias.append({
+                                eq_sel = self._editable(eq_sel)
+                                eq_sel.estado = EstadoEquipo.OPERATIVO
+                                evento = {
                                     "fecha": datetime.now().strftime("%Y-%m-%d"),
                                     "detalle": "TRIAJE: Reporte desestimado. Vuelve a Operativo."
-                                })
-                                EquipoRepository().actualizar_equipo(eq_sel)
+                                }
+                                eq_sel.anexar_evento(evento)
+                                ColaEscrituraDiferida.obtener().encolar(eq_sel, evento)
                                 st.cache_data.clear()
-                                if 'db_laboratorios' in st.session_state:
-                                    del st.session_state['db_laboratorios']
                                 st.session_state.trigger = 1
                                 st.rerun()
                                 
                         with col_t2:
                             if st.button("🔧 Confirmar Mantenimiento", key=f"btn_bad_{eq_sel.id_activo}", type="primary", use_container_width=True):
-                                eq_sel.estado = EstadoEquipo.EN_MANTENIMIENTO.name
-                                eq_sel.historial_incidencias.append({
+                                eq_sel = self._editable(eq_sel)
+                                eq_sel.estado = EstadoEquipo.EN_MANTENIMIENTO
+                                evento = {
                                     "fecha": datetime.now().strftime("%Y-%m-%d"),
                                     "detalle": "TRIAJE: Falla confirmada. Pasa a Mantenimiento."
-                                })
-                                EquipoRepository().actualizar_equipo(eq_sel)
+                                }
+                                eq_sel.anexar_evento(evento)
+                                ColaEscrituraDiferida.obtener().encolar(eq_sel, evento)
                                 st.cache_data.clear()
-                                if 'db_laboratorios' in st.session_state:
-                                    del st.session_state['db_laboratorios']
                                 st.session_state.trigger = 1
                                 st.rerun()
 
@@ -396,9 +468,14 @@ class VistaDashboard(Vista):
                 
                     try:
                         predictor = PredictiveService()
-                        fecha_estimada, grafico_fig = predictor.generar_prediccion(eq_sel)
-                        st.warning(f"⚠️ Fecha estimada de fallo crítico: **{fecha_estimada}**")
-                        st.pyplot(grafico_fig) 
+                        prediccion = predictor.calcular_prediccion(eq_sel)
+                        st.warning(f"⚠️ Fecha estimada de fallo crítico: **{prediccion['fecha_falla']}**")
+                        if prediccion["evidencias"]:
+                            st.caption(f"Curva aprendida del historial del activo ({prediccion['evidencias']} evidencias).")
+                        else:
+                            st.caption("Curva teórica de la estrategia (el activo aún no acumula evidencias).")
+                        # PNG cacheado: no se crean figuras nuevas en cada rerun
+                        st.image(predictor.grafico_png(eq_sel, prediccion))
                     except Exception as e:
                         st.error(f"No se pudo generar la predicción: {e}")
                 
@@ -406,7 +483,7 @@ class VistaDashboard(Vista):
                 
                 # --- GENERACIÓN DEL PDF ACTUALIZADO ---
                     try:
-                        imagen_pura = img.getvalue() if (img is not None) else None
+                        imagen_pura = self._evidencia_decodificada(img)
                         pdf_bytes = DashboardUtils.generar_pdf(
                             equipo=eq_sel,
                             lab=getattr(eq_sel, 'ubicacion', 'Laboratorio FIEE'),
@@ -441,15 +518,49 @@ class VistaDashboard(Vista):
         # 3. ZONA DE RECUPERACIÓN
         with tab_recup:
             st.subheader("🛠️ Mantenimiento Correctivo")
-            observados = []
-            if isinstance(st.session_state.db_laboratorios, dict):
-                for lab_n, lista in st.session_state.db_laboratorios.items():
-                    for e in lista:
-                        # Protección: leemos el estado independientemente de si es Enum o String
-                        estado_str = e.estado.name if hasattr(e.estado, 'name') else str(e.estado)
-                        if estado_str == "EN_MANTENIMIENTO":
-                            observados.append((lab_n, e))
+            # Índice por estado: no se recorre todo el inventario
+            inventario = st.session_state.db_laboratorios
+            observados = [(inventario.ubicacion_de(e.id_activo), e)
+                          for e in inventario.por_estado(EstadoEquipo.EN_MANTENIMIENTO.name)]
             
+            with st.expander("📅 Plan semanal de mantenimiento"):
+                # Cupo de técnicos por laboratorio (intervenciones por semana), editable
+                capacidad_guardada = st.session_state.get("capacidad_labs", {})
+                labs = list(inventario)
+                tabla_capacidad = pd.DataFrame({
+                    "Laboratorio": labs,
+                    "Intervenciones/semana": [capacidad_guardada.get(lab, 5) for lab in labs],
+                })
+                capacidad_editada = st.data_editor(
+                    tabla_capacidad, hide_index=True, disabled=["Laboratorio"], key="editor_capacidad",
+                    column_config={"Intervenciones/semana": st.column_config.NumberColumn(min_value=0, step=1)}
+                )
+                horizonte = st.slider("Horizonte (semanas):", min_value=1, max_value=26, value=8)
+
+                # A pedido: proyectar y planificar toda la flota no se repite en cada rerun
+                if st.button("📅 Generar plan", key="btn_plan_mantenimiento"):
+                    capacidad = {lab: int(cupo) for lab, cupo in zip(capacidad_editada["Laboratorio"],
+                                                                     capacidad_editada["Intervenciones/semana"].fillna(0))}
+                    st.session_state.capacidad_labs = capacidad
+                    planificador = PlanificadorMantenimiento(capacidad=capacidad, horizonte_semanas=horizonte)
+                    flota = [e for lab in inventario for e in inventario[lab]]
+                    with st.spinner("Planificando intervenciones..."):
+                        plan = planificador.planificar_flota(flota, PredictiveService())
+                    st.session_state.plan_mantenimiento = (plan, planificador.sin_cupo, InventarioCompartido.obtener().version)
+
+                if st.session_state.get("plan_mantenimiento") is not None:
+                    plan, sin_cupo, version_plan = st.session_state.plan_mantenimiento
+                    if version_plan != InventarioCompartido.obtener().version:
+                        st.caption("El inventario cambió desde que se generó este plan: vuelve a generarlo.")
+                    if plan.empty:
+                        st.info("No hay intervenciones pendientes en el horizonte.")
+                    else:
+                        st.dataframe(plan, width="stretch", hide_index=True)
+                        if sin_cupo:
+                            st.warning(f"{len(sin_cupo)} activos quedan fuera del horizonte por falta de cupo.")
+                        st.download_button("⬇️ Exportar plan (CSV)", plan.to_csv(index=False).encode("utf-8"),
+                                           file_name=f"plan_mantenimiento_{date.today().isoformat()}.csv", mime="text/csv")
+
             if not observados:
                 st.success("✅ Todo el inventario está operativo.")
             else:
@@ -465,30 +576,30 @@ class VistaDashboard(Vista):
                     
                     with col1:
                         if st.form_submit_button("✅ Dar de Alta (Reingreso)"):
-                            eq_rep.estado = EstadoEquipo.OPERATIVO.name
-                            eq_rep.historial_incidencias.append({
+                            eq_rep = self._editable(eq_rep)
+                            eq_rep.estado = EstadoEquipo.OPERATIVO
+                            evento = {
                                 "fecha": datetime.now().strftime("%Y-%m-%d"), 
                                 "detalle": f"REPARACIÓN/ALTA: {informe}"
-                            })
-                            EquipoRepository().actualizar_equipo(eq_rep)
+                            }
+                            eq_rep.anexar_evento(evento)
+                            ColaEscrituraDiferida.obtener().encolar(eq_rep, evento)
                             st.cache_data.clear()
-                            if 'db_laboratorios' in st.session_state:
-                                del st.session_state['db_laboratorios']
                             st.session_state.trigger = 1
                             st.rerun()
                             
                     with col2:
                         if st.form_submit_button("🚨 Dar de Baja (Descarte)"):
+                            eq_rep = self._editable(eq_rep)
                             # CAMBIAMOS EL ESTADO A DADO DE BAJA
-                            eq_rep.estado = "BAJA" 
-                            eq_rep.historial_incidencias.append({
+                            eq_rep.estado = EstadoEquipo.BAJA
+                            evento = {
                                 "fecha": datetime.now().strftime("%Y-%m-%d"), 
                                 "detalle": f"BAJA DEFINITIVA: {informe}"
-                            })
-                            EquipoRepository().actualizar_equipo(eq_rep)
+                            }
+                            eq_rep.anexar_evento(evento)
+                            ColaEscrituraDiferida.obtener().encolar(eq_rep, evento)
                             st.cache_data.clear()
-                            if 'db_laboratorios' in st.session_state:
-                                del st.session_state['db_laboratorios']
                             st.session_state.trigger = 1
                             st.rerun()
 
@@ -560,18 +671,23 @@ class VistaDashboard(Vista):
                         new = EquipoGenerico(nid, m, f_s, extra_in, st.session_state.est_lineal)
                     
                     new.ubicacion = lab_dest
-                    EquipoRepository().guardar_equipo(new)
+                    RepositorioFactory.crear().guardar_equipo(new)
                     st.session_state.trigger = 1
                     st.rerun()
             with tab_bajas:
                 st.subheader("🪦 Cementerio de Equipos (Histórico de Bajas)")
                 st.markdown("Registro permanente de activos retirados por obsolescencia, daño irreparable o descarte.")
             
-                df = DashboardUtils.convertir_objetos_a_df(st.session_state.db_laboratorios, st.session_state.trigger)
+                inventario = st.session_state.db_laboratorios
             
-                if not df.empty:
-                    df_caidos = df[df["Estado"] == "BAJA"].drop(columns=["OBJ_REF"])
+                if inventario.total():
+                    # Solo los activos dados de baja (índice por estado), agrupados por laboratorio
+                    caidos = {}
+                    for eq in inventario.por_estado(EstadoEquipo.BAJA.name):
+                        caidos.setdefault(inventario.ubicacion_de(eq.id_activo), []).append(eq)
+                    df_caidos = DashboardUtils.convertir_objetos_a_df(caidos, st.session_state.trigger)
                     if not df_caidos.empty:
+                        df_caidos = df_caidos.drop(columns=["OBJ_REF"])
                         st.dataframe(df_caidos, width="stretch", hide_index=True)
                         st.error(f"Total de equipos inactivos: {len(df_caidos)}")
                     else:
@@ -1,12 +1,12 @@
 import streamlit as st
-import time
-import os
 import uuid
 from datetime import datetime, timedelta
 from src.views.base_view import Vista
 from src.utils.enums import EstadoEquipo
-from src.repositories.equipo_repository import EquipoRepository
+from src.repositories.repositorio_factory import RepositorioFactory
+from src.database.db import DatabaseConnection
 from src.utils.reporte_builder import ReporteBuilder 
+from src.utils.imagen import decodificar_evidencia
 
 try:
     from src.services.vision_service import VisionService
@@ -20,10 +20,10 @@ class VistaInspeccion(Vista):
 
         # --- CARGA AUTÓNOMA DE DATOS ---
         # Si el estudiante entra directo y la BD no está cargada, la descargamos.
-        if 'db_laboratorios' not in st.session_state or not isinstance(st.session_state.db_laboratorios, dict):
-            from src.views.dashboard import VistaDashboard
-            st.session_state.db_laboratorios = VistaDashboard()._cargar_y_agrupar_desde_supabase()
-            st.session_state.trigger = 0
+        # Se usa la instantánea compartida del proceso (solo se consulta si cambió).
+        from src.views.dashboard import VistaDashboard
+        st.session_state.db_laboratorios = VistaDashboard()._cargar_y_agrupar_desde_supabase()
+        st.session_state.trigger = 0
         # -------------------------------
 
         # 1. SIMULACIÓN DE ESCANEO QR
@@ -32,14 +32,10 @@ class VistaInspeccion(Vista):
         equipo_encontrado = None
         lab_ubicacion = None
 
-        # Buscamos el equipo
-        if qr_input and isinstance(st.session_state.db_laboratorios, dict):
-            for lab, lista_equipos in st.session_state.db_laboratorios.items():
-                for eq in lista_equipos:
-                    if eq.id_activo == qr_input:
-                        equipo_encontrado = eq
-                        lab_ubicacion = lab
-                        break
+        # Buscamos el equipo (búsqueda O(1) por id en el inventario indexado)
+        if qr_input:
+            equipo_encontrado = st.session_state.db_laboratorios.obtener(qr_input)
+            lab_ubicacion = st.session_state.db_laboratorios.ubicacion_de(qr_input)
         
         # 2. SI ENCUENTRA EL EQUIPO -> MUESTRA FICHA TÉCNICA
         if equipo_encontrado:
@@ -84,21 +80,30 @@ class VistaInspeccion(Vista):
                     if not descripcion:
                         st.warning("⚠️ Por favor describe el problema.")
                     else:
+                        # Copia privada del activo: la instantánea compartida no se modifica
+                        equipo_encontrado = VistaDashboard()._editable(equipo_encontrado)
                         foto_final = foto_cam if foto_cam else foto_upl
                         dictamen_ia = "Sin análisis visual."
+                        # Se decodifica una sola vez, ya reducida al tamaño del modelo:
+                        # la misma imagen va a la IA, a la miniatura y al PDF
+                        imagen_evidencia = None
+                        if foto_final:
+                            try:
+                                imagen_evidencia = decodificar_evidencia(foto_final)
+                            except Exception as e:
+                                dictamen_ia = f"Imagen no válida: {e}"
 
                         # --- BLOQUE VISIÓN ---
-                        if foto_final:
-                            with st.spinner("Procesando evidencia..."):
-                                time.sleep(1.5)
-                                temp_filename = "temp_vision.jpg"
-                                with open(temp_filename, "wb") as f: f.write(foto_final.getbuffer())
-                                
+                        if imagen_evidencia is not None:
+                            espera = "Procesando evidencia..." if (VisionService is None or VisionService.esta_listo()) \
+                                else "Procesando evidencia (la IA termina de cargarse)..."
+                            with st.spinner(espera):
                                 try:
                                     if VisionService:
-                                        servicio = VisionService()
+                                        # Modelo compartido del proceso (ya precargado al iniciar el servidor)
+                                        servicio = VisionService.obtener()
                                         # Llamamos a la IA
-                                        resultado = servicio.analizar_estado(foto_final)
+                                        resultado = servicio.analizar_estado(imagen_evidencia)
                                         
                                         # Extraemos los datos de forma segura con .get()
                                         diag = resultado.get('diagnostico', 'Sin diagnóstico')
@@ -115,8 +120,7 @@ class VistaInspeccion(Vista):
                                         elif "ANOMAL" in diagnostico_ia:
                                             equipo_encontrado.estado = EstadoEquipo.EN_MANTENIMIENTO
                                         else:
-                                            equipo_encontrado.estado = "REPORTADO"
-                                        EquipoRepository().actualizar_equipo(equipo_encontrado)
+                                            equipo_encontrado.estado = EstadoEquipo.REPORTADO
                                         st.session_state.trigger = 1
                                             
                                     else:
@@ -124,14 +128,11 @@ class VistaInspeccion(Vista):
                                 
                                 except Exception as e:
                                     dictamen_ia = f"Error en IA: {str(e)}"
-                                finally:
-                                    if os.path.exists(temp_filename): os.remove(temp_filename)
 
                         url_evidencia = ""
                         if foto_final:
                             try:
-                                from supabase import create_client
-                                supabase_cliente = create_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
+                                supabase_cliente = DatabaseConnection.obtener_cliente()
                                     
                                 nombre_archivo = f"{equipo_encontrado.id_activo}_{uuid.uuid4().hex[:6]}.jpg"
                                 bytes_foto = foto_final.getvalue()
@@ -146,22 +147,19 @@ class VistaInspeccion(Vista):
                             except Exception as e:
                                 st.warning(f"⚠️ La foto se analizó pero no se pudo subir a la nube: {e}")
                         detalle_log = f"Reportado por {usuario}: {descripcion}"
-                        equipo_encontrado.registrar_incidencia(detalle_log)
-                            
-                        ultimo_ticket = equipo_encontrado.historial_incidencias[-1]
-                        ultimo_ticket['dictamen_ia'] = dictamen_ia
-                            
+                        datos_ticket_ia = {"dictamen_ia": dictamen_ia}
                         if url_evidencia:
-                            ultimo_ticket['url_foto'] = url_evidencia
+                            datos_ticket_ia['url_foto'] = url_evidencia
+                        ultimo_ticket = equipo_encontrado.registrar_incidencia(detalle_log, **datos_ticket_ia)
 
-                        # --- PERSISTENCIA SUPABASE ---
-                        repo = EquipoRepository()
-                        repo.actualizar_equipo(equipo_encontrado)
+                        # --- PERSISTENCIA SUPABASE (solo el evento nuevo + estado) ---
+                        repo = RepositorioFactory.crear()
+                        repo.agregar_incidencia(equipo_encontrado, ultimo_ticket)
 
                         st.success("✅ Reporte registrado y guardado en la Nube.")
                         st.markdown("### 🤖 Evidencia de la Inspección con IA")
-                        if foto_final:
-                             st.image(foto_final, caption="Imagen analizada por la IA", width=300)
+                        if imagen_evidencia is not None:
+                             st.image(imagen_evidencia, caption="Imagen analizada por la IA", width=300)
                         st.info(f"**Dictamen:** {dictamen_ia}")
                         # --- GENERACIÓN DEL PDF TIPO TICKET ---
                         try:
@@ -178,6 +176,7 @@ class VistaInspeccion(Vista):
                                 "Diagnóstico IA": dictamen_corto
                             }
                             builder.agregar_cuerpo(datos_ticket)
+                            builder.agregar_evidencia(imagen_evidencia)
                             
                             # Mensaje de cierre
                             builder.pdf.set_font("helvetica", "I", 10)
@@ -198,11 +197,9 @@ class VistaInspeccion(Vista):
                             st.error(f"Error al generar el PDF: {e}")
                         # ---------------------------------------------------
                         
-                        # --- LIMPIEZA DE MEMORIA PARA ACTUALIZAR EL DASHBOARD ---
+                        # --- AVISO DE CAMBIOS PARA SINCRONIZAR EL DASHBOARD (DELTA) ---
                         st.session_state.trigger = st.session_state.get('trigger', 0) + 1
                         st.cache_data.clear()
-                        if 'db_laboratorios' in st.session_state:
-                            del st.session_state['db_laboratorios']
                         
         elif qr_input:
             st.error("❌ Código QR no encontrado en la base de datos.")
\ No newline at end of file
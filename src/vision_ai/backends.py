@@ -0,0 +1,95 @@
+import os
+import re
+import tempfile
+import torch
+from transformers import AutoConfig, AutoModelForImageClassification
+
+BACKENDS = ("fp32", "int8", "torchscript")
+CARPETA_TORCHSCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelo")
+
+
+class BackendInferencia:
+    """
+    Modelo de diagnóstico listo para inferir en CPU con una de tres variantes:
+      - fp32:        el checkpoint tal cual (modo eager).
+      - int8:        capas Linear cuantizadas dinámicamente a int8 (pesos int8,
+                     activaciones cuantizadas al vuelo); el resto queda en fp32.
+      - torchscript: grafo trazado y serializado desde el checkpoint fine-tuned,
+                     que se exporta la primera vez y luego solo se carga.
+    Todas exponen logits(pixel_values) con la misma salida que el modelo original.
+    """
+    def __init__(self, nombre, ruta_modelo, ruta_artefacto=None):
+        if nombre not in BACKENDS:
+            raise ValueError(f"Backend de visión desconocido: {nombre} (opciones: {', '.join(BACKENDS)})")
+        self.nombre = nombre
+        config = AutoConfig.from_pretrained(ruta_modelo)
+        self.id2label = config.id2label
+
+        if nombre == "torchscript":
+            ruta_artefacto = ruta_artefacto or preparar_torchscript(ruta_modelo, config)
+            self.modelo = torch.jit.load(ruta_artefacto, map_location="cpu")
+        else:
+            modelo = AutoModelForImageClassification.from_pretrained(ruta_modelo)
+            if nombre == "int8":
+                modelo = torch.ao.quantization.quantize_dynamic(modelo, {torch.nn.Linear}, dtype=torch.qint8)
+            self.modelo = modelo
+        self.modelo.eval()
+
+    def logits(self, pixel_values):
+        with torch.no_grad():
+            salida = self.modelo(pixel_values=pixel_values) if self.nombre != "torchscript" else self.modelo(pixel_values)
+        # El grafo trazado retorna una tupla (logits,); el modelo eager, un ModelOutput
+        return salida[0] if isinstance(salida, tuple) else salida.logits
+
+
+def ruta_torchscript(ruta_modelo, config=None, carpeta=CARPETA_TORCHSCRIPT):
+    """
+    Ruta del artefacto trazado para un checkpoint concreto: depende del id del
+    modelo y de su revisión (commit del Hub o, en una carpeta local, la fecha de
+    sus archivos), así un modelo reentrenado nunca reutiliza un grafo viejo.
+    """
+    if os.path.isdir(ruta_modelo):
+        identificador = os.path.abspath(ruta_modelo)
+        revision = str(int(max(os.path.getmtime(os.path.join(ruta_modelo, archivo))
+                               for archivo in os.listdir(ruta_modelo))))
+    else:
+        identificador = ruta_modelo
+        config = config or AutoConfig.from_pretrained(ruta_modelo)
+        revision = (getattr(config, "_commit_hash", None) or "sin-revision")[:12]
+    nombre = re.sub(r"[^A-Za-z0-9_.-]+", "_", identificador).strip("_")
+    return os.path.join(carpeta, f"{nombre}@{revision}.torchscript.pt")
+
+
+def preparar_torchscript(ruta_modelo, config=None, carpeta=CARPETA_TORCHSCRIPT):
+    """Retorna la ruta del artefacto del checkpoint, exportándolo antes si no existe."""
+    destino = ruta_torchscript(ruta_modelo, config, carpeta)
+    if not os.path.exists(destino):
+        exportar_torchscript(ruta_modelo, destino)
+    return destino
+
+
+def exportar_torchscript(ruta_modelo, destino, tamano=None):
+    """
+    Traza el checkpoint fine-tuned con una entrada de ejemplo y guarda el artefacto.
+    Se escribe a un archivo temporal y se publica con os.replace: quien lo cargue
+    en paralelo ve el archivo completo o no lo ve.
+    """
+    modelo = AutoModelForImageClassification.from_pretrained(ruta_modelo, torchscript=True)
+    modelo.eval()
+    tamano = tamano or modelo.config.image_size
+    ejemplo = torch.zeros(1, modelo.config.num_channels, tamano, tamano)
+    with torch.no_grad():
+        trazado = torch.jit.trace(modelo, (ejemplo,))
+    trazado = torch.jit.freeze(trazado)
+
+    carpeta = os.path.dirname(destino) or "."
+    os.makedirs(carpeta, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(suffix=".tmp", dir=carpeta)
+    os.close(descriptor)
+    try:
+        trazado.save(temporal)
+        os.replace(temporal, destino)
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return destino
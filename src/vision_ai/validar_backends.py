@@ -0,0 +1,110 @@
+import os
+import math
+import argparse
+import time
+import torch
+import torch.nn.functional as F
+from PIL import Image
+from transformers import AutoImageProcessor
+from src.vision_ai.backends import BACKENDS, BackendInferencia
+
+class ValidadorBackends:
+    """
+    Compara los backends de inferencia (fp32, int8, torchscript) contra el modelo
+    actual sobre una carpeta de validación con el mismo formato que el dataset de
+    entrenamiento: una subcarpeta por clase (dataset/test/<etiqueta>/*.jpg).
+    Mide exactitud, acuerdo top-1 con fp32, diferencia máxima de probabilidades y
+    latencia, y recomienda el backend más rápido que queda dentro de la tolerancia.
+    """
+    EXTENSIONES = (".jpg", ".jpeg", ".png")
+
+    def __init__(self, carpeta, ruta_modelo="NahilSisai/vit-mantenimiento-fiee", tamano_lote=8, hilos=None):
+        self.carpeta = carpeta
+        self.ruta_modelo = ruta_modelo
+        self.tamano_lote = tamano_lote
+        if hilos:
+            torch.set_num_threads(hilos)
+        self.processor = AutoImageProcessor.from_pretrained(ruta_modelo)
+
+    def _cargar_carpeta(self, label2id):
+        """Retorna (pixel_values, etiquetas) de todas las imágenes de la carpeta."""
+        imagenes, etiquetas = [], []
+        for clase in sorted(os.listdir(self.carpeta)):
+            ruta_clase = os.path.join(self.carpeta, clase)
+            if not os.path.isdir(ruta_clase):
+                continue
+            for archivo in sorted(os.listdir(ruta_clase)):
+                if archivo.lower().endswith(self.EXTENSIONES):
+                    imagenes.append(Image.open(os.path.join(ruta_clase, archivo)).convert("RGB"))
+                    etiquetas.append(label2id.get(clase.lower(), -1))
+        if not imagenes:
+            raise ValueError(f"No se encontraron imágenes en {self.carpeta}")
+        return self.processor(images=imagenes, return_tensors="pt")["pixel_values"], torch.tensor(etiquetas)
+
+    def _inferir(self, backend, pixeles):
+        """Probabilidades de todo el conjunto y milisegundos por imagen."""
+        backend.logits(pixeles[:1])  # calentamiento, fuera de la medición
+        probabilidades = []
+        inicio = time.perf_counter()
+        for i in range(0, len(pixeles), self.tamano_lote):
+            probabilidades.append(F.softmax(backend.logits(pixeles[i:i + self.tamano_lote]), dim=-1))
+        ms = (time.perf_counter() - inicio) * 1000 / len(pixeles)
+        return torch.cat(probabilidades), ms
+
+    @staticmethod
+    def _exactitud(predichas, etiquetas):
+        """Exactitud sobre las imágenes cuya carpeta coincide con una etiqueta del modelo."""
+        con_etiqueta = etiquetas >= 0
+        if not con_etiqueta.any():
+            return float("nan")
+        return (predichas[con_etiqueta] == etiquetas[con_etiqueta]).float().mean().item()
+
+    def ejecutar(self, backends=BACKENDS, tolerancia=0.01):
+        """
+        Evalúa cada backend. 'tolerancia' es la pérdida máxima admitida de exactitud
+        (y de acuerdo top-1 con fp32). Retorna (resultados, backend recomendado).
+        """
+        referencia = BackendInferencia("fp32", self.ruta_modelo)
+        label2id = {etiqueta.lower(): i for i, etiqueta in referencia.id2label.items()}
+        pixeles, etiquetas = self._cargar_carpeta(label2id)
+        prob_ref, _ = self._inferir(referencia, pixeles)
+
+        exactitud_ref = self._exactitud(prob_ref.argmax(-1), etiquetas)
+
+        resultados = []
+        for nombre in backends:
+            backend = referencia if nombre == "fp32" else BackendInferencia(nombre, self.ruta_modelo)
+            probabilidades, ms = self._inferir(backend, pixeles)
+            predichas = probabilidades.argmax(-1)
+            resultados.append({
+                "backend": nombre,
+                "exactitud": self._exactitud(predichas, etiquetas),
+                "acuerdo_fp32": (predichas == prob_ref.argmax(-1)).float().mean().item(),
+                "max_dif_prob": (probabilidades - prob_ref).abs().max().item(),
+                "ms_por_imagen": ms,
+            })
+
+        aceptables = [r for r in resultados if r["acuerdo_fp32"] >= 1 - tolerancia
+                      and (math.isnan(exactitud_ref) or r["exactitud"] >= exactitud_ref - tolerancia)]
+        recomendado = min(aceptables, key=lambda r: r["ms_por_imagen"])["backend"] if aceptables else "fp32"
+        return resultados, recomendado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida los backends de inferencia del ViT de diagnóstico.")
+    parser.add_argument("carpeta", help="Carpeta de validación (una subcarpeta por clase)")
+    parser.add_argument("--modelo", default="NahilSisai/vit-mantenimiento-fiee")
+    parser.add_argument("--tolerancia", type=float, default=0.01)
+    parser.add_argument("--lote", type=int, default=8)
+    parser.add_argument("--hilos", type=int, default=None)
+    args = parser.parse_args()
+
+    validador = ValidadorBackends(args.carpeta, args.modelo, args.lote, args.hilos)
+    resultados, recomendado = validador.ejecutar(tolerancia=args.tolerancia)
+
+    print(f"{'Backend':<12} {'Exactitud':>10} {'Acuerdo':>9} {'Máx Δp':>8} {'ms/img':>8}")
+    for r in resultados:
+        print(f"{r['backend']:<12} {r['exactitud']:>10.3f} {r['acuerdo_fp32']:>9.3f} "
+              f"{r['max_dif_prob']:>8.4f} {r['ms_por_imagen']:>8.1f}")
+    print(f"\nBackend recomendado (tolerancia {args.tolerancia:.3f}): {recomendado}")
+    print(f"Configure FIEE_VISION_BACKEND=\"{recomendado}\" en el .env")
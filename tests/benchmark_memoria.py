@@ -0,0 +1,66 @@
+"""
+Memoria por activo del inventario compartido: objetos Equipo tal como los deja
+EquipoMapper (con historial perezoso, como en la instantánea) y el índice
+InventarioIndex completo.
+
+    python tests/benchmark_memoria.py [activos]
+
+No forma parte de la suite (pytest solo recoge test_*.py).
+"""
+import sys
+import os
+import gc
+import json
+import tracemalloc
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.utils.mapper import EquipoMapper
+from src.utils.inventario_index import InventarioIndex
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+
+LABORATORIOS = ("Laboratorio de Control", "Laboratorio de Circuitos", "Laboratorio de Máquinas", "Laboratorio FIEE")
+TIPOS = (
+    ("MotorInduccion", {"hp": "15HP", "voltaje": "440V", "rpm": 3600}),
+    ("Osciloscopio", {"ancho_banda": "100MHz"}),
+    ("Multimetro", {"precision": "1%", "es_digital": True}),
+)
+
+
+def generar_filas(n):
+    """Filas como JSON crudo; al decodificarlas cada texto es un objeto propio, como desde la base."""
+    filas = []
+    for i in range(n):
+        tipo, detalles = TIPOS[i % 3]
+        filas.append({
+            "id_activo": f"EQ-{i:06d}", "modelo": f"Modelo {i % 40}", "tipo_equipo": tipo,
+            "fecha_compra": f"{2010 + i % 15}-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "ubicacion": LABORATORIOS[i % 4], "estado": "OPERATIVO",
+            "estrategia_nombre": "DesgasteLineal", "detalles_tecnicos": detalles,
+            "modelo_desgaste": None, "updated_at": "2026-01-01T00:00:00+00:00",
+        })
+    return json.dumps(filas)
+
+
+def bytes_por_activo(construir, n):
+    """Memoria retenida por el resultado, contando los textos que conserva de las filas."""
+    crudo = generar_filas(n)
+    gc.collect()
+    tracemalloc.start()
+    filas = json.loads(crudo)
+    resultado = construir(filas)
+    del filas
+    gc.collect()
+    usados = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return usados / n
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    mapper = EquipoMapper(DesgasteLineal(), DesgasteExponencial(), cargador_historial=lambda *_: [])
+    objetos = bytes_por_activo(lambda filas: mapper.mapear_lista(filas), n)
+    indice = bytes_por_activo(lambda filas: InventarioIndex(mapper.mapear_flujo(filas)), n)
+    print(f"{n} activos | objetos: {objetos:.0f} B/activo | instantánea indexada: {indice:.0f} B/activo")
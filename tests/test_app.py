@@ -11,16 +11,13 @@ from app import ServicioAutenticacion
 
 class TestServicioAutenticacion(unittest.TestCase):
 
-    @patch('streamlit.secrets')
-    @patch('app.create_client')
-    def setUp(self, mock_create_client, mock_secrets):
+    @patch('streamlit.session_state', new_callable=dict)
+    @patch('app.DatabaseConnection.crear_cliente_sesion')
+    def setUp(self, mock_crear_cliente, mock_session):
         """Configuración inicial para cada test simulando Supabase."""
-        # Simulamos los secretos de Streamlit
-        mock_secrets.__getitem__.side_effect = lambda key: "test_value"
-        
         # Simulamos el cliente de Supabase y su auth
         self.mock_supabase = MagicMock()
-        mock_create_client.return_value = self.mock_supabase
+        mock_crear_cliente.return_value = self.mock_supabase
         
         # Instanciamos el servicio (usará los mocks)
         self.auth_service = ServicioAutenticacion()
@@ -58,5 +55,18 @@ class TestServicioAutenticacion(unittest.TestCase):
         self.assertFalse(resultado)
         mock_st_error.assert_called()
 
+    @patch('streamlit.error')
+    @patch('app.DatabaseConnection.crear_cliente_sesion', return_value=None)
+    def test_sin_cliente_no_colapsa(self, mock_crear_cliente, mock_st_error):
+        """Sin credenciales de Supabase no hay cliente: el login avisa y el cierre limpia igual."""
+        with patch('streamlit.session_state', {}) as mock_session:
+            servicio = ServicioAutenticacion()
+            self.assertFalse(servicio.autenticar("correo@uni.pe", "123456"))
+            mock_st_error.assert_called()
+
+            mock_session["autenticado"] = True
+            servicio.cerrar_sesion()
+            self.assertFalse(mock_session["autenticado"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+try:
+    import torch
+    from transformers import ViTConfig, ViTForImageClassification
+    from src.vision_ai.backends import BackendInferencia, preparar_torchscript, ruta_torchscript
+except ImportError:
+    torch = None
+
+
+@unittest.skipIf(torch is None, "PyTorch no está instalado")
+class TestBackendInferencia(unittest.TestCase):
+    """Variantes de CPU sobre un ViT diminuto guardado en disco (sin red)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temporal = tempfile.TemporaryDirectory()
+        cls.ruta_modelo = os.path.join(cls.temporal.name, "vit")
+        cls.carpeta = os.path.join(cls.temporal.name, "artefactos")
+        torch.manual_seed(0)
+        config = ViTConfig(image_size=32, patch_size=16, hidden_size=32, num_hidden_layers=1,
+                           num_attention_heads=2, intermediate_size=37,
+                           id2label={0: "normal", 1: "quemado"}, label2id={"normal": 0, "quemado": 1})
+        ViTForImageClassification(config).save_pretrained(cls.ruta_modelo)
+        cls.pixeles = torch.randn(2, 3, 32, 32)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temporal.cleanup()
+
+    def test_backend_desconocido(self):
+        with self.assertRaisesRegex(ValueError, "Backend de visión desconocido"):
+            BackendInferencia("fp16", self.ruta_modelo)
+
+    def test_torchscript_reproduce_los_logits_de_fp32(self):
+        referencia = BackendInferencia("fp32", self.ruta_modelo)
+        artefacto = preparar_torchscript(self.ruta_modelo, carpeta=self.carpeta)
+        trazado = BackendInferencia("torchscript", self.ruta_modelo, ruta_artefacto=artefacto)
+
+        self.assertEqual(referencia.id2label, {0: "normal", 1: "quemado"})
+        torch.testing.assert_close(trazado.logits(self.pixeles), referencia.logits(self.pixeles),
+                                   rtol=1e-4, atol=1e-4)
+        # Escritura atómica: no quedan temporales junto al artefacto
+        self.assertEqual(os.listdir(self.carpeta), [os.path.basename(artefacto)])
+
+    def test_int8_conserva_la_forma_de_salida(self):
+        referencia = BackendInferencia("fp32", self.ruta_modelo).logits(self.pixeles)
+        cuantizado = BackendInferencia("int8", self.ruta_modelo).logits(self.pixeles)
+        self.assertEqual(cuantizado.shape, referencia.shape)
+        self.assertLess((cuantizado - referencia).abs().max().item(), 0.5)
+
+    def test_artefacto_depende_del_checkpoint(self):
+        otro = os.path.join(self.temporal.name, "vit_reentrenado")
+        ViTForImageClassification.from_pretrained(self.ruta_modelo).save_pretrained(otro)
+        self.assertNotEqual(ruta_torchscript(self.ruta_modelo, carpeta=self.carpeta),
+                            ruta_torchscript(otro, carpeta=self.carpeta))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import threading
+from concurrent.futures import Future
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.services.cola_inferencia import ColaInferencia
+
+
+class TestColaInferencia(unittest.TestCase):
+    """Micro-batching: solicitudes concurrentes comparten una sola pasada por lote."""
+
+    def test_agrupa_solicitudes_concurrentes(self):
+        lotes = []
+        ocupado, liberar = threading.Event(), threading.Event()
+
+        def procesar(items):
+            lotes.append(list(items))
+            ocupado.set()
+            liberar.wait(timeout=2)
+            return [item * 10 for item in items]
+
+        cola = ColaInferencia(procesar, max_lote=4, espera_ms=50)
+        # La primera solicitud ocupa el hilo; las seis siguientes esperan en la cola
+        primero = cola.enviar(0)
+        ocupado.wait(timeout=2)
+        futuros = [cola.enviar(i) for i in range(1, 7)]
+        liberar.set()
+
+        self.assertEqual(primero.result(timeout=2), 0)
+        self.assertEqual([f.result(timeout=2) for f in futuros], [10, 20, 30, 40, 50, 60])
+        self.assertEqual([len(l) for l in lotes], [1, 4, 2])
+        self.assertEqual(cola.items_procesados, 7)
+
+    def test_lotes_asincronos(self):
+        """Si procesar_lote retorna un Future, el hilo no espera y reparte al resolverse."""
+        pendientes, llegada = [], threading.Semaphore(0)
+
+        def procesar(items):
+            futuro = Future()
+            pendientes.append((futuro, items))
+            llegada.release()
+            return futuro
+
+        cola = ColaInferencia(procesar, espera_ms=1)
+        a = cola.enviar("a")
+        self.assertTrue(llegada.acquire(timeout=2))
+        b = cola.enviar("b")
+        self.assertTrue(llegada.acquire(timeout=2))
+        # Dos lotes en vuelo a la vez; se resuelven en orden inverso
+        for futuro, items in reversed(pendientes):
+            futuro.set_result([item.upper() for item in items])
+
+        self.assertEqual((a.result(timeout=2), b.result(timeout=2)), ("A", "B"))
+
+    def test_error_del_lote_llega_a_cada_solicitud(self):
+        def procesar(items):
+            raise RuntimeError("modelo no disponible")
+
+        cola = ColaInferencia(procesar, espera_ms=1)
+        with self.assertRaisesRegex(RuntimeError, "modelo no disponible"):
+            cola.procesar("img", timeout=2)
+
+    def test_lote_incompleto_no_deja_solicitudes_colgadas(self):
+        ocupado, liberar = threading.Event(), threading.Event()
+
+        def procesar(items):
+            ocupado.set()
+            liberar.wait(timeout=2)
+            return [item for item in items][:1]
+
+        cola = ColaInferencia(procesar, max_lote=4, espera_ms=50)
+        primero = cola.enviar("a")
+        ocupado.wait(timeout=2)
+        futuros = [cola.enviar(i) for i in "bcd"]
+        liberar.set()
+
+        self.assertEqual(primero.result(timeout=2), "a")
+        for futuro in futuros:
+            with self.assertRaisesRegex(RuntimeError, "1 resultados para 3"):
+                futuro.result(timeout=2)
+
+    def test_error_al_repartir_no_detiene_el_hilo(self):
+        """Un fallo fuera de procesar_lote llega a las solicitudes y la cola sigue atendiendo"""
+        cola = ColaInferencia(lambda items: None, espera_ms=1)
+        with self.assertRaises(TypeError):
+            cola.procesar("img", timeout=2)
+
+        cola._procesar_lote = lambda items: [item.upper() for item in items]
+        self.assertEqual(cola.procesar("img", timeout=2), "IMG")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.services.cola_persistencia import ColaEscrituraDiferida
+from src.models.concretos import Osciloscopio
+from src.logical.estrategias import DesgasteLineal
+from src.utils.enums import EstadoEquipo
+
+
+class TestColaEscrituraDiferida(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MagicMock()
+        self.repo.agregar_incidencias_lote.return_value = True
+        # Intervalo largo: el hilo no interfiere y la prueba vacía la cola a mano
+        self.cola = ColaEscrituraDiferida(lambda: self.repo, intervalo=30, reintentos=2)
+        self.osc = Osciloscopio("OSC-01", "Tektronix", "2022-08-15", "50MHz", DesgasteLineal())
+
+    def tearDown(self):
+        self.cola.detener()
+
+    def test_fusiona_actualizaciones_del_mismo_activo(self):
+        """Tres clics sobre el mismo equipo terminan en una sola escritura"""
+        self.cola.encolar(self.osc, {"detalle": "Reporte"})
+        self.osc.estado = EstadoEquipo.EN_MANTENIMIENTO
+        self.cola.encolar(self.osc, {"detalle": "Falla confirmada"})
+        self.cola.encolar(self.osc)
+
+        self.assertEqual(self.cola.pendientes, 1)
+        self.cola.vaciar()
+
+        self.repo.agregar_incidencias_lote.assert_called_once_with(
+            [(self.osc, [{"detalle": "Reporte"}, {"detalle": "Falla confirmada"}])])
+        self.assertEqual(self.cola.pendientes, 0)
+
+    def test_lote_viaja_en_una_sola_llamada(self):
+        """Varios activos (con y sin eventos) se persisten con una única escritura"""
+        otro = Osciloscopio("OSC-02", "Rigol", "2023-01-10", "100MHz", DesgasteLineal())
+        self.cola.encolar(self.osc)
+        self.cola.encolar(otro, {"detalle": "Reporte"})
+        self.cola.vaciar()
+
+        self.repo.agregar_incidencias_lote.assert_called_once_with([(self.osc, []), (otro, [{"detalle": "Reporte"}])])
+
+    def test_ids_en_vuelo_siguen_pendientes(self):
+        """Mientras el lote se escribe, la sesión sigue viendo su versión local"""
+        vistos = []
+        self.repo.agregar_incidencias_lote.side_effect = lambda cambios: vistos.append(self.cola.ids_pendientes()) or True
+        self.cola.encolar(self.osc, {"detalle": "Reporte"})
+        self.cola.vaciar()
+
+        self.assertEqual(vistos, [{"OSC-01"}])
+        self.assertEqual(self.cola.ids_pendientes(), set())
+
+    def test_fallos_agotan_reintentos(self):
+        self.repo.agregar_incidencias_lote.return_value = False
+        self.cola.encolar(self.osc, {"detalle": "Reporte"})
+
+        self.cola.vaciar()
+        self.assertEqual(self.cola.pendientes, 1)
+        self.cola.vaciar()
+
+        self.assertEqual(self.cola.pendientes, 0)
+        self.assertEqual(self.cola.fallidos, 1)
+        self.assertEqual(self.cola.obtener_fallidos()[0]["eventos"], [{"detalle": "Reporte"}])
+        # La versión local se conserva mientras no llegue al servidor
+        self.assertIs(self.cola.obtener_fallidos()[0]["equipo"], self.osc)
+        self.assertEqual(self.cola.ids_pendientes(), {"OSC-01"})
+
+    def test_reintentar_fallidos(self):
+        self.repo.agregar_incidencias_lote.return_value = False
+        self.cola.encolar(self.osc, {"detalle": "Reporte"})
+        self.cola.vaciar()
+        self.cola.vaciar()
+        self.assertEqual(self.cola.fallidos, 1)
+
+        self.repo.agregar_incidencias_lote.return_value = True
+        self.assertEqual(self.cola.reintentar_fallidos(), 1)
+        self.cola.vaciar()
+
+        self.assertEqual(self.cola.fallidos, 0)
+        self.assertEqual(self.cola.ids_pendientes(), set())
+        self.repo.agregar_incidencias_lote.assert_called_with([(self.osc, [{"detalle": "Reporte"}])])
+
+    def test_estado_como_texto_se_normaliza(self):
+        self.osc.estado = "REPORTADO"
+        self.cola.encolar(self.osc)
+        self.assertIs(self.osc.estado, EstadoEquipo.REPORTADO)
+
+
+if __name__ == '__main__':
+    unittest.main()
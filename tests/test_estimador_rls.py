@@ -0,0 +1,77 @@
+import unittest
+import tempfile
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.logical.estimador_rls import EstimadorRLS
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.models.concretos import MotorInduccion
+from src.repositories.sqlite_equipo_repository import SqliteEquipoRepository
+from src.services.predictive_service import PredictiveService
+from src.utils.mapper import EquipoMapper
+
+
+class TestEstimadorRLS(unittest.TestCase):
+    """Modelo de degradación por activo aprendido del historial real."""
+
+    def setUp(self):
+        self.estrategia = DesgasteLineal()
+        fecha_compra = (datetime.now() - timedelta(days=730)).strftime("%Y-%m-%d")
+        self.motor = MotorInduccion("MOT-RLS", "WEG W22", fecha_compra, "10HP", "440V", 3600, self.estrategia)
+
+    def test_prior_equivale_a_la_recta_teorica(self):
+        """Sin evidencias, el estimador reproduce el ajuste cerrado de PredictiveService."""
+        estimador = EstimadorRLS.con_prior(730, 0.4)
+        pendiente, intercepto, dias = PredictiveService._ajustar_rectas([730], [0.4])
+
+        self.assertEqual(estimador.n, 0)
+        self.assertAlmostEqual(estimador.pendiente_diaria, pendiente[0], places=6)
+        self.assertAlmostEqual(estimador.intercepto, intercepto[0], places=3)
+        self.assertAlmostEqual(estimador.dias_para_falla(), dias[0], delta=5)
+
+    def test_falla_confirmada_adelanta_la_prediccion(self):
+        servicio = PredictiveService()
+        teorica = servicio.calcular_prediccion(self.motor)
+
+        self.motor.registrar_incidencia("Falla confirmada en bobinado")
+        aprendida = servicio.calcular_prediccion(self.motor)
+
+        self.assertEqual(self.motor.modelo_desgaste.n, 1)
+        self.assertEqual((teorica["evidencias"], aprendida["evidencias"]), (0, 1))
+        self.assertLess(aprendida["dias_para_falla"], teorica["dias_para_falla"])
+
+    def test_eventos_sin_senal_no_crean_modelo(self):
+        self.motor.registrar_incidencia("Cambio de ubicación")
+        self.assertIsNone(self.motor.modelo_desgaste)
+
+    def test_copia_al_escribir(self):
+        """Un estimador compartido entre sesiones nunca se modifica en su lugar."""
+        self.motor.registrar_incidencia("Falla confirmada")
+        compartido = self.motor.modelo_desgaste
+        antes = compartido.to_dict()
+
+        self.motor.registrar_incidencia("Reporte de vibración")
+
+        self.assertIsNot(self.motor.modelo_desgaste, compartido)
+        self.assertEqual(compartido.to_dict(), antes)
+        self.assertEqual(self.motor.modelo_desgaste.n, 2)
+
+    def test_persistencia_sqlite_y_mapper(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            repo = SqliteEquipoRepository(os.path.join(directorio, "rls.db"))
+            repo.guardar_equipos([self.motor])
+            evento = self.motor.registrar_incidencia("Falla confirmada")
+            repo.agregar_incidencia(self.motor, evento)
+
+            mapper = EquipoMapper(self.estrategia, DesgasteExponencial())
+            leido = mapper.mapear_lista(repo.leer_todos())[0]
+
+        self.assertEqual(leido.modelo_desgaste.to_dict(), self.motor.modelo_desgaste.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import numpy as np
+from datetime import date
+from unittest.mock import patch
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.models.equipo import Equipo
+from src.models.concretos import Osciloscopio
+from src.utils.enums import EstadoEquipo
+from src.utils.reloj import RelojFijo
+
+
+class TestCalculoVectorizado(unittest.TestCase):
+
+    def setUp(self):
+        self.fechas = [f"{anio}-06-15" for anio in range(1990, 2031)]
+
+    def test_lote_coincide_con_calculo_escalar(self):
+        for estrategia in (DesgasteLineal(), DesgasteExponencial()):
+            esperado = [estrategia.calcular(f) for f in self.fechas]
+            obtenido = estrategia.calcular_lote(np.array(self.fechas, dtype="datetime64[D]"))
+            np.testing.assert_allclose(obtenido, esperado)
+
+    def test_fecha_invalida_no_rompe_el_lote(self):
+        """Las filas que NumPy no interpreta se resuelven con el cálculo escalar"""
+        est = DesgasteLineal(reloj=RelojFijo(date(2026, 1, 1)))
+        obtenido = est.calcular_lote(["2022-08-15", "2020-02-30", "sin fecha"])
+
+        np.testing.assert_allclose(obtenido[:2], [est.calcular("2022-08-15"), est.calcular("2020-02-30")])
+        self.assertTrue(np.isnan(obtenido[2]))
+
+    def test_reglas_de_estado_en_bloque(self):
+        est = DesgasteLineal()
+        equipos = [Osciloscopio(f"OSC-{i}", "Tektronix", f, "50MHz", est) for i, f in enumerate(self.fechas[:4])]
+        equipos[1].estado = EstadoEquipo.BAJA
+        equipos[2].estado = "REPORTADO_CON_FALLA"
+        equipos[3].estrategia_desgaste = None
+
+        obtenido = Equipo.calcular_obsolescencia_lote(equipos)
+
+        np.testing.assert_allclose(obtenido, [e.calcular_obsolescencia() for e in equipos])
+        self.assertEqual(obtenido[1], 1.0)
+        self.assertEqual(obtenido[2], 0.98)
+
+
+class TestObsolescenciaMemorizada(unittest.TestCase):
+
+    def setUp(self):
+        self.reloj = RelojFijo(date(2026, 12, 31))
+        self.estrategia = DesgasteLineal(reloj=self.reloj)
+        self.osc = Osciloscopio("OSC-1", "Tektronix", "2022-08-15", "50MHz", self.estrategia)
+
+    def test_reloj_inyectado_hace_el_calculo_determinista(self):
+        self.assertEqual(self.osc.calcular_obsolescencia(), 0.2)
+        self.reloj.avanzar(1)
+        self.assertEqual(self.osc.calcular_obsolescencia(), 0.25)
+
+    def test_memoriza_hasta_que_cambia_una_entrada(self):
+        with patch.object(self.estrategia, 'calcular', wraps=self.estrategia.calcular) as calcular:
+            for _ in range(5):
+                self.osc.calcular_obsolescencia()
+            self.assertEqual(calcular.call_count, 1)
+
+            self.osc.estado = EstadoEquipo.FALLA
+            self.assertEqual(self.osc.calcular_obsolescencia(), 0.98)
+            self.reloj.avanzar(1)
+            self.osc.calcular_obsolescencia()
+            self.assertEqual(calcular.call_count, 3)
+
+        self.osc.cambiar_estrategia(DesgasteExponencial(reloj=self.reloj))
+        self.osc.estado = EstadoEquipo.OPERATIVO
+        self.assertEqual(self.osc.calcular_obsolescencia(), DesgasteExponencial().calcular("2022-08-15", date(2027, 1, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import tempfile
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.models.historial import HistorialPerezoso
+from src.repositories.sqlite_equipo_repository import SqliteEquipoRepository
+from src.services.sincronizacion_service import SincronizadorInventario
+from src.models.concretos import MotorInduccion
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.utils.mapper import EquipoMapper
+
+
+class TestHistorialPerezoso(unittest.TestCase):
+
+    def setUp(self):
+        self.eventos = [{"detalle": f"Evento {i}"} for i in range(5)]
+        self.cargador = MagicMock(side_effect=lambda id_activo, desde, limite: self.eventos[desde:desde + limite])
+        self.historial = HistorialPerezoso("MOT-01", self.cargador, tamano_pagina=2)
+
+    def test_no_descarga_hasta_que_se_lee(self):
+        self.historial.append({"detalle": "Nuevo"})
+        copia = self.historial.copy()
+        self.cargador.assert_not_called()
+
+        self.assertEqual([e["detalle"] for e in copia][-2:], ["Evento 4", "Nuevo"])
+        self.assertEqual(self.cargador.call_count, 3)
+
+    def test_lectura_por_paginas(self):
+        self.assertEqual(self.historial[1]["detalle"], "Evento 1")
+        self.assertEqual(self.cargador.call_count, 1)
+        self.assertTrue(self.historial)
+        self.assertFalse(self.historial.cargado)
+
+        self.assertEqual(len(self.historial), 5)
+        self.assertTrue(self.historial.cargado)
+
+    def test_evento_ya_persistido_no_se_duplica(self):
+        """Una copia con un evento agregado no lo repite cuando la página ya lo trae"""
+        evento = {"fecha": "2026-03-01", "detalle": "Falla confirmada"}
+        copia = self.historial.copy()
+        copia.append(evento)
+        # La escritura diferida llegó al servidor antes de que se abriera el historial
+        self.eventos.append(dict(evento, dictamen_ia="OK"))
+
+        self.assertEqual(len(copia), 6)
+        self.assertEqual(list(copia)[-1]["dictamen_ia"], "OK")
+
+    def test_evento_identico_sin_persistir_se_conserva(self):
+        """Un segundo evento igual del mismo día no se confunde con uno ya guardado"""
+        previo = {"fecha": "2026-03-01", "detalle": "Falla confirmada"}
+        self.eventos.append(dict(previo, id_evento="persistido-antes"))
+        copia = self.historial.copy()
+        copia.append(dict(previo))
+
+        self.assertEqual(len(copia), 7)
+        self.assertEqual([e["detalle"] for e in copia][-2:], ["Falla confirmada"] * 2)
+
+    def test_fallo_de_carga_se_reintenta(self):
+        self.cargador.side_effect = [None, self.eventos[:2], self.eventos[2:4], self.eventos[4:]]
+        self.assertEqual([e for e in self.historial], [])
+        self.assertEqual([e for e in self.historial], self.eventos)
+
+
+class TestCargaResumida(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_tmp = tempfile.TemporaryDirectory()
+        self.repo = SqliteEquipoRepository(os.path.join(self.dir_tmp.name, "fiee_test.db"))
+        motor = MotorInduccion("MOT-01", "WEG W22", "2021-03-10", "10HP", "440V", 3600, DesgasteLineal())
+        motor.ubicacion = "Laboratorio de Máquinas"
+        motor.historial_incidencias.extend({"detalle": f"Evento {i}"} for i in range(3))
+        self.repo.guardar_equipos([motor])
+
+    def tearDown(self):
+        self.dir_tmp.cleanup()
+
+    def test_inventario_sin_historial_hasta_abrir_detalle(self):
+        self.repo.leer_historial = MagicMock(wraps=self.repo.leer_historial)
+        mapper = EquipoMapper(DesgasteLineal(), DesgasteExponencial(), self.repo.leer_historial)
+        inventario = SincronizadorInventario(self.repo, mapper).carga_completa()
+
+        motor = inventario.obtener("MOT-01")
+        self.assertIsInstance(motor.historial_incidencias, HistorialPerezoso)
+        self.repo.leer_historial.assert_not_called()
+
+        self.assertEqual([e["detalle"] for e in motor.historial_incidencias], ["Evento 0", "Evento 1", "Evento 2"])
+        self.repo.leer_historial.assert_called_once_with("MOT-01", 0, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+import io
+from PIL import Image
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.utils.imagen import decodificar_evidencia, LADO_MODELO
+from src.utils.reporte_builder import ReporteBuilder
+
+
+def _foto(formato, tamano=(4000, 3000)):
+    buffer = io.BytesIO()
+    Image.new("RGB", tamano, (200, 60, 20)).save(buffer, format=formato)
+    return buffer.getvalue()
+
+
+class ArchivoSubido(io.BytesIO):
+    """Imita el UploadedFile de Streamlit (un BytesIO con getvalue)."""
+
+
+class TestDecodificarEvidencia(unittest.TestCase):
+    """Una sola decodificación en memoria, ya reducida al tamaño del modelo."""
+
+    def test_jpeg_grande_se_reduce_al_decodificar(self):
+        imagen = decodificar_evidencia(ArchivoSubido(_foto("JPEG")))
+        self.assertEqual(imagen.mode, "RGB")
+        self.assertGreaterEqual(min(imagen.size), LADO_MODELO)
+        self.assertLess(min(imagen.size), 2 * LADO_MODELO)
+        # Se conserva la proporción de la foto original
+        self.assertAlmostEqual(imagen.width / imagen.height, 4 / 3, places=1)
+
+    def test_png_se_reduce_por_factor_entero(self):
+        imagen = decodificar_evidencia(_foto("PNG", (1000, 1000)))
+        self.assertEqual(imagen.size, (250, 250))
+
+    def test_imagen_pequena_e_imagen_decodificada_no_cambian(self):
+        pequena = decodificar_evidencia(_foto("PNG", (100, 80)))
+        self.assertEqual(pequena.size, (100, 80))
+        self.assertIs(decodificar_evidencia(pequena), pequena)
+
+    def test_pdf_incrusta_la_imagen_decodificada(self):
+        imagen = decodificar_evidencia(_foto("JPEG"))
+        sin_foto = ReporteBuilder().agregar_titulo("T").compilar_pdf()
+        con_foto = ReporteBuilder().agregar_titulo("T").agregar_evidencia(imagen).compilar_pdf()
+        self.assertIn(b"/Subtype /Image", bytes(con_foto))
+        self.assertNotIn(b"/Subtype /Image", bytes(sin_foto))
+
+
+if __name__ == '__main__':
+    unittest.main()
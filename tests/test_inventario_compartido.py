@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.services.inventario_compartido import InventarioCompartido, VistaInventarioSesion
+from src.repositories.equipo_repository import EquipoRepository, ErrorLecturaInventario
+from src.utils.enums import EstadoEquipo
+
+
+def fila(id_activo, estado="OPERATIVO", updated_at="2026-01-01T10:00:00+00:00"):
+    return {
+        "id_activo": id_activo, "modelo": "Tektronix", "tipo_equipo": "Osciloscopio",
+        "fecha_compra": "2022-08-15", "ubicacion": "Laboratorio de Circuitos", "estado": estado,
+        "estrategia_nombre": "DesgasteLineal", "detalles_tecnicos": {"ancho_banda": "50MHz"},
+        "historial_incidencias": [], "updated_at": updated_at
+    }
+
+
+class TestInventarioCompartido(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MagicMock()
+        self.repo.leer_paginado.side_effect = lambda **_: iter([fila("OSC-1"), fila("OSC-2")])
+        self.repo.leer_cambios_desde.return_value = []
+        self.compartido = InventarioCompartido(lambda: self.repo, ttl=3600)
+
+    def test_sesiones_comparten_la_misma_instantanea(self):
+        """Dos sesiones leen los mismos objetos con una sola descarga"""
+        labs_a = VistaInventarioSesion().actualizar(self.compartido)
+        labs_b = VistaInventarioSesion().actualizar(self.compartido)
+
+        self.assertEqual(self.repo.leer_paginado.call_count, 1)
+        self.assertIs(labs_a["Laboratorio de Circuitos"], labs_b["Laboratorio de Circuitos"])
+
+    def test_edicion_de_una_sesion_no_afecta_a_otra(self):
+        sesion_a, sesion_b = VistaInventarioSesion(), VistaInventarioSesion()
+        labs_a = sesion_a.actualizar(self.compartido)
+        labs_b = sesion_b.actualizar(self.compartido)
+
+        original = labs_a["Laboratorio de Circuitos"][0]
+        copia = sesion_a.editable(original)
+        copia.estado = EstadoEquipo.FALLA
+        copia.registrar_incidencia("Pantalla sin señal")
+
+        self.assertIs(labs_a["Laboratorio de Circuitos"][0], copia)
+        self.assertIs(labs_b["Laboratorio de Circuitos"][0], original)
+        self.assertEqual(original.estado, EstadoEquipo.OPERATIVO)
+        self.assertEqual(original.historial_incidencias, [])
+
+    def test_escritura_incrementa_version_y_aplica_delta(self):
+        sesion = VistaInventarioSesion()
+        sesion.actualizar(self.compartido)
+        version_inicial = self.compartido.version
+
+        self.repo.leer_cambios_desde.return_value = [fila("OSC-2", "EN_MANTENIMIENTO", "2026-01-02T10:00:00+00:00")]
+        EquipoRepository._marcar_escritura()
+        labs = sesion.actualizar(self.compartido)
+
+        self.assertEqual(self.compartido.version, version_inicial + 1)
+        self.assertEqual(self.repo.leer_paginado.call_count, 1)
+        self.assertEqual(labs["Laboratorio de Circuitos"][1].estado, EstadoEquipo.EN_MANTENIMIENTO)
+
+    def test_capa_pendiente_sobrevive_al_refresco(self):
+        sesion = VistaInventarioSesion()
+        labs = sesion.actualizar(self.compartido)
+        copia = sesion.editable(labs["Laboratorio de Circuitos"][0])
+
+        EquipoRepository._marcar_escritura()
+        labs = sesion.actualizar(self.compartido, ids_pendientes={"OSC-1"})
+
+        self.assertIs(labs["Laboratorio de Circuitos"][0], copia)
+
+    def test_refresco_fallido_conserva_la_instantanea(self):
+        sesion = VistaInventarioSesion()
+        sesion.actualizar(self.compartido)
+        version, marca = self.compartido.version, self.compartido._sincronizador.marca
+
+        def lectura_cortada(**_):
+            yield fila("OSC-1", updated_at="2026-03-01T10:00:00+00:00")
+            raise ErrorLecturaInventario("Lectura del inventario interrumpida tras 1 filas")
+
+        self.repo.leer_cambios_desde.return_value = None
+        self.repo.leer_paginado.side_effect = lectura_cortada
+        EquipoRepository._marcar_escritura()
+        labs = sesion.actualizar(self.compartido)
+
+        self.assertEqual(self.compartido.version, version)
+        self.assertEqual(len(labs["Laboratorio de Circuitos"]), 2)
+        self.assertIn("interrumpida", self.compartido.error_carga)
+        # La marca de agua no avanza con las filas de la lectura cortada
+        self.assertEqual(self.compartido._sincronizador.marca, marca)
+
+
+if __name__ == '__main__':
+    unittest.main()
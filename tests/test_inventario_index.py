@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.utils.inventario_index import InventarioIndex
+from src.models.concretos import Osciloscopio, Multimetro
+from src.logical.estrategias import DesgasteLineal
+from src.utils.enums import EstadoEquipo
+
+
+class TestInventarioIndex(unittest.TestCase):
+
+    def setUp(self):
+        est = DesgasteLineal()
+        self.osc = Osciloscopio("OSC-01", "Tektronix", "2022-08-15", "50MHz", est)
+        self.osc.ubicacion = "Laboratorio de Circuitos"
+        self.mult = Multimetro("MU-01", "Fluke", "2024-01-20", "1%", True, est)
+        self.mult.ubicacion = "Laboratorio de Control"
+        self.index = InventarioIndex([self.osc, self.mult], laboratorios_base=["Laboratorio de Máquinas"])
+
+    def test_busqueda_por_id_y_ubicacion(self):
+        self.assertIs(self.index.obtener("MU-01"), self.mult)
+        self.assertEqual(self.index.ubicacion_de("OSC-01"), "Laboratorio de Circuitos")
+        self.assertIsNone(self.index.obtener("NO-EXISTE"))
+        self.assertEqual(self.index.por_tipo("Osciloscopio"), [self.osc])
+
+    def test_se_comporta_como_diccionario_de_laboratorios(self):
+        self.assertEqual(self.index["Laboratorio de Máquinas"], [])
+        self.assertEqual(self.index["Laboratorio de Control"], [self.mult])
+        self.assertEqual(len(self.index), 3)
+
+    def test_reindexar_mueve_de_estado(self):
+        self.osc.estado = EstadoEquipo.EN_MANTENIMIENTO
+        self.index.reindexar(self.osc)
+
+        self.assertEqual(self.index.por_estado("EN_MANTENIMIENTO"), [self.osc])
+        self.assertEqual(self.index.por_estado("OPERATIVO"), [self.mult])
+
+    def test_copia_es_independiente(self):
+        copia = self.index.copiar()
+        copia.quitar("MU-01")
+
+        self.assertIsNone(copia.obtener("MU-01"))
+        self.assertEqual(copia["Laboratorio de Control"], [])
+        self.assertIs(self.index.obtener("MU-01"), self.mult)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import json
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.utils.mapper import EquipoMapper
+from src.equipo_factory import EquipoFactory
+from src.models.concretos import MotorInduccion, Multimetro
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.utils.enums import EstadoEquipo
+
+
+def fila(id_activo, tipo, detalles, **extra):
+    datos = {
+        "id_activo": id_activo, "modelo": "Modelo X", "tipo_equipo": tipo,
+        "fecha_compra": "2021-03-10", "ubicacion": "Laboratorio de Máquinas", "estado": "FALLA",
+        "estrategia_nombre": "DesgasteExponencial", "detalles_tecnicos": detalles,
+        "historial_incidencias": [{"detalle": "Ruido"}]
+    }
+    datos.update(extra)
+    return datos
+
+
+class TestEquipoMapper(unittest.TestCase):
+
+    def setUp(self):
+        self.lineal, self.expo = DesgasteLineal(), DesgasteExponencial()
+        self.mapper = EquipoMapper(self.lineal, self.expo)
+
+    def test_decodificador_equivale_al_constructor(self):
+        """El constructor de la fábrica deja el objeto igual que __init__"""
+        motor = self.mapper.mapear_lista([fila("MOT-1", "MotorInduccion", {"hp": "15HP", "voltaje": "440V", "rpm": 3600})])[0]
+        esperado = MotorInduccion("MOT-1", "Modelo X", "2021-03-10", "15HP", "440V", 3600, self.expo)
+        esperado.ubicacion = "Laboratorio de Máquinas"
+        esperado.estado = EstadoEquipo.FALLA
+        esperado.historial_incidencias = [{"detalle": "Ruido"}]
+
+        self.assertIs(type(motor), MotorInduccion)
+        for clase in MotorInduccion.__mro__:
+            for atributo in clase.__dict__.get("__slots__", ()):
+                self.assertEqual(getattr(motor, atributo, None), getattr(esperado, atributo, None), atributo)
+
+        multimetro = self.mapper.mapear_lista([fila("MU-1", "Multimetro", {})])[0]
+        self.assertIsInstance(multimetro, Multimetro)
+        self.assertTrue(multimetro.es_digital)
+
+    def test_reporte_de_errores_sin_interrumpir(self):
+        filas = [
+            fila("OSC-1", "Osciloscopio", {"ancho_banda": "50MHz"}, estado="DESCONOCIDO"),
+            fila("XXX-1", "Teletransportador", {}),
+            {"id_activo": "MU-2", "tipo_equipo": "Multimetro"},
+        ]
+        equipos = self.mapper.mapear_lista(filas)
+
+        self.assertEqual([e.id_activo for e in equipos], ["OSC-1"])
+        self.assertEqual(equipos[0].estado, EstadoEquipo.OPERATIVO)
+        self.assertEqual([e["id_activo"] for e in self.mapper.errores], ["XXX-1", "MU-2"])
+        self.assertIn("KeyError", self.mapper.errores[1]["error"])
+
+    def test_valida_fecha_y_tipos_de_detalle(self):
+        filas = [
+            fila("OSC-2", "Osciloscopio", {"ancho_banda": "50MHz"}, fecha_compra="2020-02-30"),
+            fila("MOT-2", "MotorInduccion", {"hp": "15HP", "voltaje": "440V", "rpm": "rápido"}),
+            fila("MU-3", "Multimetro", {"precision": "1%", "es_digital": "sí"}),
+            fila("OSC-3", "Osciloscopio", {"ancho_banda": "50MHz"}, fecha_compra="2020-02-28T10:00:00"),
+        ]
+        equipos = self.mapper.mapear_lista(filas)
+
+        self.assertEqual([e.id_activo for e in equipos], ["OSC-3"])
+        errores = {e["id_activo"]: e["error"] for e in self.mapper.errores}
+        self.assertTrue(errores["OSC-2"].startswith("ValueError"))
+        self.assertIn("rpm", errores["MOT-2"])
+        self.assertIn("es_digital", errores["MU-3"])
+
+    def test_textos_repetidos_se_comparten(self):
+        """Modelo, fecha y ubicación iguales en distintas filas quedan en un solo objeto"""
+        filas = json.loads(json.dumps([fila("OSC-6", "Osciloscopio", {}), fila("OSC-7", "Osciloscopio", {})]))
+        a, b = self.mapper.mapear_lista(filas)
+        self.assertIs(a.modelo, b.modelo)
+        self.assertIs(a.fecha_compra, b.fecha_compra)
+        self.assertIs(a.ubicacion, b.ubicacion)
+
+    def test_sin_modelo_de_desgaste_no_decodifica_rls(self):
+        con_modelo = {"theta": [0.0, 0.1], "P": [1.0, 0.0, 0.0, 1.0], "n": 3}
+        sin, con = self.mapper.mapear_lista([
+            fila("OSC-4", "Osciloscopio", {}, modelo_desgaste=None),
+            fila("OSC-5", "Osciloscopio", {}, modelo_desgaste=con_modelo),
+        ])
+        self.assertIsNone(sin.modelo_desgaste)
+        self.assertEqual(con.modelo_desgaste.n, 3)
+
+    def test_tipo_registrado_usa_su_constructor(self):
+        EquipoFactory.registrar_tipo("MotorEspecial", lambda item, det, est: MotorInduccion(
+            item["id_activo"], item["modelo"], item["fecha_compra"], "1HP", "220V", 900, est))
+        try:
+            motor = self.mapper.mapear_lista([fila("MOT-9", "MotorEspecial", {})])[0]
+            self.assertEqual(motor.rpm, 900)
+            self.assertEqual((motor.ubicacion, motor.estado), ("Laboratorio de Máquinas", EstadoEquipo.FALLA))
+        finally:
+            EquipoFactory._constructores.pop("MotorEspecial")
+
+
+if __name__ == '__main__':
+    unittest.main()
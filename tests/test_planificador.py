@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+from datetime import date
+import pandas as pd
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.services.planificador_mantenimiento import PlanificadorMantenimiento
+
+
+class TestPlanificadorMantenimiento(unittest.TestCase):
+    """Plan semanal con cupos por laboratorio sobre las fallas previstas."""
+
+    def setUp(self):
+        # Miércoles: el plan arranca el lunes 2025-03-03
+        self.hoy = date(2025, 3, 5)
+        self.prediccion = pd.DataFrame({
+            "ID": ["A", "B", "C", "D", "E", "F"],
+            "Modelo": ["m"] * 6,
+            "Ubicación": ["Lab 1", "Lab 1", "Lab 1", "Lab 1", "Lab 2", "Lab 1"],
+            "Desgaste": [0.5, 0.98, 0.6, 0.2, 0.9, 1.0],
+            "Fecha falla": pd.to_datetime(["2025-03-20", "2025-04-01", "2025-03-08", "2027-01-01", "2025-03-06", "2025-03-01"]),
+        })
+        self.estados = {"A": "OPERATIVO", "B": "FALLA", "C": "OPERATIVO", "D": "OPERATIVO",
+                        "E": "EN_MANTENIMIENTO", "F": "BAJA"}
+
+    def test_prioriza_urgencia_y_respeta_cupos(self):
+        planificador = PlanificadorMantenimiento(capacidad={"Lab 1": 1}, horizonte_semanas=4)
+        plan = planificador.planificar(self.prediccion, self.estados, hoy=self.hoy)
+
+        semanas = dict(zip(plan["ID"], plan["Semana"]))
+        # B en falla va primero; luego C y A por fecha de falla; D (2027) y F (baja) no se planifican.
+        # C fallaría el sábado de la semana 0, pero el único cupo de esa semana es de B
+        self.assertEqual(semanas, {"B": date(2025, 3, 3), "C": date(2025, 3, 10),
+                                   "A": date(2025, 3, 17), "E": date(2025, 3, 3)})
+        self.assertEqual(plan.groupby(["Semana", "Ubicación"]).size().max(), 1)
+        self.assertEqual(plan.loc[plan["Atrasado"], "ID"].tolist(), ["C"])
+        self.assertEqual(planificador.sin_cupo, [])
+
+    def test_activos_sin_cupo_en_el_horizonte(self):
+        planificador = PlanificadorMantenimiento(capacidad_defecto=1, horizonte_semanas=1)
+        plan = planificador.planificar(self.prediccion, self.estados, hoy=self.hoy)
+
+        self.assertEqual(sorted(plan["ID"]), ["B", "E"])
+        self.assertEqual(sorted(planificador.sin_cupo), ["A", "C"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.services.pool_vision import PoolVision
+
+
+def _cargador_falso():
+    """Modelo de prueba (se ejecuta en cada worker): suma los píxeles de cada imagen."""
+    pid = os.getpid()
+    return lambda pixeles: [(f"worker-{pid}", float(imagen.sum())) for imagen in pixeles]
+
+
+class TestPoolVision(unittest.TestCase):
+    """Inferencia fuera de proceso con transferencia por memoria compartida."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = PoolVision(_cargador_falso, procesos=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.cerrar()
+
+    def test_inferencia_sincrona_en_otro_proceso(self):
+        lote = np.ones((2, 3, 224, 224), dtype=np.float32)
+        resultado = self.pool.inferir(lote, timeout=60)
+
+        self.assertEqual([confianza for _, confianza in resultado], [3 * 224 * 224] * 2)
+        self.assertNotEqual(resultado[0][0], f"worker-{os.getpid()}")
+
+    def test_envios_asincronos(self):
+        futuros = [self.pool.enviar(np.full((1, 3, 8, 8), i, dtype=np.float32)) for i in range(6)]
+        self.assertEqual([f.result(timeout=60)[0][1] for f in futuros], [192.0 * i for i in range(6)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import matplotlib.pyplot as plt
 
 # Ajuste de ruta
@@ -9,7 +9,8 @@ sys.path.append(os.getcwd())
 
 from src.services.predictive_service import PredictiveService
 from src.models.concretos import MotorInduccion
-from src.logical.estrategias import DesgasteLineal
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.utils.reloj import RelojFijo
 
 class TestPredictiveService(unittest.TestCase):
     def setUp(self):
@@ -40,5 +41,44 @@ class TestPredictiveService(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.service.generar_prediccion(self.motor)
 
+    def test_predecir_flota_coincide_y_ordena(self):
+        """La proyección vectorizada da las mismas fechas que la individual, ordenadas"""
+        nuevo = MotorInduccion("TEST-02", "Motor Nuevo", datetime.now().strftime("%Y-%m-%d"), "5HP", "220V", 1800, DesgasteExponencial())
+        viejo = MotorInduccion("TEST-03", "Motor Viejo", "2010-01-01", "5HP", "220V", 1800, self.estrategia)
+        roto = MotorInduccion("TEST-04", "Motor Roto", "fecha-corrupta", "5HP", "220V", 1800, self.estrategia)
+
+        ranking = self.service.predecir_flota([self.motor, nuevo, roto, viejo])
+
+        self.assertEqual(list(ranking["ID"])[-1], "TEST-04")
+        fechas = ranking["Fecha falla"].dropna()
+        self.assertTrue(fechas.is_monotonic_increasing)
+        for equipo in (self.motor, nuevo, viejo):
+            esperado, _ = self.service.generar_prediccion(equipo)
+            obtenido = ranking.set_index("ID").loc[equipo.id_activo, "Fecha falla"]
+            self.assertEqual(obtenido.strftime("%Y-%m-%d"), esperado)
+        plt.close("all")
+
+
+    def test_prediccion_usa_el_reloj_de_la_estrategia(self):
+        """Días de uso y desgaste se calculan con la misma fecha: la del reloj inyectado"""
+        reloj = RelojFijo(date(2030, 1, 1))
+        motor = MotorInduccion("TEST-05", "Motor Reloj", "2029-01-01", "5HP", "220V", 1800, DesgasteLineal(reloj=reloj))
+
+        prediccion = self.service.calcular_prediccion(motor)
+        self.assertEqual(prediccion["dias_uso"], 365)
+        reloj.avanzar(10)
+        self.assertEqual(self.service.calcular_prediccion(motor)["dias_uso"], 375)
+
+    def test_grafico_png_cacheado_sin_figuras_abiertas(self):
+        """El PNG se dibuja una vez por (activo, desgaste, día) y no deja figuras en pyplot"""
+        plt.close("all")
+        png = self.service.grafico_png(self.motor)
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        self.assertIs(self.service.grafico_png(self.motor), png)
+
+        self.service.generar_prediccion(self.motor)
+        self.assertEqual(plt.get_fignums(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.repositories.equipo_repository import EquipoRepository, ErrorLecturaInventario, COLUMNAS_RESUMEN
+from src.models.concretos import Multimetro
+from src.logical.estrategias import DesgasteLineal
+
+
+class TestLecturaPaginada(unittest.TestCase):
+    """Pruebas del recorrido por páginas (keyset sobre id_activo) sin red real."""
+
+    def setUp(self):
+        self.filas = [{"id_activo": f"EQ-{i:03d}", "modelo": "M"} for i in range(7)]
+        self.repo = EquipoRepository.__new__(EquipoRepository)
+        self.repo.client = MagicMock()
+        self.consultas = []
+
+        def leer_pagina(columnas, ultimo_id, tamano_pagina):
+            self.consultas.append((columnas, ultimo_id))
+            restantes = [f for f in self.filas if ultimo_id is None or f["id_activo"] > ultimo_id]
+            return restantes[:tamano_pagina]
+
+        self.repo._leer_pagina = leer_pagina
+
+    def test_recorre_todas_las_paginas_en_orden(self):
+        """El generador entrega todas las filas y avanza con el último id de cada página"""
+        ids = [f["id_activo"] for f in self.repo.leer_paginado(tamano_pagina=3)]
+
+        self.assertEqual(ids, [f["id_activo"] for f in self.filas])
+        self.assertEqual([c[1] for c in self.consultas], [None, "EQ-002", "EQ-005"])
+
+    def test_proyeccion_incluye_siempre_id_activo(self):
+        """Aunque el llamador no lo pida, la clave del keyset viaja en la proyección"""
+        list(self.repo.leer_paginado(columnas=("modelo", "estado"), tamano_pagina=10))
+
+        self.assertEqual(self.consultas[0][0], "id_activo,modelo,estado")
+
+    def test_columnas_resumen_excluyen_historial(self):
+        self.assertNotIn("historial_incidencias", COLUMNAS_RESUMEN)
+
+    def test_pagina_fallida_interrumpe_la_lectura(self):
+        """Una página caída no deja un inventario parcial con apariencia de completo"""
+        leer_pagina = self.repo._leer_pagina
+
+        def falla_en_la_segunda(columnas, ultimo_id, tamano_pagina):
+            if ultimo_id is not None:
+                raise ConnectionError("timeout")
+            return leer_pagina(columnas, ultimo_id, tamano_pagina)
+
+        self.repo._leer_pagina = falla_en_la_segunda
+        with self.assertRaisesRegex(ErrorLecturaInventario, "tras 3 filas"):
+            list(self.repo.leer_paginado(tamano_pagina=3))
+
+    def test_sin_cliente_no_produce_filas(self):
+        self.repo.client = None
+        self.assertEqual(self.repo.leer_todos(), [])
+
+
+class TestGuardadoMasivo(unittest.TestCase):
+    """Pruebas del upsert por lotes con reintentos y reporte de fallas por fila."""
+
+    def setUp(self):
+        self.repo = EquipoRepository.__new__(EquipoRepository)
+        self.repo.client = MagicMock()
+        self.upsert = self.repo.client.table.return_value.upsert
+        estrategia = DesgasteLineal()
+        self.equipos = [Multimetro(f"MU-{i}", "Fluke", "2024-01-01", "1%", True, estrategia) for i in range(5)]
+
+    def test_agrupa_en_lotes(self):
+        """5 equipos con chunk_size=2 deben viajar en 3 peticiones"""
+        resultado = self.repo.guardar_equipos(self.equipos, chunk_size=2)
+
+        self.assertEqual(self.upsert.call_count, 3)
+        self.assertEqual(resultado["guardados"], 5)
+        self.assertEqual(resultado["fallidos"], [])
+        self.assertEqual(self.upsert.call_args.kwargs["on_conflict"], "id_activo")
+
+    @patch('src.repositories.equipo_repository.time.sleep')
+    def test_lote_fallido_se_aisla_por_fila(self, mock_sleep):
+        """Si el lote nunca entra, se reintenta fila por fila y se reporta solo la defectuosa"""
+        def upsert(filas, on_conflict):
+            if isinstance(filas, list) or filas["id_activo"] == "MU-3":
+                raise Exception("rechazado")
+            return MagicMock()
+        self.upsert.side_effect = upsert
+
+        resultado = self.repo.guardar_equipos(self.equipos, chunk_size=10, reintentos=2)
+
+        self.assertEqual(resultado["guardados"], 4)
+        self.assertEqual([f["id_activo"] for f in resultado["fallidos"]], ["MU-3"])
+        self.assertEqual(mock_sleep.call_count, 1)
+
+
+class TestIncidenciasSoloAnexar(unittest.TestCase):
+    """La escritura de una incidencia envía solo el evento nuevo, no el historial."""
+
+    def setUp(self):
+        self.repo = EquipoRepository.__new__(EquipoRepository)
+        self.repo.client = MagicMock()
+        self.equipo = Multimetro("MU-9", "Fluke", "2024-01-01", "1%", True, DesgasteLineal())
+        for i in range(300):
+            self.equipo.registrar_incidencia(f"Evento antiguo {i}")
+
+    def test_agregar_incidencia_envia_un_evento(self):
+        self.equipo.estado = "REPORTADO"
+        evento = self.equipo.registrar_incidencia("Pantalla parpadea", dictamen_ia="IA: OK")
+
+        self.repo.agregar_incidencia(self.equipo, evento)
+
+        nombre, parametros = self.repo.client.rpc.call_args.args
+        self.assertEqual(nombre, "agregar_incidencia")
+        self.assertEqual(parametros["p_evento"], evento)
+        self.assertEqual(parametros["p_estado"], "REPORTADO")
+        self.assertEqual(parametros["p_estrategia"], "DesgasteLineal")
+        self.assertNotIn("historial_incidencias", str(parametros.keys()))
+
+    def test_actualizar_estado_no_reenvia_historial(self):
+        self.repo.actualizar_estado(self.equipo)
+
+        datos = self.repo.client.table.return_value.update.call_args.args[0]
+        self.assertEqual(set(datos), {"estado", "estrategia_nombre"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+from datetime import date, timedelta
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.logical.estrategias import DesgasteLineal
+from src.logical.weibull import ParametrosWeibull
+from src.models.concretos import Multimetro
+from src.services.predictive_service import PredictiveService
+from src.services.simulacion_riesgo import SimuladorRiesgo
+from src.utils.enums import EstadoEquipo
+
+
+class TestSimuladorRiesgo(unittest.TestCase):
+    """Bandas Monte Carlo de fallas y costo por laboratorio."""
+
+    def setUp(self):
+        self.hoy = date(2025, 1, 1)
+        estrategia = DesgasteLineal()
+        self.flota = []
+        for i in range(40):
+            compra = self.hoy - timedelta(days=200 * (i + 1))
+            equipo = Multimetro(f"MU-{i:02d}", "Fluke 87V", compra.isoformat(), "0.05%", True, estrategia)
+            equipo.ubicacion = "Lab A" if i % 2 else "Lab B"
+            self.flota.append(equipo)
+        self.flota[0].estado = EstadoEquipo.FALLA
+        self.flota[1].estado = EstadoEquipo.BAJA
+
+    def test_reproducible_y_monotono(self):
+        simulador = SimuladorRiesgo(PredictiveService(), procesos=0, tareas=3, elementos_por_bloque=100)
+        a = simulador.simular(self.flota, simulaciones=300, semilla=11, hoy=self.hoy)
+        b = simulador.simular(self.flota, simulaciones=300, semilla=11, hoy=self.hoy)
+
+        self.assertTrue(a.equals(b))
+        self.assertEqual(sorted(a["Laboratorio"].unique()), ["Lab A", "Lab B"])
+        for _, grupo in a.groupby("Laboratorio"):
+            # Acumulado por año: nunca decrece, y las bandas están ordenadas
+            self.assertTrue(grupo["Fallas (media)"].is_monotonic_increasing)
+            self.assertTrue((grupo["Fallas P5"] <= grupo["Fallas P50"]).all())
+            self.assertTrue((grupo["Fallas P50"] <= grupo["Fallas P95"]).all())
+        # MU-00 está en falla (se repone el primer año) y MU-01 dado de baja no cuenta
+        lab_b = a[(a["Laboratorio"] == "Lab B") & (a["Años"] == 1)].iloc[0]
+        lab_a_max = a[a["Laboratorio"] == "Lab A"]["Fallas P95"].max()
+        self.assertGreaterEqual(lab_b["Fallas P5"], 1)
+        self.assertLessEqual(lab_a_max, 19)
+
+    def test_mismo_resultado_en_pool_de_procesos(self):
+        local = SimuladorRiesgo(PredictiveService(), procesos=0, tareas=4)
+        pool = SimuladorRiesgo(PredictiveService(), procesos=2, tareas=4)
+        self.assertTrue(local.simular(self.flota, 200, semilla=5, hoy=self.hoy)
+                        .equals(pool.simular(self.flota, 200, semilla=5, hoy=self.hoy)))
+
+    def test_usa_curva_weibull_del_tipo(self):
+        parametros = ParametrosWeibull({"Multimetro": (3.0, 1.0)})
+        simulador = SimuladorRiesgo(PredictiveService(), parametros, procesos=0, horizonte_anios=1)
+        resultado = simulador.simular(self.flota, simulaciones=200, semilla=1, hoy=self.hoy)
+
+        # Con λ = 1 año y activos de varios años, prácticamente toda la flota falla en el año
+        self.assertEqual(resultado["Fallas P50"].sum(), 39)
+        self.assertAlmostEqual(resultado["Costo (media)"].sum(), 39 * 450.0, delta=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
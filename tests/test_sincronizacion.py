@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.services.sincronizacion_service import SincronizadorInventario
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.utils.mapper import EquipoMapper
+from src.utils.enums import EstadoEquipo
+
+
+def fila(id_activo, ubicacion, estado, updated_at):
+    return {
+        "id_activo": id_activo, "modelo": "Fluke 87V", "tipo_equipo": "Multimetro",
+        "fecha_compra": "2024-01-20", "ubicacion": ubicacion, "estado": estado,
+        "estrategia_nombre": "DesgasteLineal", "detalles_tecnicos": {"precision": "1%"},
+        "historial_incidencias": [], "updated_at": updated_at
+    }
+
+
+class TestSincronizacionIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = MagicMock()
+        self.repo.leer_paginado.return_value = iter([
+            fila("MU-1", "Laboratorio de Control", "OPERATIVO", "2026-01-01T10:00:00+00:00"),
+            fila("MU-2", "Laboratorio de Control", "OPERATIVO", "2026-01-02T10:00:00+00:00"),
+        ])
+        mapper = EquipoMapper(DesgasteLineal(), DesgasteExponencial())
+        self.sync = SincronizadorInventario(self.repo, mapper)
+        self.labs = self.sync.carga_completa()
+
+    def test_carga_completa_fija_marca_de_agua(self):
+        self.assertEqual(self.sync.marca, "2026-01-02T10:00:00+00:00")
+        self.assertEqual(len(self.labs["Laboratorio de Control"]), 2)
+
+    def test_delta_parcha_en_sitio(self):
+        """Un cambio de estado reemplaza solo ese activo y avanza la marca"""
+        self.repo.leer_cambios_desde.return_value = [
+            fila("MU-2", "Laboratorio de Control", "EN_MANTENIMIENTO", "2026-01-03T08:00:00+00:00")
+        ]
+
+        self.assertTrue(self.sync.sincronizar(self.labs))
+
+        # Se relee la ventana de solape anterior a la marca
+        self.repo.leer_cambios_desde.assert_called_with("2026-01-02T09:59:30.000000+00:00",
+                                                     limite=SincronizadorInventario.LIMITE_DELTA,
+                                                     columnas=SincronizadorInventario.COLUMNAS)
+        self.assertEqual([e.id_activo for e in self.labs["Laboratorio de Control"]], ["MU-1", "MU-2"])
+        self.assertEqual(self.labs.obtener("MU-2").estado, EstadoEquipo.EN_MANTENIMIENTO)
+        self.assertEqual([e.id_activo for e in self.labs.por_estado("EN_MANTENIMIENTO")], ["MU-2"])
+        self.assertEqual(self.sync.marca, "2026-01-03T08:00:00+00:00")
+
+    def test_solape_recupera_commits_tardios_sin_reaplicar(self):
+        """Una fila confirmada tarde con marca menor entra; las ya aplicadas se descartan"""
+        aplicada = fila("MU-2", "Laboratorio de Control", "EN_MANTENIMIENTO", "2026-01-03T08:00:00+00:00")
+        self.repo.leer_cambios_desde.return_value = [aplicada]
+        self.sync.sincronizar(self.labs)
+        version_aplicada = self.labs.obtener("MU-2")
+
+        tardia = fila("MU-1", "Laboratorio de Control", "FALLA", "2026-01-03T07:59:58+00:00")
+        self.repo.leer_cambios_desde.return_value = [tardia, dict(aplicada)]
+        self.assertTrue(self.sync.sincronizar(self.labs))
+
+        self.assertEqual(self.labs.obtener("MU-1").estado, EstadoEquipo.FALLA)
+        self.assertIs(self.labs.obtener("MU-2"), version_aplicada)
+        self.assertEqual(self.sync.marca, "2026-01-03T08:00:00+00:00")
+
+    def test_errores_de_la_carga_sobreviven_a_los_deltas(self):
+        """Un delta sin errores no borra el reporte de la carga completa"""
+        invalida = fila("MU-3", "Laboratorio de Control", "OPERATIVO", "2026-01-01T11:00:00+00:00")
+        del invalida["modelo"]
+        self.repo.leer_paginado.return_value = iter([invalida])
+        self.labs = self.sync.carga_completa()
+        self.assertEqual([e["id_activo"] for e in self.sync.errores], ["MU-3"])
+
+        self.repo.leer_cambios_desde.return_value = [
+            fila("MU-2", "Laboratorio de Control", "OPERATIVO", "2026-01-03T08:00:00+00:00")
+        ]
+        self.sync.sincronizar(self.labs)
+        self.assertEqual([e["id_activo"] for e in self.sync.errores], ["MU-3"])
+
+        # La fila corregida deja de figurar en el reporte
+        self.repo.leer_cambios_desde.return_value = [
+            fila("MU-3", "Laboratorio de Control", "OPERATIVO", "2026-01-04T08:00:00+00:00")
+        ]
+        self.sync.sincronizar(self.labs)
+        self.assertEqual(self.sync.errores, [])
+
+    def test_delta_mueve_de_laboratorio(self):
+        self.repo.leer_cambios_desde.return_value = [
+            fila("MU-1", "Laboratorio de Máquinas", "OPERATIVO", "2026-01-03T08:00:00+00:00")
+        ]
+        self.sync.sincronizar(self.labs)
+
+        self.assertEqual([e.id_activo for e in self.labs["Laboratorio de Control"]], ["MU-2"])
+        self.assertEqual([e.id_activo for e in self.labs["Laboratorio de Máquinas"]], ["MU-1"])
+
+    def test_sin_delta_disponible_pide_recarga(self):
+        self.repo.leer_cambios_desde.return_value = None
+        self.assertFalse(self.sync.sincronizar(self.labs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import time
+import sys
+import os
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.repositories.sqlite_equipo_repository import SqliteEquipoRepository
+from src.models.concretos import MotorInduccion, Multimetro
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial
+from src.utils.mapper import EquipoMapper
+from src.utils.enums import EstadoEquipo
+
+
+class TestSqliteEquipoRepository(unittest.TestCase):
+    """El backend local debe cumplir el mismo contrato que el repositorio Supabase."""
+
+    def setUp(self):
+        self.dir_tmp = tempfile.TemporaryDirectory()
+        self.repo = SqliteEquipoRepository(os.path.join(self.dir_tmp.name, "fiee_test.db"))
+        self.estrategia = DesgasteLineal()
+        self.mapper = EquipoMapper(self.estrategia, DesgasteExponencial())
+
+        self.motor = MotorInduccion("MOT-01", "WEG W22", "2021-03-10", "10HP", "440V", 3600, self.estrategia)
+        self.motor.ubicacion = "Laboratorio de Máquinas"
+        self.motor.historial_incidencias.append({"fecha": "2024-02-01", "detalle": "Ruido en rodamientos"})
+        multimetros = [Multimetro(f"MU-{i:02d}", "Fluke 87V", "2024-01-20", "0.05%", True, self.estrategia) for i in range(9)]
+        self.resultado = self.repo.guardar_equipos([self.motor] + multimetros, chunk_size=4)
+
+    def tearDown(self):
+        self.dir_tmp.cleanup()
+
+    def test_guardado_masivo_y_lectura_mapeable(self):
+        self.assertEqual(self.resultado, {"guardados": 10, "fallidos": []})
+
+        equipos = {e.id_activo: e for e in self.mapper.mapear_lista(self.repo.leer_todos())}
+
+        self.assertEqual(len(equipos), 10)
+        motor = equipos["MOT-01"]
+        self.assertIsInstance(motor, MotorInduccion)
+        self.assertEqual((motor.hp, motor.rpm), ("10HP", 3600))
+        self.assertEqual(motor.ubicacion, "Laboratorio de Máquinas")
+        self.assertEqual(motor.historial_incidencias[0]["detalle"], "Ruido en rodamientos")
+
+    def test_paginado_con_proyeccion(self):
+        filas = list(self.repo.leer_paginado(columnas=("modelo", "estado"), tamano_pagina=3))
+
+        self.assertEqual([f["id_activo"] for f in filas], sorted(f["id_activo"] for f in filas))
+        self.assertEqual(set(filas[0]), {"id_activo", "modelo", "estado"})
+
+    def test_incidencia_anexada_aparece_en_delta(self):
+        marca = max(f["updated_at"] for f in self.repo.leer_todos())
+        time.sleep(0.01)  # updated_at tiene resolución de milisegundos
+
+        self.motor.estado = EstadoEquipo.EN_MANTENIMIENTO
+        evento = self.motor.registrar_incidencia("Falla confirmada")
+        self.repo.agregar_incidencia(self.motor, evento)
+
+        # La marca es inclusiva: también vuelven las filas escritas en ese mismo milisegundo
+        cambios = self.repo.leer_cambios_desde(marca)
+        self.assertTrue(all(c["updated_at"] >= marca for c in cambios))
+        self.assertEqual(cambios[-1]["id_activo"], "MOT-01")
+        self.assertEqual(cambios[-1]["estado"], "EN_MANTENIMIENTO")
+        self.assertEqual([ev["detalle"] for ev in cambios[-1]["historial_incidencias"]],
+                         ["Ruido en rodamientos", "Falla confirmada"])
+
+    def test_lote_de_cambios_en_una_transaccion(self):
+        multimetro = self.mapper.mapear_lista(self.repo.leer_todos())[1]
+        multimetro.estado = EstadoEquipo.REPORTADO
+        self.motor.estado = EstadoEquipo.FALLA
+
+        self.assertTrue(self.repo.agregar_incidencias_lote(
+            [(self.motor, [{"detalle": "Falla confirmada"}]), (multimetro, [])]))
+
+        filas = {f["id_activo"]: f for f in self.repo.leer_todos()}
+        self.assertEqual(filas["MOT-01"]["estado"], "FALLA")
+        self.assertEqual(filas["MOT-01"]["historial_incidencias"][-1]["detalle"], "Falla confirmada")
+        self.assertEqual(filas[multimetro.id_activo]["estado"], "REPORTADO")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,7 @@ from src.views.inspeccion import VistaInspeccion
 from src.models.concretos import MotorInduccion
 from src.logical.estrategias import DesgasteLineal
 from src.utils.enums import EstadoEquipo
+from src.utils.inventario_index import InventarioIndex
 
 class TestViewsLogic(unittest.TestCase):
     """Pruebas de la lógica pura de las vistas (Arquitectura y Datos) ahora en POO"""
@@ -77,7 +78,7 @@ class TestVistasRender(unittest.TestCase):
         mock_st.columns.side_effect = side_effect_columns
 
         vista_dash = VistaDashboard()
-        vista_dash._cargar_y_agrupar_desde_supabase = MagicMock(return_value={})
+        vista_dash._cargar_y_agrupar_desde_supabase = MagicMock(return_value=InventarioIndex())
         
         vista_dash.render()
         
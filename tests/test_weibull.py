@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+from datetime import date, timedelta
+import numpy as np
+
+# Ajuste de ruta
+sys.path.append(os.getcwd())
+
+from src.logical.weibull import ajustar_weibull, ParametrosWeibull
+from src.logical.estrategias import DesgasteLineal, DesgasteExponencial, DesgasteWeibull, EstrategiasWeibull
+from src.models.concretos import Multimetro
+from src.services.ajuste_weibull_service import AjusteWeibullService
+from src.utils.enums import EstadoEquipo
+from src.utils.reloj import RelojFijo
+from src.utils.mapper import EquipoMapper
+from src.repositories.equipo_repository import EquipoRepository
+
+
+class TestAjusteWeibull(unittest.TestCase):
+    """Máxima verosimilitud con censura y estrategia de desgaste por tipo."""
+
+    def test_recupera_parametros_con_censura(self):
+        rng = np.random.default_rng(7)
+        vida = 8.0 * rng.weibull(2.5, 4000)
+        # Censura administrativa: nadie se observa más de 10 años
+        tiempos = np.minimum(vida, 10.0)
+        forma, escala = ajustar_weibull(tiempos, vida <= 10.0)
+
+        self.assertAlmostEqual(forma, 2.5, delta=0.15)
+        self.assertAlmostEqual(escala, 8.0, delta=0.3)
+
+    def test_sin_fallas_suficientes_no_ajusta(self):
+        self.assertIsNone(ajustar_weibull([1.0, 2.0, 3.0], [False, False, True]))
+
+    def test_estrategia_usa_respaldo_y_luego_el_ajuste(self):
+        parametros = ParametrosWeibull()
+        reloj = RelojFijo(date(2025, 1, 1))
+        estrategia = DesgasteWeibull("Multimetro", parametros, DesgasteLineal(reloj), reloj)
+        equipo = Multimetro("MU-01", "Fluke 87V", "2020-01-01", "0.05%", True, estrategia)
+
+        self.assertEqual(equipo.calcular_obsolescencia(), DesgasteLineal(reloj).calcular("2020-01-01"))
+
+        parametros.publicar({"Multimetro": (2.0, 5.0)})
+        # El reajuste invalida el valor memorizado: F(5 años) = 1 - e^-1
+        self.assertEqual(equipo.calcular_obsolescencia(), 0.63)
+        np.testing.assert_allclose(estrategia.calcular_lote(["2020-01-01", "2025-01-01"]), [0.63, 0.0])
+
+    def test_servicio_publica_por_tipo(self):
+        hoy = date(2025, 1, 1)
+        flota = []
+        for i in range(12):
+            compra = hoy - timedelta(days=365 * (i % 6 + 1))
+            equipo = Multimetro(f"MU-{i:02d}", "Fluke 87V", compra.isoformat(), "0.05%", True, DesgasteLineal())
+            if i % 3 == 0:
+                equipo.estado = EstadoEquipo.FALLA
+                equipo.historial_incidencias.append({"fecha": (hoy - timedelta(days=100)).isoformat(),
+                                                     "detalle": "Falla confirmada"})
+            flota.append(equipo)
+
+        parametros = ParametrosWeibull()
+        servicio = AjusteWeibullService(lambda: flota, parametros, reloj=RelojFijo(hoy))
+        ajustes = servicio.ajustar_ahora()
+
+        self.assertEqual(set(ajustes), {"Multimetro"})
+        self.assertEqual(parametros.obtener("Multimetro"), ajustes["Multimetro"])
+        self.assertEqual(parametros.version, 1)
+
+    def test_eventos_de_falla_por_palabra_completa(self):
+        hoy = date(2025, 1, 1)
+        equipo = Multimetro("MU-01", "Fluke 87V", "2020-01-01", "0.05%", True, DesgasteLineal())
+        equipo.estado = EstadoEquipo.BAJA
+        equipo.historial_incidencias.extend([
+            {"fecha": "2023-05-01", "detalle": "BAJA DEFINITIVA: sin repuestos"},
+            {"fecha": "2024-06-01", "detalle": "El equipo trabaja con fallas intermitentes"},
+        ])
+        tiempos, fallas = AjusteWeibullService.datos_supervivencia([equipo], hoy)["Multimetro"]
+        self.assertAlmostEqual(tiempos[0], (date(2023, 5, 1) - date(2020, 1, 1)).days / 365.25)
+        self.assertTrue(fallas[0])
+
+        # El estado BAJA ya es la falla: sin evento de baja cuenta el último evento fechado...
+        del equipo.historial_incidencias[0]
+        tiempos, fallas = AjusteWeibullService.datos_supervivencia([equipo], hoy)["Multimetro"]
+        self.assertAlmostEqual(tiempos[0], (date(2024, 6, 1) - date(2020, 1, 1)).days / 365.25)
+        self.assertTrue(fallas[0])
+
+        # ...y sin ningún evento fechado, 'hoy' (nunca queda censurado ni fuera de la muestra)
+        equipo.historial_incidencias.clear()
+        tiempos, fallas = AjusteWeibullService.datos_supervivencia([equipo], hoy)["Multimetro"]
+        self.assertAlmostEqual(tiempos[0], (hoy - date(2020, 1, 1)).days / 365.25)
+        self.assertTrue(fallas[0])
+
+    def test_historiales_en_un_solo_recorrido(self):
+        hoy = date(2025, 1, 1)
+        cargas = []
+        flota = []
+        for i in range(6):
+            equipo = Multimetro(f"MU-{i:02d}", "Fluke 87V", "2020-01-01", "0.05%", True, DesgasteLineal())
+            equipo.estado = EstadoEquipo.FALLA if i < 3 else EstadoEquipo.OPERATIVO
+            # Un historial que no debe leerse: falla la prueba si alguien lo recorre
+            equipo.historial_incidencias = None
+            flota.append(equipo)
+
+        def historiales():
+            cargas.append(1)
+            return ((e.id_activo, [{"fecha": "2024-01-01", "detalle": "FALLA"}]) for e in flota)
+
+        servicio = AjusteWeibullService(lambda: flota, ParametrosWeibull(), reloj=RelojFijo(hoy),
+                                        historiales=historiales)
+        servicio.ajustar_ahora()
+        self.assertEqual(cargas, [1])
+
+        muestras = AjusteWeibullService.datos_supervivencia(
+            flota, hoy, {e.id_activo: [{"fecha": "2024-01-01", "detalle": "FALLA"}] for e in flota})
+        tiempos, fallas = muestras["Multimetro"]
+        self.assertEqual(fallas.tolist(), [True] * 3 + [False] * 3)
+        self.assertAlmostEqual(tiempos[0], (date(2024, 1, 1) - date(2020, 1, 1)).days / 365.25)
+
+    def test_mapper_conserva_weibull_para_tipos_sin_curva(self):
+        estrategias = EstrategiasWeibull(ParametrosWeibull(), DesgasteLineal())
+        mapper = EquipoMapper(DesgasteLineal(), DesgasteExponencial(), estrategias_weibull=estrategias)
+        equipo = mapper.mapear_lista([{
+            "id_activo": "MU-01", "modelo": "Fluke 87V", "tipo_equipo": "Multimetro",
+            "fecha_compra": "2020-01-01", "estrategia_nombre": "DesgasteWeibull", "detalles_tecnicos": {},
+        }])[0]
+
+        self.assertIsInstance(equipo.estrategia_desgaste, DesgasteWeibull)
+        self.assertIs(equipo.estrategia_desgaste, estrategias["Multimetro"])
+        self.assertEqual(EquipoRepository._nombre_estrategia(equipo), "DesgasteWeibull")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import sys
 import os
 from PIL import Image
 import io
+from unittest.mock import patch
 
 # Ajuste de ruta
 sys.path.append(os.getcwd())
@@ -20,6 +21,32 @@ class TestVisionIA(unittest.TestCase):
         self.assertTrue(self.servicio.modelo_cargado, "El modelo no pudo cargarse de Hugging Face")
         self.assertIsNotNone(self.servicio.model, "El objeto model de Torch es None")
 
+    def test_registro_y_calentamiento(self):
+        """La instancia compartida se reutiliza y queda lista tras la inferencia de calentamiento"""
+        self.assertTrue(self.servicio.listo, "El modelo no completó la inferencia de calentamiento")
+        with patch.object(VisionService, "_instancia", self.servicio):
+            self.assertIs(VisionService.obtener(), self.servicio)
+            self.assertIs(VisionService.obtener(), VisionService.obtener())
+            self.assertTrue(VisionService.esta_listo())
+
+    def test_instancia_fallida_no_queda_registrada(self):
+        """Si la carga falla se reutiliza la fallida hasta que vence la espera y luego se reintenta"""
+        cargas = []
+        with patch.object(VisionService, "_instancia", None), \
+             patch.object(VisionService, "_fallida", None), \
+             patch.object(VisionService, "_VisionService__cargar_modelo", lambda servicio: cargas.append(1)):
+            fallida = VisionService.obtener()
+            self.assertFalse(fallida.listo)
+            self.assertIsNone(VisionService._instancia)
+            self.assertIs(VisionService.obtener(), fallida)
+            self.assertEqual(len(cargas), 1)
+            self.assertEqual(fallida.analizar_estado(io.BytesIO())["diagnostico"], "ERROR")
+
+            with patch.object(VisionService, "_fallida_en", 0.0), \
+                 patch.object(VisionService, "REINTENTO_S", 0.0):
+                self.assertIsNot(VisionService.obtener(), fallida)
+            self.assertEqual(len(cargas), 2)
+
     def test_analisis_imagen_dummy(self):
         """Prueba el flujo completo usando una imagen blanca creada en memoria"""
         # Creamos una imagen pequeña (100x100 blanco) para no cargar archivos